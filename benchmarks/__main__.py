@@ -0,0 +1,91 @@
+import argparse
+import os
+import sys
+
+from .runner import memory_storage, rethinkdb_storage, start_container, \
+    stop_container, run_cases, load_baseline, save_baseline, compare, \
+    format_report
+
+BASELINES_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmarks for the pynsodm hot paths')
+    parser.add_argument(
+        '--backend', choices=('memory', 'rethinkdb'), default='memory')
+    parser.add_argument(
+        '--container', action='store_true',
+        help='start a disposable RethinkDB container for the run')
+    parser.add_argument(
+        '--host', default=os.environ.get('RETHINKDB_HOST', 'localhost'))
+    parser.add_argument(
+        '--port', default=os.environ.get('RETHINKDB_PORT', '28015'))
+    parser.add_argument(
+        '--password', default=os.environ.get('RETHINKDB_PASSWORD', ''))
+    parser.add_argument('--db', default='pynsodm_bench')
+    parser.add_argument(
+        '--cases', default='',
+        help='comma-separated list of cases to run')
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=None)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.5,
+        help='relative slowdown reported as a regression')
+    parser.add_argument(
+        '--memory-tolerance', type=float, default=0.25,
+        help='relative allocation growth reported as a regression')
+    parser.add_argument(
+        '--memory-floor', type=float, default=4.0,
+        help='allocation growth in KiB/op that is always treated as noise')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    baseline_path = args.baseline or os.path.join(
+        BASELINES_DIR, f'{args.backend}.json')
+    names = [c for c in args.cases.split(',') if len(c) > 0]
+
+    container_id = None
+    try:
+        if args.backend == 'memory':
+            storage = memory_storage()
+        else:
+            if args.container:
+                args.password = args.password or 'bench123123'
+                container_id = start_container(args.port, args.password)
+            storage = rethinkdb_storage(
+                host=args.host, port=args.port,
+                password=args.password, db=args.db)
+
+        results = run_cases(
+            storage, names=names, scale=args.scale, repeat=args.repeat)
+    finally:
+        if container_id:
+            stop_container(container_id)
+
+    baseline = load_baseline(baseline_path)
+    print(format_report(results, baseline))
+
+    if args.save_baseline:
+        save_baseline(baseline_path, {**baseline, **results})
+        print(f'Baseline saved to {baseline_path}')
+        return 0
+
+    regressions = compare(
+        results, baseline, args.tolerance, args.memory_tolerance,
+        args.memory_floor)
+    for name, metrics in regressions.items():
+        for metric, (base, current) in metrics.items():
+            print(
+                f'REGRESSION {name}: {metric} {base:.2f} -> {current:.2f}',
+                file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import json
+
+from pynsodm.json_ext import encoder
+
+from .models import BenchIDCard, BenchPerson, BenchBike, person_data
+
+
+FIND_SIZES = (1, 10, 100, 1000)
+
+
+def sample_data(index=0, bucket='default'):
+    idcard = BenchIDCard(number=f'card{index}')
+    idcard.save()
+    return {'idcard': idcard, **person_data(index, bucket)}
+
+
+def sample_person():
+    return BenchPerson(**sample_data())
+
+
+def bench_construct(storage):
+    data = sample_data()
+
+    def run():
+        BenchPerson(**data)
+    return run
+
+
+def bench_from_dictionary(storage):
+    data = sample_person().dictionary
+
+    def run():
+        BenchPerson.from_dictionary(data, sensitive_fields=True)
+    return run
+
+
+def bench_dictionary(storage):
+    person = sample_person()
+
+    def run():
+        person.dictionary
+    return run
+
+
+def bench_json_encode(storage):
+    person = sample_person()
+    model_encoder = encoder()
+
+    def run():
+        json.dumps(person, cls=model_encoder)
+    return run
+
+
+def bench_getattr(storage):
+    person = sample_person()
+
+    def run():
+        person.first_name
+    return run
+
+
+def bench_setattr(storage):
+    person = sample_person()
+
+    def run():
+        person.first_name = 'Jane'
+    return run
+
+
+def bench_save_insert(storage):
+    data = sample_data()
+
+    def run():
+        BenchPerson(**data).save()
+    return run
+
+
+def bench_save_update(storage):
+    person = sample_person()
+    person.save()
+
+    def run():
+        person.last_name = 'Smith'
+        person.save()
+    return run
+
+
+def bench_find(size):
+    def setup(storage):
+        bucket = f'find_{size}'
+        for index in range(size):
+            BenchPerson(**sample_data(index, bucket)).save()
+
+        def run():
+            BenchPerson.find(bucket=bucket)
+        return run
+    return setup
+
+
+def bench_find_tuples(size):
+    def setup(storage):
+        bucket = f'find_tuples_{size}'
+        for index in range(size):
+            BenchPerson(**sample_data(index, bucket)).save()
+
+        def run():
+            BenchPerson.find_tuples(
+                fields=['id', 'first_name', 'last_name'], bucket=bucket)
+        return run
+    return setup
+
+
+def bench_get_relations(storage):
+    person = sample_person()
+    person.save()
+
+    for index in range(5):
+        BenchBike(model=f'bike{index}', owner=person).save()
+
+    def run():
+        BenchPerson.get(person.id)
+    return run
+
+
+CASES = {
+    'construct': (bench_construct, 500),
+    'from_dictionary': (bench_from_dictionary, 500),
+    'dictionary': (bench_dictionary, 500),
+    'json_encode': (bench_json_encode, 500),
+    'getattr': (bench_getattr, 100000),
+    'setattr': (bench_setattr, 100000),
+    'save_insert': (bench_save_insert, 200),
+    'save_update': (bench_save_update, 200),
+    **{
+        f'find_{size}': (bench_find(size), max(2, 500 // size))
+        for size in FIND_SIZES},
+    **{
+        f'find_tuples_{size}': (bench_find_tuples(size), max(2, 500 // size))
+        for size in FIND_SIZES},
+    'get_relations': (bench_get_relations, 200),
+}
@@ -0,0 +1,80 @@
+import copy
+import uuid
+
+from pynsodm.rethinkdb_ext import Storage
+from pynsodm.rethinkdb_ext.query import Lookup, build_query
+
+
+class MemoryStorage(Storage):
+    def __init__(self, **kwargs):
+        Storage.__init__(self, **kwargs)
+        self._tables = {}
+
+    def _init_db(self):
+        pass
+
+    def _init_table(self, table_name, indexes=[], options=None):
+        self._tables.setdefault(table_name, {})
+
+    def clear(self):
+        for table in self._tables.values():
+            table.clear()
+
+    def insert(self, data_obj, **options):
+        obj_data = data_obj.storage_dictionary
+
+        obj_id = data_obj.id or str(uuid.uuid4())
+        obj_data['id'] = obj_id
+        self._tables[data_obj.get_table_name()][obj_id] = obj_data
+        return obj_id
+
+    def update(self, data_obj, **options):
+        obj_data = self._document(data_obj, data_obj.get_modified_fields())
+
+        row = self._tables[data_obj.get_table_name()].get(data_obj.id)
+        if row is not None:
+            row.update(obj_data)
+
+    def get_many(self, table_name, ids, read_mode=None, primary_key='id'):
+        table = self._tables[table_name]
+        return [copy.deepcopy(table[i]) for i in ids if i in table]
+
+    def get(self, table_name, obj_id, read_mode=None, primary_key='id'):
+        row = self._tables[table_name].get(obj_id)
+        return copy.deepcopy(row) if row is not None else None
+
+    def _matches(self, table_name, fil):
+        query = build_query(**fil) if isinstance(fil, dict) else fil
+        if not query.is_conjunction or not all(
+                isinstance(c, Lookup) and c.op in ('exact', 'in')
+                for c in query.children):
+            raise NotImplementedError(
+                'MemoryStorage supports only equality and in filters')
+
+        conditions = [
+            (c.field, c.value if c.op == 'in' else [c.value])
+            for c in query.children]
+        return [
+            k for k, row in self._tables[table_name].items()
+            if all(row.get(f) in v for f, v in conditions)]
+
+    def find(self, table_name, fil, indexes=(), read_mode=None, fields=None):
+        table = self._tables[table_name]
+        if fields:
+            return [
+                {f: table[k][f] for f in fields if f in table[k]} for k
+                in self._matches(table_name, fil)]
+        return [
+            copy.deepcopy(table[k]) for k
+            in self._matches(table_name, fil)]
+
+    def iterate(self, table_name, fil, indexes=(), read_mode=None,
+                fields=None):
+        return iter(self.find(table_name, fil, indexes, read_mode, fields))
+
+    def delete(self, table_name, fil, indexes=()):
+        table = self._tables[table_name]
+        ids = self._matches(table_name, fil)
+        for obj_id in ids:
+            table.pop(obj_id)
+        return len(ids) > 0
@@ -0,0 +1,42 @@
+from pynsodm.rethinkdb_ext import BaseModel
+from pynsodm.fields import StringField, ListField, OTORelation, OTMRelation
+from pynsodm.valids import valid_email
+
+
+class BenchIDCard(BaseModel):
+    table_name = 'bench_idcards'
+
+    number = StringField()
+
+
+class BenchPerson(BaseModel):
+    table_name = 'bench_persons'
+
+    first_name = StringField()
+    last_name = StringField()
+    email = StringField(valid=valid_email)
+    role = StringField(items=['admin', 'user'])
+    tags = ListField()
+    bucket = StringField(is_index=True)
+    idcard = OTORelation(BenchIDCard, backfield='person')
+
+
+class BenchBike(BaseModel):
+    table_name = 'bench_bikes'
+
+    model = StringField()
+    owner = OTMRelation(BenchPerson, backfield='bikes')
+
+
+MODELS = ('BenchIDCard', 'BenchPerson', 'BenchBike')
+
+
+def person_data(index=0, bucket='default'):
+    return {
+        'first_name': f'John{index}',
+        'last_name': 'Doe',
+        'email': f'john{index}@test.loc',
+        'role': 'user',
+        'tags': ['a', 'b', 'c'],
+        'bucket': bucket,
+    }
@@ -0,0 +1,155 @@
+import gc
+import json
+import os
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+from pynsodm.rethinkdb_ext import Storage
+
+from .cases import CASES
+from .memory_storage import MemoryStorage
+from .models import MODELS, BenchIDCard, BenchPerson, BenchBike
+
+RETHINKDB_IMAGE = 'rethinkdb:2.4.1-buster-slim'
+
+
+def memory_storage():
+    storage = MemoryStorage(models=','.join(MODELS))
+    storage.connect()
+    return storage
+
+
+def rethinkdb_storage(**kwargs):
+    storage = Storage(models=','.join(MODELS), **kwargs)
+    storage.connect()
+
+    for model in (BenchIDCard, BenchPerson, BenchBike):
+        storage._driver\
+            .table(model.get_table_name())\
+            .delete()\
+            .run(storage._connection)
+    return storage
+
+
+def start_container(port, password, timeout=60):
+    container_id = subprocess.check_output([
+        'docker', 'run', '-d', '--rm',
+        '-p', f'{port}:28015',
+        RETHINKDB_IMAGE,
+        'rethinkdb', '--bind', 'all', '--initial-password', password,
+    ]).decode('ascii').strip()
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            Storage(port=port, password=password)._init_db()
+            return container_id
+        except Exception:
+            if time.monotonic() > deadline:
+                stop_container(container_id)
+                raise
+            time.sleep(1)
+
+
+def stop_container(container_id):
+    subprocess.run(
+        ['docker', 'stop', container_id],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL)
+
+
+def measure(run, iterations, repeat=3, memory_samples=20):
+    run()
+
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                run()
+            timings.append((time.perf_counter() - started) / iterations)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    peaks = []
+    for _ in range(min(iterations, memory_samples)):
+        tracemalloc.start()
+        run()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'time_us': min(timings) * 1e6,
+        'time_us_median': statistics.median(timings) * 1e6,
+        'memory_kib': max(peaks) / 1024,
+    }
+
+
+def run_cases(storage, names=None, scale=1.0, repeat=3):
+    results = {}
+
+    for name, (setup, iterations) in CASES.items():
+        if names and name not in names:
+            continue
+        run = setup(storage)
+        results[name] = measure(
+            run, max(1, int(iterations * scale)), repeat=repeat)
+    return results
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(path, results):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as baseline_file:
+        json.dump(results, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write('\n')
+
+
+def compare(results, baseline, tolerance=0.5, memory_tolerance=0.25,
+            memory_floor=4.0):
+    regressions = {}
+
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result['time_us'] > base['time_us'] * (1 + tolerance):
+            regressions.setdefault(name, {})['time_us'] = \
+                (base['time_us'], result['time_us'])
+        memory_limit = max(
+            base['memory_kib'] * (1 + memory_tolerance),
+            base['memory_kib'] + memory_floor)
+        if result['memory_kib'] > memory_limit:
+            regressions.setdefault(name, {})['memory_kib'] = \
+                (base['memory_kib'], result['memory_kib'])
+    return regressions
+
+
+def format_report(results, baseline):
+    lines = [
+        f'{"case":<18}{"ops":>8}{"us/op":>12}{"median":>12}'
+        f'{"KiB/op":>10}{"vs base":>10}',
+    ]
+
+    for name, result in results.items():
+        base = baseline.get(name)
+        ratio = f'{result["time_us"] / base["time_us"]:.2f}x' \
+            if base \
+            else '-'
+        lines.append(
+            f'{name:<18}{result["iterations"]:>8}'
+            f'{result["time_us"]:>12.2f}{result["time_us_median"]:>12.2f}'
+            f'{result["memory_kib"]:>10.1f}{ratio:>10}')
+    return '\n'.join(lines)
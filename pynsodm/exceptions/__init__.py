@@ -1,10 +1,12 @@
 from .validate_exception import ValidateException
 from .list_item_exception import ListItemException
 from .nonexistent_id_exception import NonexistentIDException
+from .full_scan_exception import FullScanException
 
 
 __all__ = (
     'ValidateException',
     'ListItemException',
     'NonexistentIDException',
+    'FullScanException',
 )
@@ -0,0 +1,9 @@
+class FullScanException(Exception):
+    def __init__(self, table, operation, keys):
+        Exception.__init__(
+            self,
+            f'{operation} on {table} filters by {", ".join(keys)} '
+            'without an index')
+        self.table = table
+        self.operation = operation
+        self.keys = keys
@@ -1,8 +1,11 @@
 from .base_field import BaseField
+from .reference import Reference
 from .id_fields import IDField
 from .datetime_field import DatetimeField
 from .string_field import StringField
 from .list_field import ListField
+from .binary_field import BinaryField
+from .aggregate_fields import AggregateField, CountField, LatestField
 from .one_to_one_relation_field import OTORelation
 from .one_to_one_resolver_field import OTOResolver
 from .one_to_many_relation_field import OTMRelation
@@ -11,10 +14,15 @@ from .one_to_many_resolver_field import OTMResolver
 
 __all__ = (
     'BaseField',
+    'Reference',
     'IDField',
     'DatetimeField',
     'StringField',
     'ListField',
+    'BinaryField',
+    'AggregateField',
+    'CountField',
+    'LatestField',
     'OTORelation',
     'OTOResolver',
     'OTMRelation',
@@ -0,0 +1,87 @@
+from .base_field import BaseField
+
+
+class AggregateField(BaseField):
+    def __init__(self, relation, **kwargs):
+        model_name, _, relation_field = relation.rpartition('.')
+        if not model_name:
+            raise ValueError(
+                f'Relation must be given as "Model.field": {relation}')
+
+        self._relation = relation
+        self._relation_model = model_name
+        self._relation_field = relation_field
+
+        kwargs['is_aggregate'] = True
+
+        BaseField.__init__(self, **kwargs)
+
+    def matches(self, model, relation_field):
+        return model.matches_name(self._relation_model) and \
+            self._relation_field == relation_field
+
+    def increment(self, r, row, field, change):
+        raise NotImplementedError()
+
+    def recompute(self, r, children):
+        raise NotImplementedError()
+
+    def __set__(self, obj, value):
+        self.safety_value = value
+
+    def __get__(self, obj, type):
+        if not obj:
+            return self
+        return self.value
+
+    @property
+    def relation(self): return self._relation
+
+    @property
+    def relation_model(self): return self._relation_model
+
+    @property
+    def relation_field(self): return self._relation_field
+
+    @property
+    def source(self): return None
+
+    @property
+    def needs_recompute(self) -> bool: return False
+
+
+class CountField(AggregateField):
+    def increment(self, r, row, field, change):
+        return row[field].default(0).add(change['delta'])
+
+    def recompute(self, r, children):
+        return children.count()
+
+    def __get__(self, obj, type):
+        if not obj:
+            return self
+        return self.value if self.value else 0
+
+
+class LatestField(AggregateField):
+    def __init__(self, relation, field='created', **kwargs):
+        self._source = field
+
+        AggregateField.__init__(self, relation, **kwargs)
+
+    def increment(self, r, row, field, change):
+        current = row[field].default(None)
+        value = change['values'][field]
+        return r.branch(
+            value.eq(None), current,
+            current.eq(None).or_(current.lt(value)), value,
+            current)
+
+    def recompute(self, r, children):
+        return children.max(self._source)[self._source].default(None)
+
+    @property
+    def source(self): return self._source
+
+    @property
+    def needs_recompute(self) -> bool: return True
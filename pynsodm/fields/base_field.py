@@ -1,23 +1,65 @@
 from pynsodm.exceptions import ValidateException
+from pynsodm.valids import valid_type, valid_length, valid_regex, \
+    compile_validators
 
 
 class BaseField:
     def __init__(self, **kwargs):
-        self._is_index = kwargs.get('is_index', False)
+        self._is_multi_index = kwargs.get('is_multi_index', False)
+        self._is_index = kwargs.get('is_index', self._is_multi_index)
         self._is_field = kwargs.get('is_field', True)
         self._is_primary = kwargs.get('is_primary', False)
         self._is_sensitive = kwargs.get('is_sensitive', False)
         self._is_relation = kwargs.get('is_relation', False)
         self._is_resolver = kwargs.get('is_resolver', False)
         self._is_multiple = kwargs.get('is_multiple', False)
+        self._is_encoded = kwargs.get('is_encoded', False)
+        self._is_aggregate = kwargs.get('is_aggregate', False)
         self._valid = kwargs.get('valid', None)
+        self._types = kwargs.get('types', None)
+        self._min_length = kwargs.get('min_length', None)
+        self._max_length = kwargs.get('max_length', None)
+        self._regex = kwargs.get('regex', None)
         self._handler = kwargs.get('handler', None)
+        self._check = self.compile()
         self._value = None
         self._is_modified = False
 
+    def compile(self):
+        checks = []
+
+        if self._types:
+            types = self._types \
+                if isinstance(self._types, (list, tuple)) \
+                else (self._types,)
+            checks.append(valid_type(*types))
+        if self._min_length is not None or self._max_length is not None:
+            checks.append(valid_length(self._min_length, self._max_length))
+        if self._regex:
+            checks.append(valid_regex(self._regex))
+        checks.append(self._valid)
+
+        return compile_validators(*checks)
+
+    def serialize(self, val):
+        return val
+
+    def deserialize(self, val):
+        return val
+
+    def validate(self, val):
+        if self._check and not self._check(val):
+            raise ValidateException()
+
+    @property
+    def has_constraints(self) -> bool: return self._check is not None
+
     @property
     def is_index(self) -> bool: return self._is_index
 
+    @property
+    def is_multi_index(self) -> bool: return self._is_multi_index
+
     @property
     def is_field(self) -> bool: return self._is_field
 
@@ -39,12 +81,18 @@ class BaseField:
     @property
     def is_multiple(self) -> bool: return self._is_multiple
 
+    @property
+    def is_encoded(self) -> bool: return self._is_encoded
+
+    @property
+    def is_aggregate(self) -> bool: return self._is_aggregate
+
     @property
     def value(self): return self._value
 
     @value.setter
     def value(self, val):
-        if self._valid and not self._valid(val):
+        if self._check and not self._check(val):
             raise ValidateException()
 
         if self._handler:
@@ -53,13 +101,16 @@ class BaseField:
             self._value = val
         self._is_modified = True
 
+    @property
+    def storage_value(self): return self._value
+
     @property
     def safety_value(self): return self._value
 
     @safety_value.setter
     def safety_value(self, val):
-        if self._valid and not self._valid(val):
+        if self._check and not self._check(val):
             raise ValidateException()
 
         self._value = val
-        self._is_modified = True
\ No newline at end of file
+        self._is_modified = True
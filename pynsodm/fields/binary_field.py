@@ -0,0 +1,87 @@
+import base64
+import zlib
+
+from .base_field import BaseField
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+RAW = b'\x00'
+ZLIB = b'\x01'
+LZ4 = b'\x02'
+
+
+class BinaryField(BaseField):
+    def __init__(self, compression=None, threshold=1024, level=6, **kwargs):
+        if compression not in (None, 'zlib', 'lz4'):
+            raise ValueError(f'Unknown compression: {compression}')
+        if compression == 'lz4' and lz4_frame is None:
+            raise ImportError('lz4 compression requires the lz4 package')
+
+        self._compression = compression
+        self._threshold = threshold
+        self._level = level
+        self._decoded = None
+
+        kwargs['is_encoded'] = True
+
+        BaseField.__init__(self, **kwargs)
+
+    def encode(self, data):
+        if self._compression and len(data) >= self._threshold:
+            if self._compression == 'lz4':
+                return LZ4 + lz4_frame.compress(
+                    data, compression_level=self._level)
+            return ZLIB + zlib.compress(data, self._level)
+        return RAW + data
+
+    @staticmethod
+    def decode(payload):
+        header, data = payload[:1], payload[1:]
+        if header == ZLIB:
+            return zlib.decompress(data)
+        if header == LZ4:
+            if lz4_frame is None:
+                raise ImportError('lz4 compression requires the lz4 package')
+            return lz4_frame.decompress(data)
+        return data
+
+    def serialize(self, val):
+        return base64.b64encode(val).decode('ascii') \
+            if isinstance(val, (bytes, bytearray)) \
+            else val
+
+    def deserialize(self, val):
+        return base64.b64decode(val) if isinstance(val, str) else val
+
+    def __set__(self, obj, value):
+        self._decoded = None
+
+        if value is None:
+            self._value = None
+            self._is_modified = True
+        elif obj._exist_object:
+            self._value = bytes(value)
+            self._is_modified = True
+        else:
+            data = value.encode('utf-8') \
+                if isinstance(value, str) \
+                else bytes(value)
+            self.validate(data)
+            self._value = self.encode(data)
+            self._decoded = data
+            self._is_modified = True
+
+    def __get__(self, obj, type):
+        if not obj:
+            return self
+        if self._value is None:
+            return None
+        if self._decoded is None:
+            self._decoded = self.decode(self._value)
+        return self._decoded
+
+    @property
+    def compression(self): return self._compression
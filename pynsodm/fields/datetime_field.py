@@ -13,9 +13,22 @@ class DatetimeField(BaseField):
 
         self._timezone = pytz.timezone(TIMEZONE)
 
+    def serialize(self, val):
+        return val.isoformat() if isinstance(val, datetime) else val
+
+    def deserialize(self, val):
+        if isinstance(val, str):
+            val = datetime.fromisoformat(val)
+        return self._timezone.localize(val) \
+            if isinstance(val, datetime) and not val.tzinfo \
+            else val
+
+    def now(self):
+        return self._timezone.localize(datetime.utcnow())
+
     def __set__(self, obj, value):
         if not value:
-            self.value = self._timezone.localize(datetime.utcnow())
+            self.value = self.now()
         else:
             self.value = self._timezone.localize(value) \
                 if not value.tzinfo \
@@ -26,4 +39,4 @@ class DatetimeField(BaseField):
             return self
         return self.value \
             if self.value \
-            else self._timezone.localize(datetime.utcnow())
+            else self.now()
@@ -1,12 +1,43 @@
+import os
+import time
+import uuid
+
 from .base_field import BaseField
 
 
+def uuid4_generator():
+    return str(uuid.uuid4())
+
+
+def uuid7_generator():
+    timestamp = time.time_ns() // 1000000
+    rand = int.from_bytes(os.urandom(10), 'big')
+
+    value = (timestamp & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= (rand >> 62 & 0xFFF) << 64
+    value |= 0b10 << 62
+    value |= rand & 0x3FFFFFFFFFFFFFFF
+    return str(uuid.UUID(int=value))
+
+
+ID_GENERATORS = {
+    'uuid4': uuid4_generator,
+    'uuid7': uuid7_generator,
+}
+
+
 class IDField(BaseField):
     def __init__(self, **kwargs):
         if 'is_primary' not in kwargs:
             kwargs['is_primary'] = True
             kwargs['is_index'] = True
 
+        generator = kwargs.get('generator', None)
+        self._generator = ID_GENERATORS[generator] \
+            if isinstance(generator, str) \
+            else generator
+
         BaseField.__init__(self, **kwargs)
 
     def __set__(self, obj, value):
@@ -16,3 +47,9 @@ class IDField(BaseField):
         if not obj:
             return self
         return self.value if self.value else None
+
+    @property
+    def generator(self): return self._generator
+
+    def generate(self):
+        return (self._generator or uuid4_generator)()
@@ -1,4 +1,5 @@
 from .base_field import BaseField
+from .reference import Reference
 from .one_to_one_resolver_field import OTOResolver
 
 
@@ -6,19 +7,37 @@ class OTORelation(BaseField):
     def __init__(self, relation_class, backfield=None, **kwargs):
         self._relation_class = relation_class
         self._backfield = backfield
+        self._related = None
         self._resolver = OTOResolver
 
         kwargs['is_relation'] = True
+        kwargs['is_encoded'] = True
 
         BaseField.__init__(self, **kwargs)
 
     def __set__(self, obj, value):
-        self.value = value if isinstance(value, str) else value.id
+        if value is None or isinstance(value, str):
+            self._related = None
+            self.value = value
+        else:
+            self._related = value
+            self.value = value.id
 
     def __get__(self, obj, type):
         if not obj:
             return self
-        return self._relation_class.get(self.value)
+        if self._related is None and self.value:
+            self._related = Reference(self._relation_class, self.value)
+        return self._related
+
+    @property
+    def storage_value(self):
+        if self._related is not None and self._related.id:
+            self._value = self._related.id
+        return self._value
+
+    @property
+    def related(self): return self._related
 
     @property
     def relation_class(self): return self._relation_class
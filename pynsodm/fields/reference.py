@@ -0,0 +1,68 @@
+class Reference:
+    __slots__ = ('_relation_class', '_id', '_target')
+
+    def __init__(self, relation_class, id, target=None):
+        object.__setattr__(self, '_relation_class', relation_class)
+        object.__setattr__(self, '_id', id)
+        object.__setattr__(self, '_target', target)
+
+    @property
+    def id(self): return self._id
+
+    @property
+    def relation_class(self): return self._relation_class
+
+    @property
+    def is_loaded(self) -> bool: return self._target is not None
+
+    def fetch(self, refresh=False):
+        if self._target is None or refresh:
+            object.__setattr__(
+                self, '_target', self._relation_class.get(self._id))
+        return self._target
+
+    @staticmethod
+    def fetch_all(references, resolve=True, read_mode=None):
+        groups = {}
+        for reference in references:
+            if reference is None or not isinstance(reference, Reference) \
+                    or reference.is_loaded:
+                continue
+            groups.setdefault(reference.relation_class, []).append(reference)
+
+        for relation_class, group in groups.items():
+            objs, _ = relation_class.get_many(
+                [reference.id for reference in group],
+                resolve=resolve,
+                read_mode=read_mode)
+            targets = {obj.id: obj for obj in objs}
+            for reference in group:
+                if reference.id in targets:
+                    object.__setattr__(
+                        reference, '_target', targets[reference.id])
+        return references
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.fetch(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.fetch(), name, value)
+
+    def __eq__(self, other):
+        if isinstance(other, Reference):
+            return self._relation_class is other._relation_class and \
+                self._id == other._id
+        if isinstance(other, self._relation_class):
+            return other.id is not None and self._id == other.id
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self._relation_class, self._id))
+
+    def __str__(self):
+        return f'{self._relation_class.__name__}: id {self._id}'
+
+    def __repr__(self):
+        return f'<Reference {self}>'
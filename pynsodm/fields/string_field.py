@@ -6,7 +6,17 @@ from .base_field import BaseField
 class StringField(BaseField):
     def __init__(self, **kwargs):
         BaseField.__init__(self, **kwargs)
-        self._items = kwargs.get('items', [])
+        self._items = frozenset(kwargs.get('items', []))
+
+    @property
+    def has_constraints(self) -> bool:
+        return len(self._items) > 0 or self._check is not None
+
+    def validate(self, val):
+        str_val = str(val)
+        if len(self._items) > 0 and str_val not in self._items:
+            raise ListItemException()
+        BaseField.validate(self, str_val)
 
     def __set__(self, obj, value):
         str_val = str(value)
@@ -1,8 +1,10 @@
+import base64
 import json
 
 from datetime import datetime
 
 from pynsodm.rethinkdb_ext import BaseModel
+from pynsodm.fields import Reference
 
 
 def encoder(sensitive_fields=False, dt_format='%Y.%m.%d %H:%M:%S.%f'):
@@ -13,6 +15,10 @@ def encoder(sensitive_fields=False, dt_format='%Y.%m.%d %H:%M:%S.%f'):
                     return obj.dictionary
                 else:
                     return obj.unsensitive_dictionary
+            elif isinstance(obj, Reference):
+                return obj.fetch()
             elif isinstance(obj, datetime):
                 return obj.strftime(dt_format)
+            elif isinstance(obj, bytes):
+                return base64.b64encode(obj).decode('ascii')
     return ModelEncoder
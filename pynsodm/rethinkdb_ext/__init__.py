@@ -1,7 +1,34 @@
 from .base_model import BaseModel
 from .storage import Storage
+from .instrumentation import query_scope
+from .query import Q
+from .session import Session
+from .routing import use_storage
+from .write_behind import WriteBehind
+from .cache import DocumentCache
+from .migrations import Migration
+from .advisor import IndexAdvisor
+from .loader import Loader, batch_loads
+from .operators import Inc, Dec, Append, Prepend, SetInsert, Remove, SetIf
 
 __all__ = (
     'BaseModel',
-    'Storage'
+    'Storage',
+    'query_scope',
+    'Q',
+    'Session',
+    'use_storage',
+    'WriteBehind',
+    'DocumentCache',
+    'Migration',
+    'IndexAdvisor',
+    'Loader',
+    'batch_loads',
+    'Inc',
+    'Dec',
+    'Append',
+    'Prepend',
+    'SetInsert',
+    'Remove',
+    'SetIf',
 )
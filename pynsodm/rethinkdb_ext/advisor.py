@@ -0,0 +1,138 @@
+import logging
+
+from pynsodm.exceptions import FullScanException
+
+from .query import RANGE_LOOKUPS
+
+full_scan_logger = logging.getLogger('pynsodm.full_scans')
+
+SCAN_OPERATIONS = ('find', 'iterate', 'delete', 'update_where')
+UNINDEXABLE_LOOKUPS = (
+    'ne', 'nin', 'startswith', 'endswith', 'contains', 'isnull', 'regex')
+
+
+def split_key(key):
+    field, _, op = key.rpartition('__')
+    return field, op
+
+
+def suggest_index(keys):
+    lookups = [split_key(key) for key in keys]
+    equal = sorted({f for f, op in lookups if op in ('exact', 'in')})
+    ranges = sorted({f for f, op in lookups if op in RANGE_LOOKUPS})
+
+    if len(equal) == 0 and len(ranges) == 0:
+        return None
+    if len(ranges) == 0:
+        return equal
+    if len(equal) == 0:
+        return ranges[:1]
+    return [*equal, ranges[0]]
+
+
+class FullScan:
+    def __init__(self, table, operation, keys):
+        self.table = table
+        self.operation = operation
+        self.keys = keys
+        self.count = 0
+        self.duration = 0.0
+        self.rows = 0
+        self.table_size = None
+
+    @property
+    def index(self): return suggest_index(self.keys)
+
+    @property
+    def unindexable(self):
+        return sorted({
+            field for field, op in map(split_key, self.keys)
+            if op in UNINDEXABLE_LOOKUPS})
+
+    @property
+    def scanned(self):
+        return self.count * (self.table_size or 0)
+
+    def as_dict(self):
+        return {
+            'table': self.table,
+            'operation': self.operation,
+            'keys': self.keys,
+            'index': self.index,
+            'unindexable': self.unindexable,
+            'count': self.count,
+            'duration': self.duration,
+            'rows': self.rows,
+            'table_size': self.table_size,
+            'scanned': self.scanned,
+        }
+
+
+class IndexAdvisor:
+    def __init__(self, storage, strict=False, ignore=()):
+        self._storage = storage
+        self._strict = strict
+        self._ignore = set(ignore)
+        self._scans = {}
+
+    @property
+    def scans(self): return list(self._scans.values())
+
+    @staticmethod
+    def _scan_keys(event):
+        shape = event.shape
+        if event.operation not in SCAN_OPERATIONS or len(shape) < 4:
+            return None
+        if shape[3] is not None or len(shape[2]) == 0:
+            return None
+        return shape[2]
+
+    def _before(self, event):
+        keys = self._scan_keys(event)
+        if self._strict and keys and event.table not in self._ignore:
+            raise FullScanException(event.table, event.operation, keys)
+
+    def _after(self, event):
+        keys = self._scan_keys(event)
+        if not keys or event.table in self._ignore:
+            return
+
+        key = (event.table, event.operation, keys)
+        scan = self._scans.get(key)
+        if scan is None:
+            scan = self._scans[key] = FullScan(*key)
+            full_scan_logger.warning(
+                'Full table scan: %s on %s filters by %s',
+                event.operation, event.table, ', '.join(keys))
+        scan.count += 1
+        scan.duration += event.duration or 0.0
+        scan.rows += event.rows or 0
+
+    def attach(self):
+        self._storage.add_hook(pre=self._before, post=self._after)
+        return self
+
+    def detach(self):
+        self._storage.remove_hook(pre=self._before, post=self._after)
+
+    def reset(self):
+        self._scans = {}
+
+    def report(self, table_sizes=True):
+        scans = self.scans
+        if table_sizes:
+            sizes = {}
+            for scan in scans:
+                if scan.table not in sizes:
+                    sizes[scan.table] = self._storage.table_size(scan.table)
+                scan.table_size = sizes[scan.table]
+
+        scans.sort(
+            key=lambda s: (s.scanned, s.duration, s.count), reverse=True)
+        return [scan.as_dict() for scan in scans]
+
+    def __enter__(self):
+        return self.attach()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.detach()
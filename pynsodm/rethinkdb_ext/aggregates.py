@@ -0,0 +1,165 @@
+import logging
+
+
+aggregate_logger = logging.getLogger('pynsodm.aggregates')
+
+
+def _subclasses(base):
+    for subclass in base.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def find_model(name, base, parent=None, relation_field=None):
+    candidates = {
+        subclass for subclass in _subclasses(base)
+        if subclass.matches_name(name)}
+    if parent is not None:
+        candidates = {
+            candidate for candidate in candidates
+            if relation_field in candidate.get_relation_fields() and
+            issubclass(
+                parent, getattr(candidate, relation_field).relation_class)}
+
+    if len(candidates) > 1:
+        raise ValueError(
+            f'Ambiguous relation model {name}: ' + ', '.join(sorted(
+                candidate.get_qualified_name() for candidate in candidates)))
+    return candidates.pop() if candidates else None
+
+
+def collect_aggregates(model):
+    result = {}
+    for relation_field in model.get_relation_fields():
+        parent_class = getattr(model, relation_field).relation_class
+        aggregates = {
+            name: field for name, field
+            in parent_class.get_fields_values().items()
+            if field.is_aggregate and field.matches(model, relation_field)}
+        if aggregates:
+            result[relation_field] = (parent_class, aggregates)
+    return result
+
+
+def watched_fields(model):
+    fields = set()
+    for relation_field, (_, aggregates) in model.get_aggregates().items():
+        fields.add(relation_field)
+        fields.update(
+            aggregate.source for aggregate in aggregates.values()
+            if aggregate.source)
+    return fields
+
+
+def result_changes(result):
+    return [
+        (change.get('old_val'), change.get('new_val')) for change
+        in (result or {}).get('changes', [])]
+
+
+def _plan(aggregates, relation_field, changes):
+    increments = {}
+    recompute = set()
+    needs_recompute = any(a.needs_recompute for a in aggregates.values())
+    sources = {
+        name: aggregate.source for name, aggregate in aggregates.items()
+        if aggregate.source}
+
+    def increment(parent_id, delta, row):
+        change = increments.setdefault(parent_id, {
+            'id': parent_id,
+            'delta': 0,
+            'values': {name: None for name in aggregates}})
+        change['delta'] += delta
+        for name, source in sources.items():
+            value = row.get(source)
+            current = change['values'][name]
+            if value is not None and (current is None or current < value):
+                change['values'][name] = value
+
+    for old_row, new_row in changes:
+        old_row, new_row = old_row or {}, new_row or {}
+        old_parent = old_row.get(relation_field)
+        new_parent = new_row.get(relation_field)
+
+        if old_parent == new_parent:
+            if new_parent is not None and any(
+                    old_row.get(s) != new_row.get(s)
+                    for s in sources.values()):
+                recompute.add(new_parent)
+            continue
+
+        if old_parent is not None:
+            increment(old_parent, -1, {})
+            if needs_recompute:
+                recompute.add(old_parent)
+        if new_parent is not None:
+            increment(new_parent, 1, new_row)
+
+    return list(increments.values()), list(recompute)
+
+
+def maintain_aggregates(model, changes):
+    if len(changes) == 0:
+        return
+
+    indexes = model.get_query_indexes()
+    for relation_field, (parent_class, aggregates) \
+            in model.get_aggregates().items():
+        increments, recompute = _plan(aggregates, relation_field, changes)
+        if len(increments) == 0 and len(recompute) == 0:
+            continue
+
+        options = parent_class.get_write_options()
+        options.pop('return_changes', None)
+
+        try:
+            parent_class.get_storage().update_aggregates(
+                parent_class.get_table_name(),
+                parent_class.get_primary_key(),
+                aggregates,
+                (model.get_table_name(), relation_field,
+                    relation_field in indexes),
+                increments=increments,
+                recompute=recompute,
+                **options)
+        except Exception as ex:
+            aggregate_logger.error(
+                'Aggregates of %s %s not updated after a write to %s, '
+                'run repair_aggregates(): %s',
+                parent_class.get_table_name(),
+                sorted({change['id'] for change in increments} |
+                       set(recompute)),
+                model.get_table_name(), ex)
+            raise
+
+
+def repair_aggregates(model, base, batch_size=100, read_mode=None):
+    groups = {}
+    for name, field in model.get_fields_values().items():
+        if field.is_aggregate:
+            groups.setdefault(
+                (field.relation_model, field.relation_field), {})[name] = field
+
+    storage = model.get_storage()
+    table_name = model.get_table_name()
+    primary_key = model.get_primary_key()
+
+    repaired = 0
+    for ids in storage.scan_ids(
+            table_name, primary_key, batch_size, read_mode):
+        for (model_name, relation_field), aggregates in groups.items():
+            child_class = find_model(
+                model_name, base, model, relation_field)
+            if child_class is None:
+                raise ValueError(f'Unknown relation model: {model_name}')
+
+            storage.update_aggregates(
+                table_name,
+                primary_key,
+                aggregates,
+                (child_class.get_table_name(), relation_field,
+                    relation_field in child_class.get_query_indexes()),
+                recompute=ids)
+        repaired += len(ids)
+    return repaired
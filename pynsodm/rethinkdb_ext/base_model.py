@@ -1,62 +1,99 @@
 import copy
 
-from pynsodm.fields import IDField, DatetimeField
-from pynsodm.exceptions import NonexistentIDException
+from types import SimpleNamespace
+
+from pynsodm.fields import IDField, DatetimeField, Reference
+from pynsodm.exceptions import NonexistentIDException, \
+    ValidateException, ListItemException
+
+from .aggregates import collect_aggregates, watched_fields, \
+    result_changes, maintain_aggregates, repair_aggregates
+from .codegen import compile_model
+from .loader import current_loader
+from .migrations import Migration
+from .operators import UpdateOperator
+from .query import build_query
+from .routing import resolve_storage
+from .scan import scan, map_partitions
+from .transfer import export_ndjson, import_ndjson
+
+_NEW_OBJECT = SimpleNamespace(_exist_object=False)
 
 
 class BaseModel:
     table_name: str = None
     storage = None
+    read_mode: str = None
+    write_options: dict = {}
+    table_options: dict = {}
+    write_behind = None
+    loader = None
 
     id = IDField()
     created = DatetimeField(is_index=True, is_sensitive=True)
     updated = DatetimeField(is_index=True, is_sensitive=True)
 
     def __init__(self, **kwargs):
-        self._exist_object = False
-        self.fields = {}
-        self._modified_fields = []
-
-        for field_name, field_value in self.get_fields_values().items():
-            self.fields[field_name] = copy.deepcopy(field_value)
-
-        for resolver_name in self.get_resolver_fields():
-            resolver_value = getattr(self.__class__, resolver_name)
-            self.fields[resolver_name] = copy.deepcopy(resolver_value)
+        self.__dict__.update(
+            _exist_object=False,
+            fields=self.get_compiled().new_fields(),
+            _modified_fields=[])
 
         for field_name, field_value in kwargs.items():
-            if field_name in dir(self):
+            if field_name in self.fields or \
+                    field_name in self.__dict__ or \
+                    hasattr(self.__class__, field_name):
                 setattr(self, field_name, field_value)
 
     @classmethod
     def from_dictionary(cls, data, sensitive_fields=False):
         obj = cls()
-        obj._exist_object = True
-
-        fields_list = cls.get_fields() \
-            if sensitive_fields \
-            else cls.get_unsensitive_fields()
-
-        for field_name, field_value in data.items():
-            if field_name in fields_list:
-                setattr(obj, field_name, field_value)
-
-        obj._exist_object = False
-
+        obj.load_dictionary(data, sensitive_fields)
         return obj
 
+    def load_dictionary(self, data, sensitive_fields=False):
+        code = self.get_compiled()
+        if sensitive_fields:
+            code.load_sensitive(self, data)
+        else:
+            code.load(self, data)
+
     @classmethod
     def get_table_name(cls):
         if cls.table_name:
             return cls.table_name
         return cls.__name__.lower()
 
+    @classmethod
+    def get_table_options(cls):
+        return dict(cls.table_options)
+
+    @classmethod
+    def get_primary_key(cls):
+        return cls.table_options.get('primary_key', 'id')
+
+    @classmethod
+    def get_field_aliases(cls):
+        primary_key = cls.get_primary_key()
+        return {'id': primary_key} if primary_key != 'id' else {}
+
     @classmethod
     def get_model_name(cls):
         return cls.__name__
 
+    @classmethod
+    def get_qualified_name(cls):
+        return f'{cls.__module__}.{cls.__name__}'
+
+    @classmethod
+    def matches_name(cls, name):
+        return name in (cls.get_model_name(), cls.get_qualified_name())
+
     @classmethod
     def get_fields_values(cls):
+        if '_fields_values' in cls.__dict__:
+            return cls._fields_values
+
         fields = dir(cls)
         result = {}
 
@@ -66,6 +103,7 @@ class BaseModel:
             if 'is_field' in dir(field_value):
                 if field_value.is_field:
                     result[field] = field_value
+        cls._fields_values = result
         return result
 
     @classmethod
@@ -74,10 +112,10 @@ class BaseModel:
 
     @classmethod
     def get_index_fields(cls):
-        return [
-            k for k, v
+        return {
+            k: v.is_multi_index for k, v
             in cls.get_fields_values().items()
-            if v.is_index and not v.is_primary]
+            if v.is_index and not v.is_primary}
 
     @classmethod
     def get_unsensitive_fields(cls):
@@ -92,6 +130,9 @@ class BaseModel:
 
     @classmethod
     def get_resolver_fields(cls):
+        if '_resolver_fields' in cls.__dict__:
+            return list(cls._resolver_fields)
+
         fields = dir(cls)
         result = []
 
@@ -101,8 +142,48 @@ class BaseModel:
             if 'is_resolver' in dir(field_value):
                 if field_value.is_resolver:
                     result.append(field)
+        cls._resolver_fields = tuple(result)
         return result
 
+    @classmethod
+    def get_aggregates(cls):
+        if '_aggregates' not in cls.__dict__:
+            cls._aggregates = collect_aggregates(cls)
+        return cls._aggregates
+
+    @classmethod
+    def tracks_aggregates(cls, field_names=None):
+        if '_watched_fields' not in cls.__dict__:
+            cls._watched_fields = frozenset(watched_fields(cls))
+
+        watched = cls._watched_fields
+        if field_names is None:
+            return len(watched) > 0
+        return len(watched.intersection(field_names)) > 0
+
+    @classmethod
+    def repair_aggregates(cls, batch_size=100, read_mode=None):
+        return repair_aggregates(
+            cls, BaseModel, batch_size, cls.get_read_mode(read_mode))
+
+    @classmethod
+    def get_compiled(cls):
+        if '_compiled' not in cls.__dict__:
+            cls._compiled = compile_model(cls)
+        return cls._compiled
+
+    @classmethod
+    def reset_compiled(cls):
+        for attr in ('_resolver_fields', '_compiled'):
+            if attr in cls.__dict__:
+                delattr(cls, attr)
+        for subclass in cls.__subclasses__():
+            subclass.reset_compiled()
+
+    @classmethod
+    def get_query_indexes(cls):
+        return {cls.get_primary_key(): False, **cls.get_index_fields()}
+
     @classmethod
     def get_primary_index(cls):
         primary_indexes = [
@@ -113,17 +194,109 @@ class BaseModel:
             return primary_indexes[0]
         return None
 
+    @classmethod
+    def get_validators(cls):
+        if '_validators' not in cls.__dict__:
+            cls._validators = {
+                k: v.validate for k, v
+                in cls.get_fields_values().items()
+                if v.has_constraints}
+        return cls._validators
+
+    @classmethod
+    def validate_many(cls, rows):
+        validators = cls.get_validators()
+        errors = {}
+
+        for row_index, row in enumerate(rows):
+            row_errors = {}
+            for field_name, field_value in row.items():
+                validator = validators.get(field_name)
+                if not validator:
+                    continue
+                try:
+                    validator(field_value)
+                except (ValidateException, ListItemException) as ex:
+                    row_errors[field_name] = str(ex)
+            if row_errors:
+                errors[row_index] = row_errors
+        return errors
+
     @classmethod
     def set_storage(cls, value):
         cls.storage = value
 
     @classmethod
-    def get(cls, id):
-        data = cls.storage.get(cls.get_table_name(), id)
+    def get_storage(cls):
+        return resolve_storage(cls)
+
+    @classmethod
+    def get_read_mode(cls, read_mode=None):
+        return read_mode or cls.read_mode
+
+    @classmethod
+    def get_loader(cls):
+        return current_loader() or cls.loader
+
+    @classmethod
+    def _loaded(cls, data, read_mode):
         if not data:
             raise NonexistentIDException()
 
         get_obj = cls.from_dictionary(data, sensitive_fields=True)
+        cls.resolve([get_obj], read_mode)
+
+        return get_obj
+
+    @classmethod
+    def get(cls, id, read_mode=None):
+        read_mode = cls.get_read_mode(read_mode)
+        loader = cls.get_loader()
+        if loader is not None:
+            data = loader.load(
+                cls.get_storage(), cls.get_table_name(), id, read_mode,
+                cls.get_primary_key())
+        else:
+            data = cls.get_storage().get(
+                cls.get_table_name(), id, read_mode, cls.get_primary_key())
+        return cls._loaded(data, read_mode)
+
+    @classmethod
+    async def aget(cls, id, read_mode=None):
+        read_mode = cls.get_read_mode(read_mode)
+        loader = cls.get_loader()
+        if loader is None:
+            return cls.get(id, read_mode)
+
+        data = await loader.load_async(
+            cls.get_storage(), cls.get_table_name(), id, read_mode,
+            cls.get_primary_key())
+        return cls._loaded(data, read_mode)
+
+    @classmethod
+    def get_many(cls, ids, resolve=True, read_mode=None):
+        read_mode = cls.get_read_mode(read_mode)
+        primary_key = cls.get_primary_key()
+
+        unique_ids = list(dict.fromkeys(i for i in ids if i is not None))
+        data = cls.get_storage().get_many(
+            cls.get_table_name(), unique_ids, read_mode, primary_key)
+
+        objs = {
+            row[primary_key]: cls.from_dictionary(row, sensitive_fields=True)
+            for row in data}
+        if resolve:
+            cls.resolve(list(objs.values()), read_mode)
+
+        return (
+            [objs[i] for i in ids if i in objs],
+            [i for i in unique_ids if i not in objs])
+
+    @classmethod
+    def resolve(cls, objs, read_mode=None):
+        ids = [obj.id for obj in objs if obj.id]
+        if len(ids) == 0:
+            return objs
 
         for resolver_field in cls.get_resolver_fields():
             resolver_field_obj = getattr(cls, resolver_field)
@@ -135,41 +308,247 @@ class BaseModel:
                 parent_relation_field_obj = getattr(
                     parent_class, parent_relation_field)
 
-                if parent_relation_field_obj.relation_class == cls:
-                    data = [
-                        elem for elem
-                        in cls.storage.find(
-                            parent_class_table,
-                            {parent_relation_field: get_obj.id})]
-                    if len(data) > 0:
-                        if not resolver_field_obj.is_multiple:
-                            parent = parent_class(**dict(data[0]))
-                            setattr(get_obj, resolver_field, parent)
-                        else:
-                            elements = []
-                            for row in data:
-                                elements.append(parent_class(**dict(row)))
-                                setattr(get_obj, resolver_field, elements)
+                if parent_relation_field_obj.relation_class != cls:
+                    continue
+
+                groups = {}
+                for row in parent_class.get_storage().find(
+                        parent_class_table,
+                        {f'{parent_relation_field}__in': ids},
+                        parent_class.get_query_indexes(),
+                        read_mode):
+                    groups.setdefault(
+                        row.get(parent_relation_field), []).append(row)
+
+                for obj in objs:
+                    elements = [
+                        parent_class.from_dictionary(
+                            row, sensitive_fields=True)
+                        for row in groups.get(obj.id, [])]
+                    if len(elements) == 0:
+                        continue
+                    setattr(
+                        obj, resolver_field,
+                        elements
+                        if resolver_field_obj.is_multiple
+                        else elements[0])
+
+        for obj in objs:
+            obj.reset_modified_fields()
+        return objs
 
-        return get_obj
+    @classmethod
+    def fetch_relations(cls, objs, *field_names, resolve=True,
+                        read_mode=None):
+        field_names = field_names or cls.get_relation_fields()
+        Reference.fetch_all(
+            [
+                getattr(obj, field_name) for obj in objs
+                for field_name in field_names],
+            resolve=resolve,
+            read_mode=read_mode)
+        return objs
+
+    @classmethod
+    def _split_query(cls, args, fil):
+        query = build_query(*args, **fil).rename(cls.get_field_aliases())
+        return query.split_relations(cls.get_relation_fields())
+
+    @classmethod
+    def get_query(cls, *args, **fil):
+        query, relations = cls._split_query(args, fil)
+        if relations:
+            raise ValueError(
+                f'Relation lookups on {", ".join(sorted(relations))} '
+                'are only supported by find()')
+        return query
 
     @classmethod
-    def find(cls, **fil):
-        data = cls.storage.find(cls.get_table_name(), fil)
+    def find(cls, *args, read_mode=None, select_related=(), **fil):
+        query, relations = cls._split_query(args, fil)
+        if relations or select_related:
+            return cls._find_related(
+                query, relations, select_related, read_mode)
+
+        data = cls.get_storage().find(
+            cls.get_table_name(),
+            query,
+            cls.get_query_indexes(),
+            cls.get_read_mode(read_mode))
 
         return [
             cls.from_dictionary(row, sensitive_fields=True) for row
             in data]
 
     @classmethod
-    def delete(cls, **fil):
-        return cls.storage.delete(cls.get_table_name(), fil)
+    def _find_related(cls, query, relations, select_related, read_mode):
+        if select_related is True:
+            select_related = cls.get_relation_fields()
+
+        joins = []
+        for relation_field, related_query in relations.items():
+            relation_class = getattr(cls, relation_field).relation_class
+            joins.append((
+                relation_field,
+                relation_class.get_table_name(),
+                relation_class.get_primary_key(),
+                related_query.rename(relation_class.get_field_aliases()),
+                relation_class.get_query_indexes()))
+
+        data = cls.get_storage().find_related(
+            cls.get_table_name(),
+            query,
+            cls.get_query_indexes(),
+            joins,
+            [
+                (name, getattr(cls, name).relation_class.get_table_name())
+                for name in select_related],
+            cls.get_read_mode(read_mode))
+
+        objs = []
+        for row in data:
+            related = row.pop('__related', {})
+            obj = cls.from_dictionary(row, sensitive_fields=True)
+            for relation_field, related_row in related.items():
+                if not related_row:
+                    continue
+                field = obj.fields[relation_field]
+                field._related = Reference(
+                    field.relation_class, field.value,
+                    field.relation_class.from_dictionary(
+                        related_row, sensitive_fields=True))
+            objs.append(obj)
+        return objs
+
+    @classmethod
+    def _values(cls, args, fil, fields, read_mode):
+        aliases = cls.get_field_aliases()
+        return cls.get_storage().iterate(
+            cls.get_table_name(),
+            cls.get_query(*args, **fil),
+            cls.get_query_indexes(),
+            cls.get_read_mode(read_mode),
+            [aliases.get(f, f) for f in fields] if fields else None)
+
+    @classmethod
+    def find_values(cls, *args, fields=None, read_mode=None, **fil):
+        rows = cls._values(args, fil, fields, read_mode)
+        primary_key = cls.get_primary_key()
+        if primary_key == 'id':
+            return list(rows)
+
+        result = []
+        for row in rows:
+            if primary_key in row:
+                row['id'] = row.pop(primary_key)
+            result.append(row)
+        return result
+
+    @classmethod
+    def find_tuples(cls, *args, fields, columnar=False, read_mode=None,
+                    **fil):
+        keys = [cls.get_field_aliases().get(f, f) for f in fields]
+        rows = cls._values(args, fil, fields, read_mode)
+
+        if columnar:
+            columns = [[] for _ in keys]
+            for row in rows:
+                for column, key in zip(columns, keys):
+                    column.append(row.get(key))
+            return dict(zip(fields, columns))
+
+        return [tuple(row.get(key) for key in keys) for row in rows]
+
+    @classmethod
+    def delete(cls, *args, **fil):
+        query = cls.get_query(*args, **fil)
+        if not cls.tracks_aggregates():
+            return cls.get_storage().delete(
+                cls.get_table_name(), query, cls.get_query_indexes())
+
+        result = cls.get_storage().delete(
+            cls.get_table_name(), query, cls.get_query_indexes(),
+            return_changes=True)
+        maintain_aggregates(cls, result_changes(result))
+        return bool(result and result.get('deleted', 0) > 0)
+
+    @classmethod
+    def scan(cls, partitions=8, workers=None, raw=False, batch_size=1000,
+             sample_size=None, read_mode=None):
+        return scan(
+            cls, partitions, workers, raw, batch_size, sample_size, read_mode)
+
+    @classmethod
+    def map_partitions(cls, func, partitions=8, workers=None,
+                       executor='thread', raw=False, sample_size=None,
+                       read_mode=None):
+        return map_partitions(
+            cls, func, partitions, workers, executor, raw, sample_size,
+            read_mode)
+
+    @classmethod
+    def migrate(cls, changes=None, transform=None, **options):
+        return Migration(cls, changes, transform, **options).run()
+
+    @classmethod
+    def export_ndjson(cls, fp, *args, read_mode=None, **fil):
+        return export_ndjson(cls, fp, *args, read_mode=read_mode, **fil)
+
+    @classmethod
+    def import_ndjson(cls, fp, **options):
+        return import_ndjson(cls, fp, **options)
+
+    @classmethod
+    def _checked_changes(cls, changes):
+        fields = cls.get_fields_values()
+        result = {}
+        for name, value in changes.items():
+            if isinstance(value, UpdateOperator):
+                result[name] = value
+                continue
+
+            template = fields.get(name)
+            if template is None or not template.is_field:
+                raise ValueError(f'Unknown field: {name}')
+            if value is None:
+                result[name] = value
+                continue
+
+            field = copy.copy(template)
+            field.__set__(_NEW_OBJECT, value)
+            result[name] = field.storage_value \
+                if field.is_encoded \
+                else field.value
+        return result
+
+    @classmethod
+    def update_where(cls, fil=None, **changes):
+        fil = {} if fil is None else fil
+        query = cls.get_query(**fil) \
+            if isinstance(fil, dict) \
+            else cls.get_query(fil)
+
+        options = cls.get_write_options()
+        if cls.tracks_aggregates(changes):
+            options['return_changes'] = True
+
+        result = cls.get_storage().update_where(
+            cls.get_table_name(),
+            query,
+            {**cls._checked_changes(changes), 'updated': cls.updated.now()},
+            cls.get_query_indexes(),
+            **options)
+        if options.get('return_changes'):
+            maintain_aggregates(cls, result_changes(result))
+        return result.get('replaced', 0) if result else 0
 
     @property
     def dictionary(self):
-        return {
-            field_name: getattr(self, field_name) for field_name
-            in self.get_fields()}
+        return self.get_compiled().dictionary(self)
+
+    @property
+    def storage_dictionary(self):
+        return self.get_compiled().storage_dictionary(self)
 
     @property
     def modified_dictionary(self):
@@ -179,13 +558,14 @@ class BaseModel:
 
     @property
     def unsensitive_dictionary(self):
-        return {
-            field_name: getattr(self, field_name) for field_name
-            in self.get_unsensitive_fields()}
+        return self.get_compiled().unsensitive_dictionary(self)
 
     def get_modified_fields(self):
         return self._modified_fields
 
+    def reset_modified_fields(self):
+        self._modified_fields = []
+
     def __str__(self):
         return f'{self.__class__.__name__}: id {self.id}'
 
@@ -207,9 +587,61 @@ class BaseModel:
     def default(self):
         return self.dictionary
 
-    def save(self):
+    @classmethod
+    def get_write_options(cls, **options):
+        return {**cls.write_options, **options}
+
+    def stamp(self):
+        for field_name in ('created', 'updated'):
+            if not self.fields[field_name].value:
+                setattr(self, field_name, None)
+
+    def generate_id(self, force=False):
+        id_field = self.fields['id']
+        if not self.id and (force or id_field.generator):
+            self.id = id_field.generate()
+        return self.id
+
+    def update_fields(self, **changes):
+        options = self.get_write_options(return_changes=True)
+
+        self.updated = None
+        result = self.get_storage().update_by_id(
+            self.get_table_name(),
+            self.id,
+            {**self._checked_changes(changes), 'updated': self.updated},
+            **options)
+
+        row_changes = result_changes(result)
+        for _, new_val in row_changes:
+            if new_val:
+                self.load_dictionary(new_val, sensitive_fields=True)
+        if self.tracks_aggregates(changes):
+            maintain_aggregates(self.__class__, row_changes)
+        return self
+
+    def save(self, **options):
+        if self.write_behind is not None:
+            self.write_behind.add(self, **options)
+            return
+
+        options = self.get_write_options(**options)
+
         if not self.id:
-            self.id = self.storage.insert(self)
+            self.stamp()
+            self.generate_id(force=options.get('noreply', False))
+            self.id = self.get_storage().insert(self, **options)
+            if self.tracks_aggregates():
+                maintain_aggregates(
+                    self.__class__, [(None, self.storage_dictionary)])
         else:
+            tracked = self.tracks_aggregates(self.get_modified_fields()) \
+                and not options.get('noreply')
+            if tracked:
+                options['return_changes'] = True
+
             self.updated = None
-            self.storage.update(self)
+            result = self.get_storage().update(self, **options)
+            if tracked:
+                maintain_aggregates(self.__class__, result_changes(result))
+        self.reset_modified_fields()
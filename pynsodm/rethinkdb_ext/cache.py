@@ -0,0 +1,204 @@
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+cache_logger = logging.getLogger('pynsodm.cache')
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS documents ('
+    ' table_name TEXT NOT NULL,'
+    ' id TEXT NOT NULL,'
+    ' version INTEGER NOT NULL DEFAULT 0,'
+    ' generation INTEGER NOT NULL DEFAULT 0,'
+    ' expires REAL,'
+    ' data BLOB,'
+    ' PRIMARY KEY (table_name, id))',
+    'CREATE TABLE IF NOT EXISTS generations ('
+    ' table_name TEXT PRIMARY KEY,'
+    ' generation INTEGER NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS versions ('
+    ' id INTEGER PRIMARY KEY CHECK (id = 0),'
+    ' version INTEGER NOT NULL)',
+    'INSERT OR IGNORE INTO versions (id, version) VALUES (0, 0)',
+)
+
+
+class CacheStamp:
+    def __init__(self, version, generation, taken):
+        self.version = version
+        self.generation = generation
+        self.taken = taken
+
+
+class DocumentCache:
+    def __init__(self, path, ttl=60, tables=None, purge_every=1000,
+                 fill_timeout=60):
+        self._path = path
+        self._ttl = ttl
+        self._fill_timeout = fill_timeout
+        self._tables = set(tables) if tables else None
+        self._purge_every = purge_every
+        self._local = threading.local()
+        self._fills = 0
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0}
+        self._followers = []
+
+        with self._connection() as connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+
+    @property
+    def path(self): return self._path
+
+    @property
+    def stats(self): return dict(self._stats)
+
+    def caches(self, table_name):
+        return self._tables is None or table_name in self._tables
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(
+                self._path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def _key(obj_id):
+        return str(obj_id)
+
+    def _generation(self, connection, table_name):
+        row = connection.execute(
+            'SELECT generation FROM generations WHERE table_name = ?',
+            (table_name,)).fetchone()
+        return row[0] if row else 0
+
+    def lookup(self, table_name, ids):
+        connection = self._connection()
+        now = time.time()
+        hits, stamps = {}, {}
+
+        generation = self._generation(connection, table_name)
+        keys = [self._key(i) for i in ids]
+        rows = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows.update({
+                row[0]: row[1:] for row in connection.execute(
+                    'SELECT id, version, generation, expires, data '
+                    'FROM documents WHERE table_name = ? '
+                    f'AND id IN ({", ".join("?" * len(chunk))})',
+                    (table_name, *chunk))})
+
+        for obj_id, key in zip(ids, keys):
+            version, row_generation, expires, data = \
+                rows.get(key, (0, 0, None, None))
+            if data is not None and row_generation == generation and \
+                    (expires is None or expires > now):
+                hits[obj_id] = pickle.loads(data)
+                self._stats['hits'] += 1
+                continue
+
+            if data is not None:
+                self._stats['stale'] += 1
+            self._stats['misses'] += 1
+            stamps[obj_id] = CacheStamp(version, generation, now)
+        return hits, stamps
+
+    def fill(self, table_name, documents, stamps):
+        connection = self._connection()
+        now = time.time()
+        expires = now + self._ttl if self._ttl else None
+
+        connection.executemany(
+            'INSERT INTO documents '
+            '(table_name, id, version, generation, expires, data) '
+            'VALUES (?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (table_name, id) DO UPDATE SET '
+            ' generation = excluded.generation,'
+            ' expires = excluded.expires,'
+            ' data = excluded.data '
+            'WHERE documents.version = excluded.version',
+            [
+                (
+                    table_name, self._key(obj_id), stamps[obj_id].version,
+                    stamps[obj_id].generation, expires,
+                    pickle.dumps(document, pickle.HIGHEST_PROTOCOL))
+                for obj_id, document in documents.items()
+                if obj_id in stamps and
+                now - stamps[obj_id].taken < self._fill_timeout])
+
+        self._fills += 1
+        if self._purge_every and self._fills % self._purge_every == 0:
+            self.purge()
+
+    def invalidate(self, table_name, ids):
+        keys = [self._key(i) for i in ids if i is not None]
+        if len(keys) == 0:
+            return
+
+        connection = self._connection()
+        expires = time.time() + self._fill_timeout
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute(
+                'UPDATE versions SET version = version + 1 WHERE id = 0')
+            connection.executemany(
+                'INSERT INTO documents (table_name, id, version, expires) '
+                'VALUES (?, ?, (SELECT version FROM versions), ?) '
+                'ON CONFLICT (table_name, id) DO UPDATE SET '
+                ' version = excluded.version,'
+                ' expires = excluded.expires,'
+                ' data = NULL',
+                [(table_name, key, expires) for key in keys])
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def invalidate_table(self, table_name):
+        self._connection().execute(
+            'INSERT INTO generations (table_name, generation) '
+            'VALUES (?, 1) '
+            'ON CONFLICT (table_name) DO UPDATE SET '
+            ' generation = generations.generation + 1',
+            (table_name,))
+
+    def purge(self):
+        self._connection().execute(
+            'DELETE FROM documents WHERE expires < ?', (time.time(),))
+
+    def clear(self):
+        connection = self._connection()
+        connection.execute('DELETE FROM documents')
+        connection.execute('DELETE FROM generations')
+
+    def follow(self, storage, *models):
+        def watch(table_name, primary_key):
+            cache_key = storage.cache_key(table_name)
+            try:
+                for change in storage.clone().changes(table_name):
+                    row = change.get('new_val') or change.get('old_val')
+                    if row:
+                        self.invalidate(cache_key, [row.get(primary_key)])
+            except Exception as ex:
+                cache_logger.error(
+                    'Changefeed for %s stopped: %s', table_name, ex)
+                self.invalidate_table(cache_key)
+
+        for model in models:
+            follower = threading.Thread(
+                target=watch,
+                args=(model.get_table_name(), model.get_primary_key()),
+                name=f'pynsodm-cache-{model.get_table_name()}',
+                daemon=True)
+            follower.start()
+            self._followers.append(follower)
+        return self._followers
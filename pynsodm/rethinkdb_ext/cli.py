@@ -0,0 +1,197 @@
+import argparse
+import importlib
+import json
+import sys
+
+from .base_model import BaseModel
+from .storage import Storage
+
+
+def get_models(names=None):
+    result = []
+    subclasses = list(BaseModel.__subclasses__())
+
+    while subclasses:
+        subclass = subclasses.pop(0)
+        subclasses.extend(subclass.__subclasses__())
+        if not names or subclass.get_model_name() in names:
+            result.append(subclass)
+    return result
+
+
+def get_storage(args):
+    options = {
+        k: getattr(args, k) for k
+        in ('host', 'port', 'user', 'password', 'db')
+        if getattr(args, k) is not None}
+    return Storage(**options)
+
+
+def load(args):
+    for module in args.module:
+        importlib.import_module(module)
+
+    names = [m for m in (args.model or []) if len(m) > 0]
+    models = get_models(names)
+
+    storage = get_storage(args)
+    storage._init_db()
+    storage.bind(*models)
+    return storage, models
+
+
+def command_reconfigure(args):
+    storage, models = load(args)
+    result = storage.reconfigure(
+        *models, dry_run=args.dry_run, rebalance=not args.no_rebalance)
+    print(json.dumps(result, indent=2, default=str))
+    return 0
+
+
+def get_model(args, models):
+    if len(models) != 1:
+        raise SystemExit('Exactly one --model is required')
+    return models[0]
+
+
+def command_export(args):
+    _, models = load(args)
+    model = get_model(args, models)
+    fil = json.loads(args.filter) if args.filter else {}
+
+    if args.output == '-':
+        count = model.export_ndjson(sys.stdout, **fil)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as fp:
+            count = model.export_ndjson(fp, **fil)
+    print(f'Exported {count} rows', file=sys.stderr)
+    return 0
+
+
+def command_import(args):
+    _, models = load(args)
+    model = get_model(args, models)
+
+    def progress(totals):
+        print(
+            f'\rImported {totals["inserted"]}/{totals["rows"]} rows, '
+            f'{totals["errors"]} errors', end='', file=sys.stderr)
+
+    options = {
+        'batch_size': args.batch_size,
+        'concurrency': args.concurrency,
+        'progress': progress,
+        'validate': args.validate,
+    }
+    if args.durability:
+        options['durability'] = args.durability
+    if args.conflict:
+        options['conflict'] = args.conflict
+
+    if args.input == '-':
+        totals = model.import_ndjson(sys.stdin, **options)
+    else:
+        with open(args.input, encoding='utf-8') as fp:
+            totals = model.import_ndjson(fp, **options)
+    print(file=sys.stderr)
+
+    if totals['first_error']:
+        print(totals['first_error'], file=sys.stderr)
+    return 1 if totals['errors'] else 0
+
+
+def command_migrate(args):
+    _, models = load(args)
+    model = get_model(args, models)
+
+    def progress(state):
+        print(
+            f'\rProcessed {state["processed"]} rows, '
+            f'{"would update" if args.dry_run else "updated"} '
+            f'{state["updated"]}', end='', file=sys.stderr)
+
+    options = {
+        'fil': json.loads(args.filter) if args.filter else None,
+        'name': args.name,
+        'batch_size': args.batch_size,
+        'rate_limit': args.rate_limit,
+        'target_latency': args.target_latency,
+        'checkpoint': args.checkpoint,
+        'dry_run': args.dry_run,
+        'progress': progress,
+    }
+    if args.durability:
+        options['durability'] = args.durability
+
+    state = model.migrate(changes=json.loads(args.set), **options)
+    print(file=sys.stderr)
+    print(json.dumps(state, indent=2, default=str))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m pynsodm.rethinkdb_ext')
+    parser.add_argument(
+        '--module', '-m', action='append', default=[],
+        help='module with model definitions (can be repeated)')
+    parser.add_argument(
+        '--model', action='append',
+        help='model name (can be repeated, all models by default)')
+    parser.add_argument('--host')
+    parser.add_argument('--port')
+    parser.add_argument('--user')
+    parser.add_argument('--password')
+    parser.add_argument('--db')
+
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    reconfigure = commands.add_parser(
+        'reconfigure',
+        help='apply table_options (shards, replicas) to existing tables')
+    reconfigure.add_argument('--dry-run', action='store_true')
+    reconfigure.add_argument('--no-rebalance', action='store_true')
+    reconfigure.set_defaults(handler=command_reconfigure)
+
+    export = commands.add_parser(
+        'export', help='stream a table to NDJSON')
+    export.add_argument('--output', '-o', default='-')
+    export.add_argument(
+        '--filter', help='JSON object with find() lookups')
+    export.set_defaults(handler=command_export)
+
+    import_ = commands.add_parser(
+        'import', help='load NDJSON into a table with batched inserts')
+    import_.add_argument('--input', '-i', default='-')
+    import_.add_argument('--batch-size', type=int, default=1000)
+    import_.add_argument('--concurrency', type=int, default=4)
+    import_.add_argument('--durability', choices=('hard', 'soft'))
+    import_.add_argument(
+        '--conflict', choices=('error', 'replace', 'update'))
+    import_.add_argument('--validate', action='store_true')
+    import_.set_defaults(handler=command_import)
+
+    migrate = commands.add_parser(
+        'migrate',
+        help='set fields on existing documents in throttled batches')
+    migrate.add_argument(
+        '--set', required=True, help='JSON object with new field values')
+    migrate.add_argument(
+        '--filter', help='JSON object with find() lookups')
+    migrate.add_argument('--name')
+    migrate.add_argument('--batch-size', type=int, default=500)
+    migrate.add_argument(
+        '--rate-limit', type=float, help='documents per second')
+    migrate.add_argument(
+        '--target-latency', type=float,
+        help='adapt the batch size to this batch latency in seconds')
+    migrate.add_argument('--checkpoint', help='progress file for resuming')
+    migrate.add_argument('--durability', choices=('hard', 'soft'))
+    migrate.add_argument('--dry-run', action='store_true')
+    migrate.set_defaults(handler=command_migrate)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
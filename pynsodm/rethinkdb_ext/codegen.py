@@ -0,0 +1,113 @@
+_MISSING = object()
+
+
+def _compile(model, name, lines, namespace):
+    source = '\n'.join(lines) + '\n'
+    code = compile(source, f'<pynsodm {model.__qualname__}.{name}>', 'exec')
+    exec(code, namespace)
+    return namespace[name]
+
+
+def _new_fields(model, templates):
+    namespace = {'_new': object.__new__}
+    lines = ['def new_fields():']
+    items = []
+
+    for index, (name, field) in enumerate(templates.items()):
+        namespace[f'C{index}'] = field.__class__
+        namespace[f'D{index}'] = field.__dict__
+        lines.append(f'    f{index} = _new(C{index})')
+        lines.append(f'    f{index}.__dict__.update(D{index})')
+        items.append(f'{name!r}: f{index}')
+
+    lines.append(f'    return {{{", ".join(items)}}}')
+    return _compile(model, 'new_fields', lines, namespace)
+
+
+def _load(model, field_names, name):
+    primary_key = model.get_primary_key()
+    namespace = {'_MISSING': _MISSING}
+    lines = [
+        f'def {name}(obj, data):',
+        '    d = obj.__dict__',
+        '    fields = d["fields"]',
+        '    get = data.get',
+        '    d["_exist_object"] = True',
+    ]
+
+    for field_name in field_names:
+        lines.append(f'    v = get({field_name!r}, _MISSING)')
+        if field_name == 'id' and primary_key != 'id':
+            lines[-1] = f'    v = get({primary_key!r}, _MISSING)'
+            lines.append('    if v is _MISSING:')
+            lines.append('        v = get("id", _MISSING)')
+        lines.append('    if v is not _MISSING:')
+        lines.append(f'        fields[{field_name!r}].__set__(obj, v)')
+
+    lines.append('    d["_exist_object"] = False')
+    lines.append('    d["_modified_fields"] = []')
+    return _compile(model, name, lines, namespace)
+
+
+def _storage_dictionary(model, fields):
+    primary_key = model.get_primary_key()
+    lines = [
+        'def storage_dictionary(obj):',
+        '    fields = obj.__dict__["fields"]',
+        '    document = {}',
+        '    v = fields["id"].__get__(obj, None)',
+        '    if v:',
+        f'        document[{primary_key!r}] = v',
+    ]
+
+    for field_name, field in fields.items():
+        if field_name == 'id' or field.is_aggregate:
+            continue
+        if field.is_encoded:
+            lines.append(
+                f'    document[{field_name!r}] = '
+                f'fields[{field_name!r}].storage_value')
+        elif field.is_field:
+            lines.append(
+                f'    document[{field_name!r}] = '
+                f'fields[{field_name!r}].__get__(obj, None)')
+
+    lines.append('    return document')
+    return _compile(model, 'storage_dictionary', lines, {})
+
+
+def _dictionary(model, field_names, name):
+    items = [
+        f'        {field_name!r}: fields[{field_name!r}].__get__(obj, None),'
+        for field_name in field_names]
+    lines = [
+        f'def {name}(obj):',
+        '    fields = obj.__dict__["fields"]',
+        '    return {',
+        *items,
+        '    }',
+    ]
+    return _compile(model, name, lines, {})
+
+
+class ModelCode:
+    def __init__(self, model):
+        fields = model.get_fields_values()
+        templates = {
+            **fields,
+            **{
+                name: getattr(model, name) for name
+                in model.get_resolver_fields()}}
+        unsensitive_fields = model.get_unsensitive_fields()
+
+        self.new_fields = _new_fields(model, templates)
+        self.load = _load(model, unsensitive_fields, 'load')
+        self.load_sensitive = _load(model, list(fields), 'load_sensitive')
+        self.storage_dictionary = _storage_dictionary(model, fields)
+        self.dictionary = _dictionary(model, list(fields), 'dictionary')
+        self.unsensitive_dictionary = _dictionary(
+            model, unsensitive_fields, 'unsensitive_dictionary')
+
+
+def compile_model(model):
+    return ModelCode(model)
@@ -0,0 +1,220 @@
+import contextvars
+import json
+import logging
+import time
+
+from contextlib import contextmanager
+
+from rethinkdb.net import Cursor
+
+try:
+    from opentelemetry import trace
+    _tracer = trace.get_tracer('pynsodm')
+except ImportError:
+    _tracer = None
+
+slow_query_logger = logging.getLogger('pynsodm.slow_queries')
+n_plus_one_logger = logging.getLogger('pynsodm.n_plus_one')
+
+_current_scope = contextvars.ContextVar('pynsodm_query_scope', default=None)
+
+
+class QueryEvent:
+    def __init__(self, table, operation, term, shape=None):
+        self.table = table
+        self.operation = operation
+        self.term = term
+        self.shape = shape if shape is not None else (table, operation, ())
+        self.scope = _current_scope.get()
+        self.started = None
+        self.duration = None
+        self.result = None
+        self.rows = None
+        self.error = None
+        self._bytes = None
+
+    @property
+    def bytes(self):
+        if self._bytes is None and self.result is not None:
+            self._bytes = len(json.dumps(
+                self.result, default=str, ensure_ascii=False).encode('utf-8'))
+        return self._bytes
+
+    def __str__(self):
+        duration = f'{self.duration * 1000:.2f}ms' \
+            if self.duration is not None \
+            else '-'
+        return f'{self.operation} {self.table} ({duration}): {self.term}'
+
+
+class QueryStats:
+    def __init__(self):
+        self._counters = {}
+
+    def record(self, event):
+        counter = self._counters.setdefault(
+            (event.table, event.operation),
+            {'count': 0, 'errors': 0, 'duration': 0.0, 'rows': 0})
+        counter['count'] += 1
+        counter['duration'] += event.duration or 0.0
+        counter['rows'] += event.rows or 0
+        if event.error:
+            counter['errors'] += 1
+
+    def snapshot(self):
+        return {k: dict(v) for k, v in self._counters.items()}
+
+    def reset(self):
+        self._counters = {}
+
+
+class QueryScope:
+    def __init__(self, name=None, threshold=5, on_repeated=None):
+        self.name = name
+        self.threshold = threshold
+        self.on_repeated = on_repeated
+        self.queries = 0
+        self.duration = 0.0
+        self._shapes = {}
+
+    def record(self, event):
+        self.queries += 1
+        self.duration += event.duration or 0.0
+
+        count = self._shapes.get(event.shape, 0) + 1
+        self._shapes[event.shape] = count
+
+        if self.threshold and count == self.threshold:
+            n_plus_one_logger.warning(
+                'Repeated query %s executed %s times in scope %s',
+                event.shape, count, self.name)
+            if self.on_repeated:
+                self.on_repeated(self, event.shape, count)
+
+    @property
+    def repeated(self):
+        return {
+            k: v for k, v in self._shapes.items()
+            if self.threshold and v >= self.threshold}
+
+
+@contextmanager
+def query_scope(name=None, threshold=5, on_repeated=None):
+    scope = QueryScope(name, threshold, on_repeated)
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+
+class Instrumentation:
+    def __init__(self, slow_query_threshold=None):
+        self._pre_hooks = []
+        self._post_hooks = []
+        self.slow_query_threshold = slow_query_threshold
+        self.stats = QueryStats()
+
+    def add_hook(self, pre=None, post=None):
+        if pre:
+            self._pre_hooks.append(pre)
+        if post:
+            self._post_hooks.append(post)
+
+    def remove_hook(self, pre=None, post=None):
+        if pre in self._pre_hooks:
+            self._pre_hooks.remove(pre)
+        if post in self._post_hooks:
+            self._post_hooks.remove(post)
+
+    def run(self, term, connection, table, operation, shape=None, **kwargs):
+        event = QueryEvent(table, operation, term, shape)
+
+        for hook in self._pre_hooks:
+            hook(event)
+
+        span = _tracer.start_span(f'rethinkdb {operation}') \
+            if _tracer \
+            else None
+
+        event.started = time.perf_counter()
+        try:
+            result = term.run(connection, **kwargs)
+            if isinstance(result, Cursor):
+                result = list(result)
+            event.result = result
+            event.rows = count_rows(result)
+            return result
+        except Exception as ex:
+            event.error = ex
+            raise
+        finally:
+            event.duration = time.perf_counter() - event.started
+            self._finish(event, span)
+
+    def iterate(self, term, connection, table, operation, shape=None,
+                **kwargs):
+        event = QueryEvent(table, operation, term, shape)
+
+        for hook in self._pre_hooks:
+            hook(event)
+
+        span = _tracer.start_span(f'rethinkdb {operation}') \
+            if _tracer \
+            else None
+
+        event.started = time.perf_counter()
+        event.rows = 0
+        cursor = None
+        try:
+            cursor = term.run(connection, **kwargs)
+            for row in cursor:
+                event.rows += 1
+                yield row
+        except Exception as ex:
+            event.error = ex
+            raise
+        finally:
+            if isinstance(cursor, Cursor):
+                cursor.close()
+            event.duration = time.perf_counter() - event.started
+            self._finish(event, span)
+
+    def _finish(self, event, span):
+        self.stats.record(event)
+
+        if event.scope:
+            event.scope.record(event)
+
+        if self.slow_query_threshold is not None and \
+                event.duration >= self.slow_query_threshold:
+            slow_query_logger.warning(
+                'Slow query %.2fms on %s: %s',
+                event.duration * 1000, event.table, event.term)
+
+        if span:
+            span.set_attribute('db.system', 'rethinkdb')
+            span.set_attribute('db.operation', event.operation)
+            if event.table:
+                span.set_attribute('db.rethinkdb.table', event.table)
+            if event.rows is not None:
+                span.set_attribute('db.rethinkdb.rows', event.rows)
+            if event.error:
+                span.record_exception(event.error)
+            span.end()
+
+        for hook in self._post_hooks:
+            hook(event)
+
+
+def count_rows(result):
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        write_keys = ('inserted', 'replaced', 'deleted', 'unchanged')
+        if any(k in result for k in write_keys) and 'errors' in result:
+            return sum(result.get(k, 0) for k in write_keys)
+        return 1
+    return 1
@@ -0,0 +1,213 @@
+import asyncio
+import contextvars
+import copy
+import functools
+import threading
+import weakref
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+
+_current_loader = contextvars.ContextVar('pynsodm_loader', default=None)
+_caching_loaders = weakref.WeakSet()
+
+
+def current_loader():
+    return _current_loader.get()
+
+
+def invalidate_loaders(storage, table_name, ids=None):
+    for loader in list(_caching_loaders):
+        loader.invalidate(storage, table_name, ids)
+
+
+class LoadBatch:
+    def __init__(self, key):
+        self.key = key
+        self.futures = {}
+        self.full = threading.Event()
+
+
+class Loader:
+    def __init__(self, window=0.002, max_batch=500, cache=True):
+        self._window = window
+        self._max_batch = max_batch
+        self._cache = {} if cache else None
+        self._lock = threading.Lock()
+        self._batches = {}
+        self._async_batches = {}
+        self._executor = None
+        self._clones = {}
+        self._stats = {'loads': 0, 'batches': 0, 'hits': 0}
+
+        if cache:
+            _caching_loaders.add(self)
+
+    @property
+    def stats(self): return dict(self._stats)
+
+    def _cached(self, key, obj_id):
+        if self._cache is None:
+            return False, None
+        rows = self._cache.get(key)
+        if rows is None or obj_id not in rows:
+            return False, None
+        self._stats['hits'] += 1
+        return True, rows[obj_id]
+
+    def _fetch(self, key, ids, storage=None):
+        source, table_name, read_mode, primary_key = key
+        storage = storage or source
+        self._stats['batches'] += 1
+        rows = {
+            row[primary_key]: row for row
+            in storage.get_many(table_name, ids, read_mode, primary_key)}
+        result = {i: rows.get(i) for i in ids}
+        if self._cache is not None:
+            with self._lock:
+                self._cache.setdefault(key, {}).update(rows)
+        return result
+
+    def _dispatch(self, batch):
+        try:
+            rows = self._fetch(batch.key, list(batch.futures))
+        except Exception as ex:
+            for future in batch.futures.values():
+                future.set_exception(ex)
+            return
+
+        for obj_id, future in batch.futures.items():
+            future.set_result(rows[obj_id])
+
+    def load(self, storage, table_name, obj_id, read_mode=None,
+             primary_key='id'):
+        key = (storage, table_name, read_mode, primary_key)
+
+        with self._lock:
+            self._stats['loads'] += 1
+            found, row = self._cached(key, obj_id)
+            if found:
+                return copy.deepcopy(row)
+
+            batch = self._batches.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._batches[key] = LoadBatch(key)
+
+            future = batch.futures.get(obj_id)
+            if future is None:
+                future = batch.futures[obj_id] = Future()
+            if len(batch.futures) >= self._max_batch:
+                self._batches.pop(key, None)
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self._window)
+            with self._lock:
+                if self._batches.get(key) is batch:
+                    del self._batches[key]
+            self._dispatch(batch)
+
+        return copy.deepcopy(future.result())
+
+    def _fetch_cloned(self, key, ids):
+        source = key[0]
+        if id(source) not in self._clones:
+            self._clones[id(source)] = (source, source.clone())
+        return self._fetch(key, ids, self._clones[id(source)][1])
+
+    def _dispatch_async(self, batch):
+        if batch.full.is_set():
+            return
+        batch.full.set()
+        if self._async_batches.get(batch.key) is batch:
+            del self._async_batches[batch.key]
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='pynsodm-loader')
+
+        loop = batch.key[0]
+        fetched = loop.run_in_executor(
+            self._executor, self._fetch_cloned, batch.key[1:],
+            list(batch.futures))
+        fetched.add_done_callback(functools.partial(self._resolve, batch))
+
+    @staticmethod
+    def _resolve(batch, fetched):
+        error = asyncio.CancelledError() \
+            if fetched.cancelled() \
+            else fetched.exception()
+        for obj_id, future in batch.futures.items():
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(fetched.result()[obj_id])
+
+    async def load_async(self, storage, table_name, obj_id, read_mode=None,
+                         primary_key='id'):
+        loop = asyncio.get_running_loop()
+        key = (storage, table_name, read_mode, primary_key)
+
+        self._stats['loads'] += 1
+        found, row = self._cached(key, obj_id)
+        if found:
+            return copy.deepcopy(row)
+
+        batch = self._async_batches.get((loop, *key))
+        if batch is None:
+            batch = self._async_batches[(loop, *key)] = LoadBatch(
+                (loop, *key))
+            if self._window:
+                loop.call_later(self._window, self._dispatch_async, batch)
+            else:
+                loop.call_soon(self._dispatch_async, batch)
+
+        future = batch.futures.get(obj_id)
+        if future is None:
+            future = batch.futures[obj_id] = loop.create_future()
+        if len(batch.futures) >= self._max_batch:
+            self._dispatch_async(batch)
+
+        return copy.deepcopy(await asyncio.shield(future))
+
+    def invalidate(self, storage, table_name, ids=None):
+        if self._cache is None:
+            return
+        with self._lock:
+            for key, rows in self._cache.items():
+                if key[0] is not storage or key[1] != table_name:
+                    continue
+                if ids is None:
+                    rows.clear()
+                else:
+                    for obj_id in ids:
+                        rows.pop(obj_id, None)
+
+    def clear(self):
+        if self._cache is not None:
+            with self._lock:
+                self._cache.clear()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for _, storage in self._clones.values():
+            storage.close()
+        self._clones = {}
+
+
+@contextmanager
+def batch_loads(loader=None, **options):
+    owned = loader is None
+    loader = loader or Loader(**options)
+    token = _current_loader.set(loader)
+    try:
+        yield loader
+    finally:
+        _current_loader.reset(token)
+        if owned:
+            loader.close()
@@ -0,0 +1,197 @@
+import json
+import logging
+import os
+import time
+
+from .aggregates import result_changes, maintain_aggregates
+
+migration_logger = logging.getLogger('pynsodm.migrations')
+
+
+class Checkpoint:
+    def __init__(self, path):
+        self._path = path
+
+    def load(self):
+        if not self._path or not os.path.exists(self._path):
+            return None
+        with open(self._path, encoding='utf-8') as fp:
+            return json.load(fp)
+
+    def save(self, state):
+        if not self._path:
+            return
+        tmp_path = f'{self._path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as fp:
+            json.dump(state, fp, default=str)
+        os.replace(tmp_path, self._path)
+
+
+class Throttle:
+    def __init__(self, rate_limit=None, target_latency=None, batch_size=500,
+                 min_batch_size=10, max_batch_size=5000):
+        self._rate_limit = rate_limit
+        self._target_latency = target_latency
+        self._min_batch_size = min(min_batch_size, batch_size)
+        self._max_batch_size = max(max_batch_size, batch_size)
+        self._started = time.monotonic()
+        self._processed = 0
+        self.batch_size = batch_size
+
+    def record(self, count, latency):
+        self._processed += count
+
+        if self._target_latency:
+            if latency > self._target_latency:
+                self.batch_size = max(
+                    self._min_batch_size, self.batch_size // 2)
+            else:
+                self.batch_size = min(
+                    self._max_batch_size,
+                    self.batch_size + max(1, self.batch_size // 4))
+
+        if self._rate_limit:
+            expected = self._processed / self._rate_limit
+            elapsed = time.monotonic() - self._started
+            if expected > elapsed:
+                time.sleep(expected - elapsed)
+
+
+class Migration:
+    def __init__(self, model, changes=None, transform=None, fil=None,
+                 name=None, batch_size=500, rate_limit=None,
+                 target_latency=None, checkpoint=None, dry_run=False,
+                 progress=None, **options):
+        if (changes is None) == (transform is None):
+            raise ValueError('Exactly one of changes or transform is required')
+
+        self._model = model
+        self._changes = None if changes is None \
+            else model._checked_changes(changes)
+        self._transform = transform
+        self._fil = None
+        if fil is not None:
+            self._fil = model.get_query(**fil) \
+                if isinstance(fil, dict) \
+                else model.get_query(fil)
+        self._name = name or f'{model.get_table_name()}-migration'
+        self._throttle = Throttle(rate_limit, target_latency, batch_size)
+        self._checkpoint = Checkpoint(checkpoint)
+        self._dry_run = dry_run
+        self._progress = progress
+        self._options = model.get_write_options(**options)
+
+    @property
+    def name(self): return self._name
+
+    def _state(self):
+        state = self._checkpoint.load()
+        if state and state.get('name') == self._name and not self._dry_run:
+            migration_logger.info(
+                'Resuming %s after %s', self._name, state['last_key'])
+            return state
+        return {
+            'name': self._name,
+            'last_key': None,
+            'batches': 0,
+            'processed': 0,
+            'updated': 0,
+            'done': False,
+        }
+
+    def _write_options(self, changed_fields):
+        options = dict(self._options)
+        if self._model.tracks_aggregates(changed_fields):
+            options['return_changes'] = True
+        return options
+
+    def _written(self, result, options):
+        if options.get('return_changes'):
+            maintain_aggregates(self._model, result_changes(result))
+        return (result or {}).get('replaced', 0)
+
+    def _apply_changes(self, storage, ids):
+        model = self._model
+        primary_key = model.get_primary_key()
+        if self._dry_run:
+            return len(ids)
+
+        options = self._write_options(self._changes)
+        result = storage.update_where(
+            model.get_table_name(),
+            {f'{primary_key}__in': ids},
+            {**self._changes, 'updated': model.updated.now()},
+            [primary_key],
+            **options)
+        return self._written(result, options)
+
+    def _apply_transform(self, storage, rows):
+        model = self._model
+        primary_key = model.get_primary_key()
+        documents = []
+        changed_fields = set()
+        for row in rows:
+            changes = self._transform(
+                model.from_dictionary(row, sensitive_fields=True))
+            if changes:
+                changed_fields.update(changes)
+                documents.append({
+                    **model._checked_changes(changes),
+                    'updated': model.updated.now(),
+                    primary_key: row[primary_key]})
+
+        if self._dry_run or len(documents) == 0:
+            return len(documents)
+
+        options = self._write_options(changed_fields)
+        result = storage.update_rows(
+            model.get_table_name(), primary_key, documents, **options)
+        return self._written(result, options)
+
+    def run(self):
+        model = self._model
+        storage = model.get_storage()
+        table_name = model.get_table_name()
+        primary_key = model.get_primary_key()
+        server_side = self._changes is not None
+
+        state = self._state()
+        if state['done']:
+            return state
+
+        while True:
+            started = time.monotonic()
+            limit = self._throttle.batch_size
+            rows = storage.page(
+                table_name, primary_key,
+                after=state['last_key'],
+                limit=limit,
+                fil=self._fil,
+                keys_only=server_side)
+            if not rows:
+                break
+
+            if server_side:
+                updated = self._apply_changes(storage, rows)
+                last_key = rows[-1]
+            else:
+                updated = self._apply_transform(storage, rows)
+                last_key = rows[-1][primary_key]
+
+            state['last_key'] = last_key
+            state['batches'] += 1
+            state['processed'] += len(rows)
+            state['updated'] += updated
+            if not self._dry_run:
+                self._checkpoint.save(state)
+            if self._progress:
+                self._progress(dict(state))
+
+            self._throttle.record(len(rows), time.monotonic() - started)
+            if len(rows) < limit:
+                break
+
+        state['done'] = True
+        if not self._dry_run:
+            self._checkpoint.save(state)
+        return state
@@ -0,0 +1,64 @@
+from .query import build_query
+
+
+class UpdateOperator:
+    def compile(self, r, row, field):
+        raise NotImplementedError()
+
+
+class Inc(UpdateOperator):
+    def __init__(self, amount=1):
+        self.amount = amount
+
+    def compile(self, r, row, field):
+        return row[field].default(0).add(self.amount)
+
+
+class Dec(Inc):
+    def __init__(self, amount=1):
+        Inc.__init__(self, -amount)
+
+
+class Append(UpdateOperator):
+    def __init__(self, *values):
+        self.values = list(values)
+
+    def compile(self, r, row, field):
+        return row[field].default([]).add(r.expr(self.values))
+
+
+class Prepend(Append):
+    def compile(self, r, row, field):
+        return r.expr(self.values).add(row[field].default([]))
+
+
+class SetInsert(Append):
+    def compile(self, r, row, field):
+        return row[field].default([]).set_union(r.expr(self.values))
+
+
+class Remove(Append):
+    def compile(self, r, row, field):
+        return row[field].default([]).difference(r.expr(self.values))
+
+
+class SetIf(UpdateOperator):
+    def __init__(self, value, *args, **fil):
+        self.value = value
+        self.query = build_query(*args, **fil)
+
+    def compile(self, r, row, field):
+        return r.branch(
+            self.query.compile(r, row),
+            self.value,
+            row[field].default(None))
+
+
+def compile_changes(r, changes):
+    def update(row):
+        return {
+            field: value.compile(r, row, field)
+            if isinstance(value, UpdateOperator)
+            else value
+            for field, value in changes.items()}
+    return update
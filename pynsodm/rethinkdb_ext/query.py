@@ -0,0 +1,261 @@
+import re
+
+
+LOOKUPS = (
+    'exact', 'ne', 'gt', 'gte', 'lt', 'lte', 'in', 'nin',
+    'startswith', 'endswith', 'contains', 'isnull', 'regex',
+)
+RANGE_LOOKUPS = {'gt': 'gt', 'gte': 'ge', 'lt': 'lt', 'lte': 'le'}
+
+
+def is_multi_index(indexes, field):
+    return isinstance(indexes, dict) and indexes.get(field, False)
+
+
+class Lookup:
+    def __init__(self, field, op, value):
+        if op not in LOOKUPS:
+            raise ValueError(f'Unknown lookup: {op}')
+        if op in ('in', 'nin'):
+            value = list(value)
+
+        self.field = field
+        self.op = op
+        self.value = value
+
+    @classmethod
+    def parse(cls, key, value):
+        parts = key.split('__')
+        op = parts.pop() \
+            if len(parts) > 1 and parts[-1] in LOOKUPS \
+            else 'exact'
+        return cls('__'.join(parts), op, value)
+
+    @property
+    def key(self):
+        return f'{self.field}__{self.op}'
+
+    def rename(self, aliases):
+        if self.field not in aliases:
+            return self
+        return Lookup(aliases[self.field], self.op, self.value)
+
+    def relation(self, relation_fields):
+        name, _, rest = self.field.partition('__')
+        if rest and name in relation_fields:
+            return name, Lookup(rest, self.op, self.value)
+        return None
+
+    def compile(self, r, row):
+        field = row[self.field].default(None)
+        value = self.value
+
+        if self.op == 'exact':
+            return field.eq(value)
+        elif self.op == 'ne':
+            return field.ne(value)
+        elif self.op in RANGE_LOOKUPS:
+            compare = getattr(field, RANGE_LOOKUPS[self.op])
+            return r.and_(field.ne(None), compare(value))
+        elif self.op == 'in':
+            return r.expr(value).contains(field)
+        elif self.op == 'nin':
+            return r.expr(value).contains(field).not_()
+        elif self.op == 'isnull':
+            return field.eq(None) if value else field.ne(None)
+        elif self.op == 'contains':
+            return r.branch(
+                field.type_of().eq('ARRAY'), field.contains(value),
+                field.type_of().eq('STRING'),
+                field.match(re.escape(str(value))).ne(None),
+                False)
+
+        pattern = {
+            'startswith': lambda v: '^' + re.escape(v),
+            'endswith': lambda v: re.escape(v) + '$',
+            'regex': lambda v: v,
+        }[self.op](value)
+        return r.branch(
+            field.type_of().eq('STRING'),
+            field.match(pattern).ne(None),
+            False)
+
+
+class Q:
+    AND = 'and'
+    OR = 'or'
+
+    def __init__(self, *children, **lookups):
+        self.connector = Q.AND
+        self.negated = False
+        self.children = list(children) + [
+            Lookup.parse(k, v) for k, v in lookups.items()]
+
+    def _combine(self, other, connector):
+        query = Q()
+        query.connector = connector
+        query.children = [self, other]
+        return query
+
+    def __and__(self, other):
+        return self._combine(other, Q.AND)
+
+    def __or__(self, other):
+        return self._combine(other, Q.OR)
+
+    def __invert__(self):
+        query = Q(*self.children)
+        query.connector = self.connector
+        query.negated = not self.negated
+        return query
+
+    def rename(self, aliases):
+        if not aliases:
+            return self
+
+        query = Q(*[child.rename(aliases) for child in self.children])
+        query.connector = self.connector
+        query.negated = self.negated
+        return query
+
+    @property
+    def is_conjunction(self):
+        return self.connector == Q.AND and not self.negated
+
+    @property
+    def is_simple(self):
+        return self.is_conjunction and all(
+            isinstance(c, Lookup) and c.op == 'exact'
+            for c in self.children)
+
+    def keys(self):
+        result = []
+        for child in self.children:
+            if isinstance(child, Lookup):
+                result.append(child.key)
+            else:
+                result.extend(child.keys())
+        return tuple(sorted(result))
+
+    def spans_relations(self, relation_fields):
+        return any(
+            child.spans_relations(relation_fields)
+            if isinstance(child, Q)
+            else child.relation(relation_fields) is not None
+            for child in self.children)
+
+    def split_relations(self, relation_fields):
+        if not self.spans_relations(relation_fields):
+            return self, {}
+        if not self.is_conjunction:
+            raise ValueError('Relation lookups can only be combined with AND')
+
+        base, related = [], {}
+        for child in self.children:
+            if isinstance(child, Q):
+                child, child_related = child.split_relations(relation_fields)
+                for name, query in child_related.items():
+                    related.setdefault(name, []).extend(query.children)
+                base.extend(
+                    child.children if child.is_conjunction else [child])
+                continue
+
+            relation = child.relation(relation_fields)
+            if relation is None:
+                base.append(child)
+            elif relation[1].field == 'id':
+                base.append(Lookup(relation[0], child.op, child.value))
+            else:
+                related.setdefault(relation[0], []).append(relation[1])
+
+        return Q(*base), {
+            name: Q(*lookups) for name, lookups in related.items()}
+
+    def compile(self, r, row):
+        exprs = [child.compile(r, row) for child in self.children]
+
+        if len(exprs) == 0:
+            expr = r.expr(True)
+        elif len(exprs) == 1:
+            expr = exprs[0]
+        elif self.connector == Q.AND:
+            expr = r.and_(*exprs)
+        else:
+            expr = r.or_(*exprs)
+
+        return expr.not_() if self.negated else expr
+
+    def _index_lookups(self, indexes):
+        if not self.is_conjunction:
+            return None, []
+
+        lookups = [
+            c for c in self.children
+            if isinstance(c, Lookup) and c.field in indexes]
+
+        for lookup in lookups:
+            if lookup.op == 'exact' and lookup.value is not None:
+                return 'get_all', [lookup]
+            if lookup.op == 'in' and len(lookup.value) > 0 and \
+                    None not in lookup.value:
+                return 'get_all', [lookup]
+
+        for lookup in lookups:
+            if lookup.op in RANGE_LOOKUPS:
+                return 'between', [
+                    c for c in lookups
+                    if c.field == lookup.field and c.op in RANGE_LOOKUPS]
+
+        return None, []
+
+    def index_for(self, indexes=()):
+        method, index_lookups = self._index_lookups(indexes)
+        return index_lookups[0].field if method else None
+
+    def build(self, r, table, indexes=(), writable=False):
+        method, index_lookups = self._index_lookups(indexes)
+
+        if method == 'get_all':
+            lookup = index_lookups[0]
+            keys = list(dict.fromkeys(lookup.value)) \
+                if lookup.op == 'in' \
+                else [lookup.value]
+            selection = table.get_all(*keys, index=lookup.field)
+            if len(keys) > 1 and is_multi_index(indexes, lookup.field):
+                selection = table.get_all(r.args(
+                    selection[table.info()['primary_key']].distinct())) \
+                    if writable \
+                    else selection.distinct()
+        elif method == 'between':
+            lower, upper = r.minval, r.maxval
+            left_bound, right_bound = 'closed', 'open'
+            for lookup in index_lookups:
+                if lookup.op in ('gt', 'gte'):
+                    lower = lookup.value
+                    left_bound = 'open' if lookup.op == 'gt' else 'closed'
+                else:
+                    upper = lookup.value
+                    right_bound = 'closed' if lookup.op == 'lte' else 'open'
+            selection = table.between(
+                lower, upper,
+                index=index_lookups[0].field,
+                left_bound=left_bound,
+                right_bound=right_bound)
+        else:
+            selection = table
+
+        rest = Q(*[c for c in self.children if c not in index_lookups]) \
+            if method \
+            else self
+
+        if len(rest.children) == 0:
+            return selection
+        if rest.is_simple:
+            return selection.filter({c.field: c.value for c in rest.children})
+        return selection.filter(lambda row: rest.compile(r, row))
+
+
+def build_query(*args, **fil):
+    if len(args) == 1 and len(fil) == 0 and isinstance(args[0], Q):
+        return args[0]
+    return Q(*args, **fil)
@@ -0,0 +1,30 @@
+import contextvars
+
+from contextlib import contextmanager
+
+_storage_overrides = contextvars.ContextVar(
+    'pynsodm_storage_overrides', default=None)
+
+
+@contextmanager
+def use_storage(storage, *models):
+    from .base_model import BaseModel
+
+    overrides = dict(_storage_overrides.get() or {})
+    for model in models or (BaseModel,):
+        overrides[model] = storage
+
+    token = _storage_overrides.set(overrides)
+    try:
+        yield storage
+    finally:
+        _storage_overrides.reset(token)
+
+
+def resolve_storage(model):
+    overrides = _storage_overrides.get()
+    if overrides:
+        for klass in model.__mro__:
+            if klass in overrides:
+                return overrides[klass]
+    return model.storage
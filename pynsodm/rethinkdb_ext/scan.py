@@ -0,0 +1,129 @@
+import queue
+import threading
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+EXECUTORS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
+_DONE = object()
+
+
+def split_ranges(storage, table_name, primary_key, partitions,
+                 sample_size=None, read_mode=None):
+    if partitions <= 1:
+        return [(None, None)]
+
+    keys = sorted(storage.sample_keys(
+        table_name, primary_key, sample_size or partitions * 100, read_mode))
+    bounds = sorted(set(
+        keys[len(keys) * i // partitions] for i in range(1, partitions)
+        if len(keys) > 0))
+
+    edges = [None, *bounds, None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _rows(storage, model, bounds, raw, read_mode):
+    lower, upper = bounds
+    rows = storage.iterate_range(
+        model.get_table_name(), model.get_primary_key(), lower, upper,
+        read_mode)
+    if raw:
+        return rows
+    return (model.from_dictionary(row, sensitive_fields=True) for row in rows)
+
+
+def _map_partition(model, storage, bounds, func, raw, read_mode):
+    from .storage import Storage
+
+    storage = storage.clone() \
+        if isinstance(storage, Storage) \
+        else Storage(**storage).clone()
+    try:
+        return func(_rows(storage, model, bounds, raw, read_mode))
+    finally:
+        storage._connection.close()
+
+
+def scan(model, partitions=8, workers=None, raw=False, batch_size=1000,
+         sample_size=None, read_mode=None):
+    storage = model.get_storage()
+    read_mode = model.get_read_mode(read_mode)
+    ranges = split_ranges(
+        storage, model.get_table_name(), model.get_primary_key(),
+        partitions, sample_size, read_mode)
+
+    batches = queue.Queue(maxsize=len(ranges) * 2)
+    stopped = threading.Event()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def read(index, bounds):
+        try:
+            local_storage = storage.clone()
+        except Exception as ex:
+            put((index, ex))
+            return put((index, _DONE))
+
+        try:
+            batch = []
+            for item in _rows(local_storage, model, bounds, raw, read_mode):
+                if stopped.is_set():
+                    return
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    put((index, batch))
+                    batch = []
+            if len(batch) > 0:
+                put((index, batch))
+        except Exception as ex:
+            put((index, ex))
+        finally:
+            local_storage._connection.close()
+            put((index, _DONE))
+
+    executor = ThreadPoolExecutor(max_workers=workers or len(ranges))
+    try:
+        for index, bounds in enumerate(ranges):
+            executor.submit(read, index, bounds)
+
+        running = len(ranges)
+        while running > 0:
+            index, batch = batches.get()
+            if batch is _DONE:
+                running -= 1
+            elif isinstance(batch, Exception):
+                raise batch
+            else:
+                yield index, batch
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False)
+
+
+def map_partitions(model, func, partitions=8, workers=None,
+                   executor='thread', raw=False, sample_size=None,
+                   read_mode=None):
+    storage = model.get_storage()
+    read_mode = model.get_read_mode(read_mode)
+    ranges = split_ranges(
+        storage, model.get_table_name(), model.get_primary_key(),
+        partitions, sample_size, read_mode)
+
+    with EXECUTORS[executor](max_workers=workers or len(ranges)) as pool:
+        futures = [
+            pool.submit(
+                _map_partition, model,
+                storage.options if executor == 'process' else storage,
+                bounds, func, raw, read_mode)
+            for bounds in ranges]
+        return [future.result() for future in futures]
@@ -0,0 +1,131 @@
+from .aggregates import result_changes, maintain_aggregates
+
+
+class Session:
+    def __init__(self, **write_options):
+        self._write_options = write_options
+        self._new = []
+        self._dirty = []
+        self._deleted = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    @staticmethod
+    def _append(objs, obj):
+        if not any(elem is obj for elem in objs):
+            objs.append(obj)
+
+    def add(self, *objs):
+        for obj in objs:
+            self._append(self._dirty if obj.id else self._new, obj)
+
+    def delete(self, *objs):
+        for obj in objs:
+            self._new = [elem for elem in self._new if elem is not obj]
+            self._dirty = [elem for elem in self._dirty if elem is not obj]
+            if obj.id:
+                self._append(self._deleted, obj)
+
+    def rollback(self):
+        self._new = []
+        self._dirty = []
+        self._deleted = []
+
+    @property
+    def new(self): return list(self._new)
+
+    @property
+    def dirty(self): return list(self._dirty)
+
+    @property
+    def deleted(self): return list(self._deleted)
+
+    def flush_order(self):
+        new_ids = {id(obj) for obj in self._new}
+        levels = {}
+
+        def level(obj, path):
+            key = id(obj)
+            if key in levels:
+                return levels[key]
+            if key in path:
+                raise ValueError(
+                    f'Circular relation between unsaved objects: {obj}')
+
+            parents = [
+                obj.fields[rel_field].related for rel_field
+                in obj.get_relation_fields()]
+            parents = [
+                p for p in parents
+                if p is not None and id(p) in new_ids]
+
+            levels[key] = max(
+                [level(p, path | {key}) + 1 for p in parents], default=0)
+            return levels[key]
+
+        batches = {}
+        for obj in self._new:
+            batch_key = (level(obj, frozenset()), obj.__class__)
+            batches.setdefault(batch_key, []).append(obj)
+
+        return [
+            batches[k] for k
+            in sorted(batches, key=lambda k: k[0])]
+
+    @staticmethod
+    def _group(objs):
+        groups = {}
+        for obj in objs:
+            groups.setdefault(obj.__class__, []).append(obj)
+        return groups
+
+    def commit(self):
+        for batch in self.flush_order():
+            model = batch[0].__class__
+            options = model.get_write_options(**self._write_options)
+            for obj in batch:
+                obj.stamp()
+                obj.generate_id(force=options.get('noreply', False))
+            ids = model.get_storage().insert_many(batch, **options)
+            for obj, obj_id in zip(batch, ids):
+                obj.id = obj_id
+                obj.reset_modified_fields()
+            if model.tracks_aggregates():
+                maintain_aggregates(
+                    model, [(None, obj.storage_dictionary) for obj in batch])
+
+        for model, objs in self._group(self._dirty).items():
+            objs = [obj for obj in objs if obj.get_modified_fields()]
+            options = model.get_write_options(**self._write_options)
+            tracked = not options.get('noreply') and any(
+                model.tracks_aggregates(obj.get_modified_fields())
+                for obj in objs)
+            if tracked:
+                options['return_changes'] = True
+
+            for obj in objs:
+                obj.updated = None
+            result = model.get_storage().update_many(objs, **options)
+            for obj in objs:
+                obj.reset_modified_fields()
+            if tracked:
+                maintain_aggregates(model, result_changes(result))
+
+        for model, objs in self._group(self._deleted).items():
+            ids = [obj.id for obj in objs]
+            if not model.tracks_aggregates():
+                model.get_storage().delete_many(model.get_table_name(), ids)
+                continue
+
+            result = model.get_storage().delete_many(
+                model.get_table_name(), ids, return_changes=True)
+            maintain_aggregates(model, result_changes(result))
+
+        self.rollback()
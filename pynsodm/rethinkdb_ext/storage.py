@@ -4,6 +4,16 @@ from rethinkdb import RethinkDB
 
 from pynsodm.rethinkdb_ext import BaseModel
 
+from .cache import DocumentCache
+from .instrumentation import Instrumentation
+from .loader import invalidate_loaders
+from .query import build_query, is_multi_index
+from .operators import compile_changes
+
+TABLE_CREATE_OPTIONS = (
+    'primary_key', 'shards', 'replicas', 'primary_replica_tag', 'durability')
+TABLE_RECONFIGURE_OPTIONS = ('shards', 'replicas', 'primary_replica_tag')
+
 
 class Storage:
     def __init__(self, **kwargs):
@@ -21,116 +31,634 @@ class Storage:
         self._db = kwargs.get(
             'db', os.environ.get('RETHINKDB_DATABASE', 'test'))
 
+        self._read_mode = kwargs.get(
+            'read_mode', os.environ.get('RETHINKDB_READ_MODE', None))
+
+        self._cache = kwargs.get('cache', None)
+        _cache_path = os.environ.get('RETHINKDB_CACHE_PATH', '')
+        if self._cache is None and len(_cache_path) > 0:
+            self._cache = DocumentCache(_cache_path)
+
         _models = kwargs.get('models', os.environ.get('RETHINKDB_MODELS', ''))
         self._models = [m for m in _models.split(',') if len(m) > 0]
 
+        _slow_query_ms = kwargs.get(
+            'slow_query_ms', os.environ.get('RETHINKDB_SLOW_QUERY_MS', None))
+        self._instrumentation = Instrumentation(
+            slow_query_threshold=float(_slow_query_ms) / 1000
+            if _slow_query_ms not in (None, '')
+            else None)
+
+    @property
+    def instrumentation(self): return self._instrumentation
+
+    @property
+    def stats(self): return self._instrumentation.stats
+
+    @property
+    def cache(self): return self._cache
+
+    def add_hook(self, pre=None, post=None):
+        self._instrumentation.add_hook(pre, post)
+
+    def remove_hook(self, pre=None, post=None):
+        self._instrumentation.remove_hook(pre, post)
+
+    def _table(self, table_name, read_mode=None):
+        read_mode = read_mode or self._read_mode
+        if read_mode:
+            return self._driver.table(table_name, read_mode=read_mode)
+        return self._driver.table(table_name)
+
+    def _run(self, term, table_name=None, operation=None, shape=None,
+             **run_options):
+        return self._instrumentation.run(
+            term, self._connection, table_name, operation, shape,
+            **run_options)
+
+    @staticmethod
+    def _write_options(options):
+        term_options = {
+            k: v for k, v in options.items()
+            if k in ('durability', 'return_changes') and v is not None}
+        run_options = {'noreply': True} if options.get('noreply') else {}
+        return term_options, run_options
+
+    @staticmethod
+    def _apply_changes(data_objs, result):
+        if not result or len(data_objs) == 0:
+            return
+        primary_key = data_objs[0].get_primary_key()
+        changes = {
+            change['new_val'][primary_key]: change['new_val'] for change
+            in result.get('changes', [])
+            if change.get('new_val')}
+        for data_obj in data_objs:
+            if data_obj.id in changes:
+                data_obj.load_dictionary(
+                    changes[data_obj.id], sensitive_fields=True)
+
+    def _connect(self):
+        return self._driver.connect(
+            host=self._host,
+            port=self._port,
+            db=self._db,
+            user=self._user,
+            password=self._password)
+
     def _init_db(self):
         if not self._connection:
-            self._connection = self._driver.connect(
-                host=self._host,
-                port=self._port,
-                db=self._db,
-                user=self._user,
-                password=self._password)
+            self._connection = self._connect()
         else:
             self._connection.reconnect()
 
-        db_list = self._driver.db_list().run(self._connection)
+        db_list = self._run(self._driver.db_list(), operation='db_list')
         if self._db not in db_list:
-            self._driver.db_create(self._db).run(self._connection)
+            self._run(self._driver.db_create(self._db), operation='db_create')
 
-    def _init_index(self, table_name, index):
-        index_list = self._driver.table(table_name).index_list().run(
-            self._connection)
+    def _init_index(self, table_name, index, multi=False):
+        index_list = self._run(
+            self._driver.table(table_name).index_list(),
+            table_name, 'index_list')
         if index not in index_list:
-            self._driver.table(table_name).index_create(index).run(
-                self._connection)
-        self._driver.table(table_name).index_wait(index).run(
-            self._connection)
+            options = {'multi': True} if multi else {}
+            self._run(
+                self._driver.table(table_name).index_create(index, **options),
+                table_name, 'index_create')
+        self._run(
+            self._driver.table(table_name).index_wait(index),
+            table_name, 'index_wait')
+
+    @staticmethod
+    def _table_config(options, keys):
+        return {
+            k: v for k, v in (options or {}).items()
+            if k in keys and v is not None}
 
-    def _init_table(self, table_name, indexes=[]):
-        table_list = self._driver.table_list().run(self._connection)
+    def _init_table(self, table_name, indexes=[], options=None):
+        table_list = self._run(
+            self._driver.table_list(), operation='table_list')
 
         if table_name not in table_list:
-            self._driver.table_create(table_name).run(self._connection)
+            self._run(
+                self._driver.table_create(
+                    table_name,
+                    **self._table_config(options, TABLE_CREATE_OPTIONS)),
+                table_name, 'table_create')
 
         for index in indexes:
-            self._init_index(table_name, index)
-
-    def connect(self):
-        self._init_db()
-
-        subclasses = BaseModel.__subclasses__()
-
-        for subclass in subclasses:
-            if len(self._models) > 0 and \
-                    subclass.get_model_name() not in self._models:
-                continue
+            self._init_index(table_name, index, is_multi_index(indexes, index))
 
-            table_name = subclass.get_table_name()
+    def create_tables(self, *models):
+        for model in models:
+            self._init_table(
+                model.get_table_name(),
+                model.get_index_fields(),
+                model.get_table_options())
 
-            self._init_table(table_name, subclass.get_index_fields())
+    def bind(self, *models):
+        self.create_tables(*models)
 
-            subclass.set_storage(self)
-            for relation_field in subclass.get_relation_fields():
-                relation_field_obj = getattr(subclass, relation_field)
+        for model in models:
+            model.set_storage(self)
+            for relation_field in model.get_relation_fields():
+                relation_field_obj = getattr(model, relation_field)
                 if relation_field_obj.backfield:
                     setattr(
                         relation_field_obj.relation_class,
                         relation_field_obj.backfield,
-                        relation_field_obj.resolver(subclass))
+                        relation_field_obj.resolver(model))
+                    relation_field_obj.relation_class.reset_compiled()
+
+    def connect(self, bind=True):
+        self._init_db()
+        if not bind:
+            return
+
+        subclasses = BaseModel.__subclasses__()
+
+        self.bind(*[
+            subclass for subclass in subclasses
+            if len(self._models) == 0 or
+            subclass.get_model_name() in self._models])
 
     def reconnect(self):
         self._connection = None
         self.connect()
 
-    def insert(self, data_obj):
-        obj_data = data_obj.dictionary
-        if 'id' in obj_data:
-            obj_data.pop('id')
+    @property
+    def options(self):
+        return {
+            'host': self._host,
+            'port': self._port,
+            'user': self._user,
+            'password': self._password,
+            'db': self._db,
+            'read_mode': self._read_mode,
+        }
+
+    def clone(self):
+        storage = Storage(**self.options, cache=self._cache)
+        storage._instrumentation = self._instrumentation
+        storage._connection = storage._connect()
+        return storage
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def reconfigure(self, *models, dry_run=False, rebalance=True):
+        result = {}
+
+        for model in models:
+            table_name = model.get_table_name()
+            config = self._table_config(
+                model.get_table_options(), TABLE_RECONFIGURE_OPTIONS)
+            if len(config) == 0:
+                continue
+
+            if 'shards' not in config or 'replicas' not in config:
+                shards = self._run(
+                    self._driver.table(table_name).config(),
+                    table_name, 'config')['shards']
+                config.setdefault('shards', len(shards))
+                config.setdefault(
+                    'replicas', len(shards[0]['replicas']) if shards else 1)
+            if 'primary_replica_tag' in config and \
+                    not isinstance(config['replicas'], dict):
+                config['replicas'] = {
+                    config['primary_replica_tag']: config['replicas']}
+
+            result[table_name] = self._run(
+                self._driver.table(table_name).reconfigure(
+                    dry_run=dry_run, **config),
+                table_name, 'reconfigure')
+
+            if rebalance and not dry_run:
+                self._run(
+                    self._driver.table(table_name).wait(),
+                    table_name, 'wait')
+                self._run(
+                    self._driver.table(table_name).rebalance(),
+                    table_name, 'rebalance')
+        return result
+
+    def cache_key(self, table_name):
+        return f'{self._host}:{self._port}/{self._db}/{table_name}'
+
+    def _cached(self, table_name, read_mode=None):
+        return self._cache is not None and \
+            self._cache.caches(table_name) and \
+            (read_mode or self._read_mode) != 'majority'
+
+    def _invalidate(self, table_name, ids=None):
+        invalidate_loaders(self, table_name, ids)
+        if self._cache is None or not self._cache.caches(table_name):
+            return
+        if ids is None:
+            self._cache.invalidate_table(self.cache_key(table_name))
+        else:
+            self._cache.invalidate(self.cache_key(table_name), ids)
+
+    def _document(self, data_obj, field_names, with_id=False):
+        fields = data_obj.fields
+
+        document = {}
+        if with_id and data_obj.id:
+            document[data_obj.get_primary_key()] = data_obj.id
+
+        for field_name in field_names:
+            field = fields[field_name]
+            if field_name == 'id' or field.is_aggregate:
+                continue
+            if field.is_encoded:
+                document[field_name] = field.storage_value
+            elif field.is_field:
+                document[field_name] = getattr(data_obj, field_name)
+        return document
+
+    def insert(self, data_obj, **options):
+        obj_data = data_obj.storage_dictionary
 
-        for rel_field in data_obj.get_relation_fields():
-            rel_object = obj_data.get(rel_field)
-            obj_data.pop(rel_field)
-            obj_data[rel_field] = rel_object.id
+        term_options, run_options = self._write_options(options)
+        table_name = data_obj.get_table_name()
+        result = self._run(
+            self._driver.table(table_name).insert(obj_data, **term_options),
+            table_name, 'insert', **run_options)
 
-        result = self._driver\
-            .table(data_obj.get_table_name())\
-            .insert(obj_data)\
-            .run(self._connection)
+        if data_obj.id:
+            self._apply_changes([data_obj], result)
+            return data_obj.id
 
-        if 'generated_keys' in result and \
+        if result and 'generated_keys' in result and \
                 len(result['generated_keys']) == 1:
             return result['generated_keys'][0]
 
-    def update(self, data_obj):
-        obj_data = data_obj.modified_dictionary
-        if 'id' in obj_data:
-            obj_data.pop('id')
+    def update(self, data_obj, **options):
+        obj_data = self._document(data_obj, data_obj.get_modified_fields())
 
-        for rel_field in data_obj.get_relation_fields():
-            rel_object = obj_data.get(rel_field)
-            obj_data.pop(rel_field)
-            obj_data[rel_field] = rel_object.id
+        term_options, run_options = self._write_options(options)
+        table_name = data_obj.get_table_name()
+        query = self._driver\
+            .table(table_name)\
+            .get(data_obj.id)\
+            .update(obj_data, **term_options)
+        result = self._run(
+            query, table_name, 'update', (table_name, 'update', ('id',)),
+            **run_options)
+        self._invalidate(table_name, [data_obj.id])
+        self._apply_changes([data_obj], result)
+        return result
 
-        self._driver\
-            .table(data_obj.get_table_name())\
-            .filter({'id': data_obj.id})\
-            .update(obj_data)\
-            .run(self._connection)
+    def update_by_id(self, table_name, obj_id, changes, **options):
+        term_options, run_options = self._write_options(options)
+        result = self._run(
+            self._driver
+            .table(table_name)
+            .get(obj_id)
+            .update(compile_changes(self._driver, changes), **term_options),
+            table_name, 'update_fields',
+            (table_name, 'update_fields', tuple(sorted(changes))),
+            **run_options)
+        self._invalidate(table_name, [obj_id])
+        return result
 
-    def get(self, table_name, obj_id):
-        return self._driver.table(table_name).get(obj_id).run(self._connection)
+    def update_where(self, table_name, fil, changes, indexes=(), **options):
+        selection, keys, index = self._select(
+            self._driver.table(table_name), fil, indexes, writable=True)
 
-    def find(self, table_name, fil):
-        return self._driver.table(table_name).filter(fil).run(self._connection)
+        term_options, run_options = self._write_options(options)
+        result = self._run(
+            selection.update(
+                compile_changes(self._driver, changes), **term_options),
+            table_name, 'update_where',
+            (table_name, 'update_where', keys, index, tuple(sorted(changes))),
+            **run_options)
+        self._invalidate(table_name)
+        return result
 
-    def delete(self, table_name, fil):
-        result = self._driver\
-            .table(table_name)\
-            .filter(fil)\
-            .delete()\
-            .run(self._connection)
-        if 'deleted' in result and result['deleted'] > 0:
+    def insert_many(self, data_objs, **options):
+        if len(data_objs) == 0:
+            return []
+
+        table_name = data_objs[0].get_table_name()
+        documents = [data_obj.storage_dictionary for data_obj in data_objs]
+
+        term_options, run_options = self._write_options(options)
+        result = self._run(
+            self._driver.table(table_name).insert(documents, **term_options),
+            table_name, 'insert_many', **run_options)
+        self._apply_changes(data_objs, result)
+
+        generated_keys = iter((result or {}).get('generated_keys', []))
+        return [
+            data_obj.id if data_obj.id else next(generated_keys, None)
+            for data_obj in data_objs]
+
+    def update_rows(self, table_name, primary_key, documents, **options):
+        if len(documents) == 0:
+            return None
+
+        term_options, run_options = self._write_options(options)
+        table = self._driver.table(table_name)
+        result = self._run(
+            self._driver.expr(documents).for_each(
+                lambda doc: table
+                .get(doc[primary_key])
+                .update(doc.without(primary_key), **term_options)),
+            table_name, 'update_many', (table_name, 'update_many', ('id',)),
+            **run_options)
+        self._invalidate(
+            table_name, [document.get(primary_key) for document in documents])
+        return result
+
+    def update_many(self, data_objs, **options):
+        if len(data_objs) == 0:
+            return
+
+        primary_key = data_objs[0].get_primary_key()
+        documents = [
+            self._document(
+                data_obj, data_obj.get_modified_fields(), with_id=True)
+            for data_obj in data_objs]
+
+        result = self.update_rows(
+            data_objs[0].get_table_name(), primary_key, documents, **options)
+        self._apply_changes(data_objs, result)
+        return result
+
+    @staticmethod
+    def _deleted(result, options):
+        if options.get('return_changes'):
+            return result
+        if result and 'deleted' in result and result['deleted'] > 0:
             return True
         return False
+
+    def delete_many(self, table_name, ids, **options):
+        if len(ids) == 0:
+            return False
+
+        term_options, run_options = self._write_options(options)
+        result = self._run(
+            self._driver.table(table_name).get_all(*ids).delete(
+                **term_options),
+            table_name, 'delete_many', (table_name, 'delete_many', ('id',)),
+            **run_options)
+        self._invalidate(table_name, ids)
+        return self._deleted(result, options)
+
+    def update_aggregates(self, table_name, primary_key, aggregates,
+                          children, increments=(), recompute=(), **options):
+        child_table, relation_field, indexed = children
+        term_options, run_options = self._write_options(options)
+        table = self._driver.table(table_name)
+
+        def child_rows(parent_id):
+            rows = self._driver.table(child_table)
+            return rows.get_all(parent_id, index=relation_field) \
+                if indexed \
+                else rows.filter({relation_field: parent_id})
+
+        if len(increments) > 0:
+            self._run(
+                self._driver.expr(list(increments)).for_each(
+                    lambda change: table.get(change['id']).update(
+                        lambda row: {
+                            name: aggregate.increment(
+                                self._driver, row, name, change)
+                            for name, aggregate in aggregates.items()},
+                        **term_options)),
+                table_name, 'update_aggregates',
+                (table_name, 'update_aggregates', ('id',)),
+                **run_options)
+
+        if len(recompute) > 0:
+            self._run(
+                table.get_all(*recompute).update(
+                    lambda row: {
+                        name: aggregate.recompute(
+                            self._driver, child_rows(row[primary_key]))
+                        for name, aggregate in aggregates.items()},
+                    non_atomic=True, **term_options),
+                table_name, 'recompute_aggregates',
+                (table_name, 'recompute_aggregates', ('id',)),
+                **run_options)
+
+        self._invalidate(
+            table_name,
+            [change['id'] for change in increments] + list(recompute))
+
+    def scan_ids(self, table_name, primary_key, batch_size=1000,
+                 read_mode=None):
+        last = self._driver.minval
+        while True:
+            ids = self._run(
+                self._table(table_name, read_mode)
+                .between(last, self._driver.maxval, left_bound='open')
+                .order_by(index=primary_key)
+                .limit(batch_size)[primary_key],
+                table_name, 'scan_ids', (table_name, 'scan_ids', ('id',)))
+            if not ids:
+                return
+            yield ids
+            if len(ids) < batch_size:
+                return
+            last = ids[-1]
+
+    def page(self, table_name, primary_key, after=None, limit=1000, fil=None,
+             keys_only=False, read_mode=None):
+        selection = self._table(table_name, read_mode)\
+            .between(
+                self._driver.minval if after is None else after,
+                self._driver.maxval,
+                left_bound='open')\
+            .order_by(index=primary_key)
+
+        keys = ()
+        if fil:
+            query = build_query(fil) if not isinstance(fil, dict) \
+                else build_query(**fil)
+            selection = selection.filter(
+                lambda row: query.compile(self._driver, row))
+            keys = query.keys()
+
+        selection = selection.limit(limit)
+        if keys_only:
+            selection = selection[primary_key]
+        return self._run(
+            selection, table_name, 'page',
+            (table_name, 'page', keys, primary_key))
+
+    def _fetch(self, table_name, ids, read_mode):
+        if len(ids) == 1:
+            row = self._run(
+                self._table(table_name, read_mode).get(ids[0]),
+                table_name, 'get', (table_name, 'get', ('id',)))
+            return [row] if row else []
+        return self._run(
+            self._table(table_name, read_mode).get_all(*ids),
+            table_name, 'get_many', (table_name, 'get_many', ('id',)))
+
+    def _fetch_cached(self, table_name, ids, primary_key, read_mode):
+        hits, stamps = self._cache.lookup(self.cache_key(table_name), ids)
+        if len(stamps) > 0:
+            rows = self._fetch(table_name, list(stamps), read_mode)
+            fetched = {row[primary_key]: row for row in rows}
+            self._cache.fill(self.cache_key(table_name), fetched, stamps)
+            hits.update(fetched)
+        return [hits[i] for i in ids if i in hits]
+
+    def get(self, table_name, obj_id, read_mode=None, primary_key='id'):
+        if self._cached(table_name, read_mode):
+            rows = self._fetch_cached(
+                table_name, [obj_id], primary_key, read_mode)
+            return rows[0] if rows else None
+        return self._run(
+            self._table(table_name, read_mode).get(obj_id),
+            table_name, 'get', (table_name, 'get', ('id',)))
+
+    def get_many(self, table_name, ids, read_mode=None, primary_key='id'):
+        if len(ids) == 0:
+            return []
+        if self._cached(table_name, read_mode):
+            return self._fetch_cached(
+                table_name, list(ids), primary_key, read_mode)
+        return self._run(
+            self._table(table_name, read_mode).get_all(*ids),
+            table_name, 'get_many', (table_name, 'get_many', ('id',)))
+
+    def changes(self, table_name):
+        return self._instrumentation.iterate(
+            self._driver.table(table_name).changes(), self._connection,
+            table_name, 'changes', (table_name, 'changes', ()))
+
+    def table_size(self, table_name):
+        info = self._run(
+            self._driver.table(table_name).info(),
+            table_name, 'table_size', (table_name, 'table_size', ()))
+        return sum((info or {}).get('doc_count_estimates', []))
+
+    def sample_keys(self, table_name, primary_key, count, read_mode=None):
+        return self._run(
+            self._table(table_name, read_mode).sample(count)[primary_key],
+            table_name, 'sample_keys', (table_name, 'sample_keys', ()))
+
+    def iterate_range(self, table_name, primary_key, lower=None, upper=None,
+                      read_mode=None):
+        selection = self._table(table_name, read_mode).between(
+            self._driver.minval if lower is None else lower,
+            self._driver.maxval if upper is None else upper,
+            index=primary_key)
+        return self._instrumentation.iterate(
+            selection, self._connection, table_name, 'scan',
+            (table_name, 'scan', ('id',)))
+
+    def _select(self, table, fil, indexes=(), writable=False):
+        query = build_query(fil) if not isinstance(fil, dict) \
+            else build_query(**fil)
+        return (
+            query.build(self._driver, table, indexes, writable),
+            query.keys(),
+            query.index_for(indexes))
+
+    def iterate(self, table_name, fil, indexes=(), read_mode=None,
+                fields=None):
+        selection, keys, index = self._select(
+            self._table(table_name, read_mode), fil, indexes)
+        if fields:
+            selection = selection.pluck(*fields)
+        return self._instrumentation.iterate(
+            selection, self._connection, table_name, 'iterate',
+            (table_name, 'iterate', keys, index, tuple(fields or ())))
+
+    def insert_rows(self, table_name, rows, **options):
+        term_options, run_options = self._write_options(options)
+        if options.get('conflict'):
+            term_options['conflict'] = options['conflict']
+
+        result = self._run(
+            self._driver.table(table_name).insert(rows, **term_options),
+            table_name, 'insert_rows', **run_options)
+        if options.get('conflict'):
+            self._invalidate(table_name)
+        return result
+
+    def find(self, table_name, fil, indexes=(), read_mode=None, fields=None):
+        selection, keys, index = self._select(
+            self._table(table_name, read_mode), fil, indexes)
+        if fields:
+            selection = selection.pluck(*fields)
+        return self._run(
+            selection, table_name, 'find',
+            (table_name, 'find', keys, index, tuple(fields or ())))
+
+    def _related(self, table_name, read_mode, row, relation_field):
+        relation_id = row[relation_field].default(None)
+        return self._driver.branch(
+            relation_id.eq(None), None,
+            self._table(table_name, read_mode).get(relation_id))
+
+    def find_related(self, table_name, fil, indexes, relations, related=(),
+                     read_mode=None):
+        r = self._driver
+        query = build_query(fil) if not isinstance(fil, dict) \
+            else build_query(**fil)
+        keys = list(query.keys())
+        index = query.index_for(indexes)
+        related = dict(related)
+
+        selection, joins = None, []
+        for relation in relations:
+            relation_field, related_table, related_key, related_query, \
+                related_indexes = relation
+            keys.append(f'{relation_field}__in')
+
+            if selection is None and index is None and \
+                    relation_field in indexes and \
+                    related_query.index_for(related_indexes) is not None:
+                related_ids = related_query.build(
+                    r, self._table(related_table, read_mode),
+                    related_indexes)[related_key].coerce_to('array')
+                selection = self._table(table_name, read_mode).get_all(
+                    r.args(related_ids), index=relation_field)
+                index = relation_field
+            else:
+                joins.append(relation)
+
+        selection = query.build(r, selection, ()) \
+            if selection is not None \
+            else query.build(r, self._table(table_name, read_mode), indexes)
+
+        for relation_field, related_table, _, related_query, _ in joins:
+            selection = selection\
+                .eq_join(
+                    relation_field, self._table(related_table, read_mode))\
+                .filter(lambda pair: related_query.compile(r, pair['right']))
+            if relation_field in related:
+                related.pop(relation_field)
+                selection = selection.map(
+                    lambda pair: pair['left'].merge(
+                        {'__related': {relation_field: pair['right']}}))
+            else:
+                selection = selection.map(lambda pair: pair['left'])
+
+        for relation_field, related_table in related.items():
+            selection = selection.merge(
+                lambda row: {'__related': {relation_field: self._related(
+                    related_table, read_mode, row, relation_field)}})
+
+        return self._run(
+            selection, table_name, 'find',
+            (table_name, 'find', tuple(sorted(keys)), index))
+
+    def delete(self, table_name, fil, indexes=(), **options):
+        selection, keys, index = self._select(
+            self._driver.table(table_name), fil, indexes, writable=True)
+        term_options, run_options = self._write_options(options)
+        result = self._run(
+            selection.delete(**term_options), table_name, 'delete',
+            (table_name, 'delete', keys, index), **run_options)
+        self._invalidate(table_name)
+        return self._deleted(result, options)
@@ -0,0 +1,109 @@
+import json
+import threading
+
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+def _converters(model, method):
+    return {
+        k: getattr(v, method) for k, v
+        in model.get_fields_values().items()}
+
+
+def _convert(row, converters):
+    return {
+        k: converters[k](v) if k in converters else v
+        for k, v in row.items()}
+
+
+def _read_batches(fp, batch_size):
+    batch = []
+    for line in fp:
+        line = line.strip()
+        if len(line) == 0:
+            continue
+        batch.append(json.loads(line))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if len(batch) > 0:
+        yield batch
+
+
+def export_ndjson(model, fp, *args, read_mode=None, **fil):
+    serializers = _converters(model, 'serialize')
+    rows = model.get_storage().iterate(
+        model.get_table_name(),
+        model.get_query(*args, **fil),
+        model.get_query_indexes(),
+        model.get_read_mode(read_mode))
+
+    count = 0
+    for row in rows:
+        fp.write(json.dumps(
+            _convert(row, serializers), default=str, ensure_ascii=False))
+        fp.write('\n')
+        count += 1
+    return count
+
+
+def import_ndjson(model, fp, batch_size=1000, concurrency=4, progress=None,
+                  validate=False, **options):
+    deserializers = _converters(model, 'deserialize')
+    table_name = model.get_table_name()
+    storage = model.get_storage()
+    options = model.get_write_options(**options)
+
+    local = threading.local()
+    storages = []
+    lock = threading.Lock()
+
+    totals = {'rows': 0, 'inserted': 0, 'errors': 0, 'first_error': None}
+
+    def insert(batch):
+        if not hasattr(local, 'storage'):
+            local.storage = storage.clone()
+            with lock:
+                storages.append(local.storage)
+
+        rows = [_convert(row, deserializers) for row in batch]
+        invalid = model.validate_many(rows) if validate else {}
+        if invalid:
+            rows = [row for i, row in enumerate(rows) if i not in invalid]
+
+        result = local.storage.insert_rows(table_name, rows, **options) \
+            if len(rows) > 0 \
+            else None
+        return len(batch), len(invalid), result
+
+    def collect(future):
+        count, invalid, result = future.result()
+        totals['rows'] += count
+        totals['errors'] += invalid
+        if result:
+            totals['inserted'] += result.get('inserted', 0)
+            totals['errors'] += result.get('errors', 0)
+            if result.get('first_error') and not totals['first_error']:
+                totals['first_error'] = result['first_error']
+        elif options.get('noreply'):
+            totals['inserted'] += count - invalid
+        if progress:
+            progress(dict(totals))
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = set()
+            for batch in _read_batches(fp, batch_size):
+                if len(pending) >= concurrency * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future)
+                pending.add(executor.submit(insert, batch))
+
+            for future in wait(pending).done:
+                collect(future)
+    finally:
+        for elem in storages:
+            elem._connection.close()
+
+    return totals
@@ -0,0 +1,246 @@
+import atexit
+import logging
+import threading
+import time
+
+from contextlib import ExitStack
+
+from .aggregates import result_changes, maintain_aggregates
+from .routing import use_storage
+
+write_behind_logger = logging.getLogger('pynsodm.write_behind')
+
+
+def log_error(error, writes):
+    write_behind_logger.error(
+        'Write-behind batch of %s writes to %s failed: %s',
+        len(writes), writes[0].model.get_table_name(), error)
+
+
+class PendingWrite:
+    def __init__(self, model, storage, obj_id, is_insert, document, options):
+        self.model = model
+        self.storage = storage
+        self.id = obj_id
+        self.is_insert = is_insert
+        self.document = document
+        self.options = options
+        self.enqueued = time.monotonic()
+        self.saves = 1
+
+    @property
+    def key(self):
+        return (self.model.get_table_name(), self.id)
+
+    @property
+    def batch_key(self):
+        return (
+            id(self.storage), self.model, self.is_insert,
+            tuple(sorted(self.options.items())))
+
+    def merge(self, document):
+        self.document.update(document)
+        self.saves += 1
+
+
+class WriteBehind:
+    def __init__(self, max_size=10000, batch_size=500, max_staleness=1.0,
+                 on_error=log_error):
+        self._max_size = max_size
+        self._batch_size = batch_size
+        self._max_staleness = max_staleness
+        self._on_error = on_error
+
+        self._pending = {}
+        self._in_flight = 0
+        self._flushing = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._worker = None
+        self._storages = {}
+
+        self._stats = {'saves': 0, 'coalesced': 0, 'written': 0, 'errors': 0}
+
+    @property
+    def pending(self): return len(self._pending)
+
+    @property
+    def stats(self): return dict(self._stats)
+
+    def _start(self):
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._run, name='pynsodm-write-behind', daemon=True)
+            self._worker.start()
+            atexit.register(self.close)
+
+    def add(self, obj, **options):
+        model = obj.__class__
+        options = model.get_write_options(**options)
+        options.pop('return_changes', None)
+
+        is_insert = not obj.id
+        if is_insert:
+            obj.stamp()
+            obj.generate_id(force=True)
+        else:
+            obj.updated = None
+
+        document = obj.storage_dictionary
+        if not is_insert:
+            modified = set(obj.get_modified_fields())
+            document = {
+                k: v for k, v in document.items()
+                if k in modified or k == model.get_primary_key()}
+
+        write = PendingWrite(
+            model, model.get_storage(), obj.id, is_insert, document, options)
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('Write-behind queue is closed')
+            self._start()
+
+            self._stats['saves'] += 1
+            pending = self._pending.get(write.key)
+            if pending is not None and pending.batch_key[:2] == \
+                    write.batch_key[:2]:
+                pending.merge(document)
+                self._stats['coalesced'] += 1
+            else:
+                while len(self._pending) >= self._max_size:
+                    self._condition.notify_all()
+                    self._condition.wait()
+                self._pending[write.key] = write
+                if len(self._pending) >= self._batch_size:
+                    self._condition.notify_all()
+
+        obj.reset_modified_fields()
+        return obj.id
+
+    def _due(self):
+        if self._flushing or self._closed:
+            return True
+        if len(self._pending) >= self._batch_size:
+            return True
+        oldest = next(iter(self._pending.values()))
+        return time.monotonic() - oldest.enqueued >= self._max_staleness
+
+    def _take(self):
+        writes = []
+        for key in list(self._pending)[:self._batch_size]:
+            writes.append(self._pending.pop(key))
+        self._in_flight += len(writes)
+        self._condition.notify_all()
+        return writes
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while len(self._pending) == 0 or not self._due():
+                    if len(self._pending) == 0:
+                        if self._closed:
+                            return
+                        self._condition.wait()
+                    else:
+                        oldest = next(iter(self._pending.values()))
+                        self._condition.wait(max(
+                            0, oldest.enqueued + self._max_staleness -
+                            time.monotonic()))
+                writes = self._take()
+
+            try:
+                self._write(writes)
+            finally:
+                with self._condition:
+                    self._in_flight -= len(writes)
+                    self._condition.notify_all()
+
+    def _write(self, writes):
+        batches = {}
+        for write in writes:
+            batches.setdefault(write.batch_key, []).append(write)
+
+        for batch in batches.values():
+            try:
+                self._write_batch(batch)
+                self._stats['written'] += len(batch)
+            except Exception as ex:
+                self._stats['errors'] += len(batch)
+                if self._on_error:
+                    self._on_error(ex, batch)
+
+    def _storage(self, storage):
+        if id(storage) not in self._storages:
+            self._storages[id(storage)] = (storage, storage.clone())
+        return self._storages[id(storage)][1]
+
+    def _write_batch(self, batch):
+        first = batch[0]
+        model, options = first.model, first.options
+        storage = self._storage(first.storage)
+        table_name = model.get_table_name()
+        documents = [write.document for write in batch]
+
+        if first.is_insert:
+            storage.insert_rows(
+                table_name, documents, conflict='update', **options)
+            if model.tracks_aggregates():
+                self._maintain_aggregates(
+                    model, [(None, document) for document in documents])
+            return
+
+        tracked = not options.get('noreply') and any(
+            model.tracks_aggregates(document) for document in documents)
+        result = storage.update_rows(
+            table_name, model.get_primary_key(), documents,
+            **({**options, 'return_changes': True} if tracked else options))
+        if tracked:
+            self._maintain_aggregates(model, result_changes(result))
+
+    def _maintain_aggregates(self, model, changes):
+        with ExitStack() as stack:
+            for parent_class, _ in model.get_aggregates().values():
+                stack.enter_context(use_storage(
+                    self._storage(parent_class.get_storage()),
+                    parent_class))
+            maintain_aggregates(model, changes)
+
+    def flush(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            if self._worker is None:
+                return True
+            self._flushing = True
+            self._condition.notify_all()
+            try:
+                while len(self._pending) > 0 or self._in_flight > 0:
+                    remaining = None \
+                        if deadline is None \
+                        else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+            finally:
+                self._flushing = False
+        return True
+
+    def close(self, timeout=None):
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            atexit.unregister(self.close)
+        if self._worker is None or not self._worker.is_alive():
+            for _, storage in self._storages.values():
+                storage.close()
+            self._storages = {}
+        return flushed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,7 +1,14 @@
 from .strings import valid_email, valid_uuid
+from .constraints import valid_type, valid_length, valid_regex, \
+    valid_choices, compile_validators
 
 
 __all__ = (
     'valid_email',
     'valid_uuid',
+    'valid_type',
+    'valid_length',
+    'valid_regex',
+    'valid_choices',
+    'compile_validators',
 )
@@ -0,0 +1,53 @@
+import re
+
+
+def valid_type(*types):
+    def check(data):
+        return isinstance(data, types)
+    return check
+
+
+def valid_length(min_length=None, max_length=None):
+    def check(data):
+        try:
+            length = len(data)
+        except TypeError:
+            return False
+        if min_length is not None and length < min_length:
+            return False
+        if max_length is not None and length > max_length:
+            return False
+        return True
+    return check
+
+
+def valid_regex(pattern):
+    compiled = re.compile(pattern) if isinstance(pattern, str) else pattern
+
+    def check(data):
+        return isinstance(data, str) and compiled.fullmatch(data) is not None
+    return check
+
+
+def valid_choices(items):
+    choices = frozenset(items)
+
+    def check(data):
+        return data in choices
+    return check
+
+
+def compile_validators(*checks):
+    checks = tuple(check for check in checks if check)
+
+    if len(checks) == 0:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+
+    def check(data):
+        for elem in checks:
+            if not elem(data):
+                return False
+        return True
+    return check
@@ -1,9 +1,29 @@
+import re
+
 import validators as valid
 
+from uuid import UUID
+
+
+UUID_REGEX = re.compile(
+    r'^[0-9a-fA-F]{8}-([0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}$')
+
 
 def valid_email(data=''):
     return valid.email(data)
 
 
 def valid_uuid(data=''):
-    return valid.uuid(data)
+    if not data:
+        return False
+    if isinstance(data, UUID):
+        return True
+    if not isinstance(data, str):
+        return False
+    if UUID_REGEX.match(data):
+        return True
+    try:
+        UUID(data)
+        return True
+    except ValueError:
+        return False
@@ -0,0 +1,103 @@
+import copy
+import itertools
+import threading
+
+from rethinkdb import ast, query
+
+from pynsodm.rethinkdb_ext import Storage
+
+READS = ('get', 'get_many', 'scan', 'sample_keys', 'iterate', 'table_size')
+
+
+def values(term):
+    if isinstance(term, ast.Datum):
+        return term.data
+    if isinstance(term, ast.MakeArray):
+        return [values(arg) for arg in term._args]
+    if isinstance(term, ast.MakeObj):
+        return {k: values(v) for k, v in term.optargs.items()}
+    if isinstance(term, query.RqlConstant):
+        return None
+    return str(term)
+
+
+class FakeConnection:
+    def __init__(self, storage):
+        self._storage = storage
+
+    def _start(self, term, **options):
+        return self._storage.respond(term, options)
+
+    def reconnect(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class RecordingStorage(Storage):
+    def __init__(self, results=None, responses=None, rows=None, **kwargs):
+        Storage.__init__(self, connection=FakeConnection(self), **kwargs)
+        self.queries = []
+        self.clones = []
+        self.rows = rows or {}
+        self._results = list(results or [])
+        self._responses = responses or {}
+        self._lock = threading.Lock()
+        self._current = threading.local()
+        self._keys = itertools.count(1)
+        self.add_hook(pre=self._started)
+
+    def _started(self, event):
+        self._current.event = event
+
+    def clone(self):
+        storage = copy.copy(self)
+        self.clones.append(storage)
+        return storage
+
+    def respond(self, term, options):
+        event = self._current.event
+        with self._lock:
+            self.queries.append((event.operation, str(term), options))
+
+        if event.operation in self._responses:
+            response = self._responses[event.operation]
+            return response(term) if callable(response) else response
+        if event.table in self.rows and event.operation in READS:
+            return self._from_rows(self.rows[event.table], term)
+        with self._lock:
+            if self._results:
+                return self._results.pop(0)
+        if isinstance(term, ast.Insert):
+            return self._inserted(values(term._args[1]))
+        return None
+
+    def _inserted(self, documents):
+        if isinstance(documents, dict):
+            documents = [documents]
+        return {
+            'inserted': len(documents),
+            'errors': 0,
+            'generated_keys': [
+                f'id{next(self._keys)}' for document in documents
+                if 'id' not in document]}
+
+    @staticmethod
+    def _from_rows(rows, term):
+        args = [values(arg) for arg in term._args[1:]]
+        if isinstance(term, ast.Get):
+            return next((row for row in rows if row['id'] == args[0]), None)
+        if isinstance(term, ast.GetAll):
+            return [row for row in rows if row['id'] in args]
+        if isinstance(term, ast.Between):
+            lower, upper = args
+            return [
+                row for row in rows
+                if (lower is None or row['id'] >= lower) and
+                (upper is None or row['id'] < upper)]
+        if isinstance(term, ast.Bracket):
+            return [row['id'] for row in rows[::7]]
+        if isinstance(term, ast.Info):
+            return {'doc_count_estimates': [len(rows)]}
+        return list(rows)
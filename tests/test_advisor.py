@@ -0,0 +1,100 @@
+import pytest
+
+from pynsodm.exceptions import FullScanException
+from pynsodm.fields import StringField
+from pynsodm.rethinkdb_ext import BaseModel, IndexAdvisor
+
+from .conftest import RecordingStorage
+
+
+def test_indexed_queries_are_not_reported():
+    class User(BaseModel):
+        name = StringField(is_index=True)
+        email = StringField()
+
+    storage = RecordingStorage(responses={'find': []})
+    User.set_storage(storage)
+
+    with IndexAdvisor(storage) as advisor:
+        User.find(name='test')
+        User.find()
+
+    assert advisor.report() == []
+
+
+def test_full_scans_are_ranked():
+    class User(BaseModel):
+        table_name = 'users'
+
+        name = StringField(is_index=True)
+        email = StringField()
+        country = StringField()
+
+    class Post(BaseModel):
+        table_name = 'posts'
+
+        title = StringField()
+
+    storage = RecordingStorage(responses={'find': []}, rows={
+        'users': [{'id': str(i)} for i in range(1000)],
+        'posts': [{'id': str(i)} for i in range(10)]})
+    User.set_storage(storage)
+    Post.set_storage(storage)
+
+    with IndexAdvisor(storage) as advisor:
+        for _ in range(3):
+            Post.find(title='test')
+        User.find(country='DE', email__gte='a')
+        User.find(country='DE', email__gte='b')
+        User.find(country='DE', email__gte='c')
+        User.find(email='test')
+        User.find(email='other')
+        User.find(email__contains='test')
+
+    report = advisor.report()
+
+    assert [r['keys'] for r in report] == [
+        ('country__exact', 'email__gte'),
+        ('email__exact',),
+        ('email__contains',),
+        ('title__exact',),
+    ]
+    assert report[0]['index'] == ['country', 'email']
+    assert report[0]['scanned'] == 3000
+    assert report[1]['index'] == ['email']
+    assert report[2]['index'] is None
+    assert report[2]['unindexable'] == ['email']
+    assert report[3]['count'] == 3
+    assert report[3]['scanned'] == 30
+
+
+def test_full_scan_warning_is_logged_once(caplog):
+    class User(BaseModel):
+        email = StringField()
+
+    storage = RecordingStorage(responses={'find': []})
+    User.set_storage(storage)
+
+    with IndexAdvisor(storage):
+        User.find(email='test')
+        User.find(email='other')
+
+    assert caplog.text.count('Full table scan') == 1
+
+
+def test_strict_mode_rejects_full_scans():
+    class User(BaseModel):
+        table_name = 'users'
+
+        name = StringField(is_index=True)
+        email = StringField()
+
+    storage = RecordingStorage(responses={'find': []})
+    User.set_storage(storage)
+
+    with IndexAdvisor(storage, strict=True, ignore=['posts']):
+        User.find(name='test')
+        with pytest.raises(FullScanException):
+            User.find(email='test')
+
+    User.find(email='test')
@@ -0,0 +1,236 @@
+from datetime import datetime
+
+import pytest
+import pytz
+
+from pynsodm.rethinkdb_ext import BaseModel
+from pynsodm.rethinkdb_ext.aggregates import _plan, find_model
+from pynsodm.fields import StringField, OTMRelation, CountField, LatestField
+
+from .conftest import RecordingStorage
+
+
+def test_aggregates_discovered_on_child():
+    class AggParent(BaseModel):
+        table_name = 'agg_parents'
+
+        name = StringField()
+        children_count = CountField('AggChild.parent')
+        last_child = LatestField('AggChild.parent')
+
+    class AggChild(BaseModel):
+        table_name = 'agg_children'
+
+        name = StringField()
+        parent = OTMRelation(AggParent, is_index=True)
+
+    relation_class, aggregates = AggChild.get_aggregates()['parent']
+
+    assert relation_class is AggParent
+    assert sorted(aggregates) == ['children_count', 'last_child']
+    assert AggChild.tracks_aggregates(['parent'])
+    assert AggChild.tracks_aggregates(['created'])
+    assert not AggChild.tracks_aggregates(['name'])
+    assert AggParent.get_aggregates() == {}
+
+
+def test_aggregates_not_written_by_parent():
+    class AggParent(BaseModel):
+        table_name = 'agg_parents'
+
+        name = StringField()
+        children_count = CountField('AggChild.parent')
+        last_child = LatestField('AggChild.parent')
+
+    parent = AggParent.from_dictionary(
+        {'id': 'p1', 'name': 'test', 'children_count': 3},
+        sensitive_fields=True)
+
+    assert parent.children_count == 3
+    assert 'children_count' not in parent.storage_dictionary
+    assert 'last_child' not in parent.storage_dictionary
+
+
+def test_plan_reassign_and_delete():
+    class AggParent(BaseModel):
+        table_name = 'agg_parents'
+
+        name = StringField()
+        children_count = CountField('AggChild.parent')
+        last_child = LatestField('AggChild.parent')
+
+    class AggChild(BaseModel):
+        table_name = 'agg_children'
+
+        name = StringField()
+        parent = OTMRelation(AggParent, is_index=True)
+
+    first = datetime(2024, 1, 1, tzinfo=pytz.utc)
+    second = datetime(2024, 1, 2, tzinfo=pytz.utc)
+    _, aggregates = AggChild.get_aggregates()['parent']
+
+    increments, recompute = _plan(aggregates, 'parent', [
+        (None, {'id': 'c1', 'parent': 'p1', 'created': first}),
+        (None, {'id': 'c2', 'parent': 'p1', 'created': second}),
+        ({'id': 'c3', 'parent': 'p2', 'created': first},
+            {'id': 'c3', 'parent': 'p1', 'created': first}),
+        ({'id': 'c4', 'parent': 'p3', 'created': first}, None),
+    ])
+
+    increments = {change['id']: change for change in increments}
+    assert increments['p1']['delta'] == 3
+    assert increments['p1']['values']['last_child'] == second
+    assert increments['p2']['delta'] == -1
+    assert increments['p3']['delta'] == -1
+    assert sorted(recompute) == ['p2', 'p3']
+
+
+def test_insert_child_updates_parent():
+    class AggParent(BaseModel):
+        table_name = 'agg_parents'
+
+        name = StringField()
+        children_count = CountField('AggChild.parent')
+        last_child = LatestField('AggChild.parent')
+
+    class AggChild(BaseModel):
+        table_name = 'agg_children'
+
+        name = StringField()
+        parent = OTMRelation(AggParent, is_index=True)
+
+    storage = RecordingStorage(responses={
+        'insert': {'inserted': 1, 'generated_keys': ['c1']}})
+    AggParent.set_storage(storage)
+    AggChild.set_storage(storage)
+
+    child = AggChild(name='child', parent='p1')
+    child.save()
+
+    operations = [query[0] for query in storage.queries]
+    assert operations == ['insert', 'update_aggregates']
+
+    query = storage.queries[1][1]
+    assert "r.table('agg_parents').get(" in query
+    assert "'delta': 1" in query
+    assert "['children_count'].default(0)" in query
+
+
+def test_delete_children_recomputes_parent():
+    class AggParent(BaseModel):
+        table_name = 'agg_parents'
+
+        name = StringField()
+        children_count = CountField('AggChild.parent')
+        last_child = LatestField('AggChild.parent')
+
+    class AggChild(BaseModel):
+        table_name = 'agg_children'
+
+        name = StringField()
+        parent = OTMRelation(AggParent, is_index=True)
+
+    storage = RecordingStorage(responses={'delete': {
+        'deleted': 1,
+        'changes': [{'old_val': {'id': 'c1', 'parent': 'p1'}}]}})
+    AggParent.set_storage(storage)
+    AggChild.set_storage(storage)
+
+    assert AggChild.delete(name='child')
+
+    operations = [query[0] for query in storage.queries]
+    assert operations == [
+        'delete', 'update_aggregates', 'recompute_aggregates']
+    assert 'return_changes=True' in storage.queries[0][1]
+    assert "index='parent'" in storage.queries[2][1]
+    assert 'non_atomic=True' in storage.queries[2][1]
+
+
+def test_repair_aggregates():
+    class AggParent(BaseModel):
+        table_name = 'agg_parents'
+
+        name = StringField()
+        children_count = CountField('AggChild.parent')
+        last_child = LatestField('AggChild.parent')
+
+    class AggChild(BaseModel):
+        table_name = 'agg_children'
+
+        name = StringField()
+        parent = OTMRelation(AggParent, is_index=True)
+
+    storage = RecordingStorage(results=[['p1', 'p2'], None])
+    AggParent.set_storage(storage)
+    AggChild.set_storage(storage)
+
+    assert AggParent.repair_aggregates(batch_size=2) == 2
+
+    operations = [query[0] for query in storage.queries]
+    assert operations == [
+        'scan_ids', 'recompute_aggregates', 'scan_ids']
+    assert ".get_all('p1', 'p2')" in storage.queries[1][1]
+
+
+def test_find_model_by_qualified_name():
+    class Team(BaseModel):
+        table_name = 'teams'
+
+    class League(BaseModel):
+        table_name = 'leagues'
+
+    class Player(BaseModel):
+        table_name = 'players'
+
+        team = OTMRelation(Team)
+
+    first = Player
+
+    class Player(BaseModel):
+        table_name = 'league_players'
+
+        team = OTMRelation(League)
+
+    assert find_model('Player', BaseModel, Team, 'team') is first
+    assert find_model(f'{__name__}.Player', BaseModel, League, 'team') \
+        is Player
+    with pytest.raises(ValueError):
+        find_model(f'{__name__}.Player', BaseModel)
+
+    class Squad(BaseModel):
+        table_name = 'squads'
+
+        players_count = CountField(f'{__name__}.Player.team')
+
+    assert Squad.players_count.relation_model == f'{__name__}.Player'
+    assert Squad.players_count.relation_field == 'team'
+
+
+def test_failed_aggregate_update_is_logged(caplog):
+    class AggParent(BaseModel):
+        table_name = 'agg_parents'
+
+        name = StringField()
+        children_count = CountField('AggChild.parent')
+        last_child = LatestField('AggChild.parent')
+
+    class AggChild(BaseModel):
+        table_name = 'agg_children'
+
+        name = StringField()
+        parent = OTMRelation(AggParent, is_index=True)
+
+    def fail(term):
+        raise RuntimeError('connection lost')
+
+    storage = RecordingStorage(responses={
+        'insert': {'inserted': 1, 'generated_keys': ['c1']},
+        'update_aggregates': fail})
+    AggParent.set_storage(storage)
+    AggChild.set_storage(storage)
+
+    with pytest.raises(RuntimeError):
+        AggChild(name='child', parent='p1').save()
+
+    assert "agg_parents ['p1']" in caplog.text
+    assert 'repair_aggregates()' in caplog.text
@@ -1,11 +1,13 @@
 import pytest
 
 from pynsodm.rethinkdb_ext import BaseModel
-from pynsodm.fields import StringField
+from pynsodm.fields import StringField, OTORelation
 from pynsodm.exceptions import ListItemException, ValidateException
 from pynsodm.valids import valid_email
 from pynsodm.handlers import salted_sha512_hash_password
 
+from .conftest import RecordingStorage
+
 
 def test_table_name():
     class Test123(BaseModel):
@@ -106,4 +108,115 @@ def test_field_handler():
 
     user = User(password='123')
     new_user = User.from_dictionary(user.dictionary)
-    assert user.password == new_user.password
\ No newline at end of file
+    assert user.password == new_user.password
+
+
+def test_field_constraints():
+    class Test123(BaseModel):
+        code = StringField(min_length=2, max_length=4, regex=r'[a-z]+')
+
+    test = Test123(code='abc')
+    assert test.code == 'abc'
+
+    with pytest.raises(ValidateException):
+        test.code = 'a'
+
+    with pytest.raises(ValidateException):
+        test.code = 'ABC'
+
+
+def test_validate_many():
+    class Test123(BaseModel):
+        email = StringField(valid=valid_email)
+        role = StringField(items=['admin', 'user'])
+        comment = StringField()
+
+    errors = Test123.validate_many([
+        {'email': 'test@test.com', 'role': 'admin', 'comment': 'ok'},
+        {'email': 'test123', 'role': 'admin'},
+        {'email': 'test@test.com', 'role': 'guest'},
+        {'email': 'test', 'role': 'guest'},
+    ])
+
+    assert errors == {
+        1: {'email': 'Invalid value'},
+        2: {'role': 'Value is not included in the list of valid values'},
+        3: {
+            'email': 'Invalid value',
+            'role': 'Value is not included in the list of valid values'},
+    }
+
+
+def test_validators_compiled_once():
+    class Test123(BaseModel):
+        email = StringField(valid=valid_email)
+        comment = StringField()
+
+    validators = Test123.get_validators()
+
+    assert list(validators) == ['email']
+    assert Test123.get_validators() is validators
+
+
+def test_compiled_model_dictionaries():
+    class Test123(BaseModel):
+        name = StringField()
+        secret = StringField(is_sensitive=True)
+
+    test = Test123.from_dictionary(
+        {'id': 'abc', 'name': 'test', 'secret': 'hidden', 'extra': 1},
+        sensitive_fields=True)
+
+    assert Test123.get_compiled() is Test123.get_compiled()
+    assert test.id == 'abc'
+    assert test.get_modified_fields() == []
+    assert test.dictionary.keys() == set(Test123.get_fields())
+    assert test.dictionary['secret'] == 'hidden'
+    assert test.unsensitive_dictionary.keys() == \
+        set(Test123.get_unsensitive_fields())
+    assert test.unsensitive_dictionary['name'] == 'test'
+
+
+def test_compiled_model_primary_key():
+    class Test123(BaseModel):
+        table_options = {'primary_key': 'code'}
+
+        name = StringField()
+
+    test = Test123.from_dictionary({'code': 'abc', 'name': 'test'})
+
+    assert test.id == 'abc'
+    assert test.storage_dictionary['code'] == 'abc'
+    assert 'id' not in test.storage_dictionary
+
+
+def test_compiled_model_fields_are_independent():
+    class Test123(BaseModel):
+        name = StringField()
+
+    first, second = Test123(name='first'), Test123(name='second')
+
+    assert first.name == 'first'
+    assert second.name == 'second'
+    assert Test123.name.value is None
+
+
+def test_resolvers_bound_after_instantiation():
+    class Owner123(BaseModel):
+        name = StringField()
+
+    class Pet123(BaseModel):
+        name = StringField()
+        owner = OTORelation(Owner123, backfield='pets')
+
+    Owner123(name='warm-up')
+
+    storage = RecordingStorage(responses={
+        'table_list': ['owner123', 'pet123'],
+        'index_list': ['owner'],
+        'get': {'id': 'o1', 'name': 'owner'},
+        'find': [{'id': 'p1', 'name': 'pet', 'owner': 'o1'}]})
+    storage.bind(Owner123, Pet123)
+
+    assert Owner123.get_resolver_fields() == ['pets']
+    assert Owner123.get('o1').pets.name == 'pet'
@@ -0,0 +1,130 @@
+import sqlite3
+
+from datetime import datetime
+
+import pytz
+
+from pynsodm.rethinkdb_ext import BaseModel, DocumentCache
+from pynsodm.fields import StringField
+
+from .conftest import RecordingStorage
+
+
+def test_cache_roundtrip(tmp_path):
+    cache = DocumentCache(str(tmp_path / 'cache.db'))
+    document = {
+        'id': '1', 'name': 'test',
+        'created': datetime(2024, 1, 1, tzinfo=pytz.utc)}
+
+    hits, stamps = cache.lookup('users', ['1', '2'])
+    assert hits == {} and sorted(stamps) == ['1', '2']
+
+    cache.fill('users', {'1': document}, stamps)
+
+    other = DocumentCache(str(tmp_path / 'cache.db'))
+    hits, stamps = other.lookup('users', ['1', '2'])
+    assert hits == {'1': document}
+    assert list(stamps) == ['2']
+
+
+def test_cache_rejects_fill_after_invalidation(tmp_path):
+    cache = DocumentCache(str(tmp_path / 'cache.db'))
+
+    _, stamps = cache.lookup('users', ['1'])
+    cache.invalidate('users', ['1'])
+    cache.fill('users', {'1': {'id': '1', 'name': 'stale'}}, stamps)
+
+    hits, stamps = cache.lookup('users', ['1'])
+    assert hits == {}
+
+    cache.fill('users', {'1': {'id': '1', 'name': 'fresh'}}, stamps)
+    assert cache.lookup('users', ['1'])[0]['1']['name'] == 'fresh'
+
+
+def test_cache_table_invalidation_and_ttl(tmp_path):
+    cache = DocumentCache(str(tmp_path / 'cache.db'))
+    _, stamps = cache.lookup('users', ['1'])
+    cache.fill('users', {'1': {'id': '1'}}, stamps)
+
+    cache.invalidate_table('users')
+    assert cache.lookup('users', ['1'])[0] == {}
+
+    expired = DocumentCache(str(tmp_path / 'cache.db'), ttl=-1)
+    _, stamps = expired.lookup('users', ['1'])
+    expired.fill('users', {'1': {'id': '1'}}, stamps)
+    assert expired.lookup('users', ['1'])[0] == {}
+
+
+def test_purge_keeps_versions_monotonic(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = DocumentCache(path)
+    expiring = DocumentCache(path, ttl=-1)
+
+    cache.invalidate('users', ['1'])
+    _, stamps = expiring.lookup('users', ['1'])
+    expiring.fill('users', {'1': {'id': '1', 'name': 'old'}}, stamps)
+
+    _, stamps = cache.lookup('users', ['1'])
+    cache.purge()
+    cache.invalidate('users', ['1'])
+    cache.fill('users', {'1': {'id': '1', 'name': 'stale'}}, stamps)
+
+    assert cache.lookup('users', ['1'])[0] == {}
+
+
+def test_invalidation_rows_expire(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = DocumentCache(path, fill_timeout=-1)
+
+    _, stamps = cache.lookup('users', ['1'])
+    cache.invalidate('users', ['1', '2'])
+    cache.purge()
+    cache.fill('users', {'1': {'id': '1'}}, stamps)
+
+    with sqlite3.connect(path) as connection:
+        assert connection.execute(
+            'SELECT COUNT(*) FROM documents').fetchone()[0] == 0
+
+
+def test_storage_reads_through_cache(tmp_path):
+    storage = RecordingStorage(
+        responses={'get': {'id': '1', 'name': 'test'}},
+        cache=DocumentCache(str(tmp_path / 'cache.db')))
+
+    class User(BaseModel):
+        table_name = 'users'
+
+        name = StringField()
+
+    User.set_storage(storage)
+
+    assert User.get('1').name == 'test'
+    user = User.get('1')
+    assert [q[0] for q in storage.queries] == ['get']
+
+    user.name = 'changed'
+    user.save()
+    User.get('1')
+    assert [q[0] for q in storage.queries] == ['get', 'update', 'get']
+
+    User.get('1', read_mode='majority')
+    assert [q[0] for q in storage.queries][-1] == 'get'
+    assert storage.cache.stats['hits'] == 1
+
+
+def test_cache_is_namespaced_by_database(tmp_path):
+    cache = DocumentCache(str(tmp_path / 'cache.db'))
+    tenant_a = RecordingStorage(
+        responses={'get': {'id': 'DE', 'name': 'A'}}, db='tenant_a',
+        cache=cache)
+    tenant_b = RecordingStorage(
+        responses={'get': {'id': 'DE', 'name': 'B'}}, db='tenant_b',
+        cache=cache)
+
+    assert tenant_a.get('countries', 'DE')['name'] == 'A'
+    assert tenant_b.get('countries', 'DE')['name'] == 'B'
+    assert len(tenant_b.queries) == 1
+
+    tenant_b.update_by_id('countries', 'DE', {'name': 'C'})
+    tenant_a.get('countries', 'DE')
+    assert len(tenant_a.queries) == 1
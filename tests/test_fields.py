@@ -0,0 +1,79 @@
+import zlib
+
+import pytest
+
+from pynsodm.rethinkdb_ext import BaseModel
+from pynsodm.fields import BinaryField
+from pynsodm.exceptions import ValidateException
+
+
+def test_binary_field_compression():
+    class Blob(BaseModel):
+        raw = BinaryField()
+        packed = BinaryField(compression='zlib', threshold=16)
+
+    data = b'x' * 1024
+    blob = Blob(raw=data, packed=data)
+
+    assert blob.raw == data
+    assert blob.packed == data
+    assert blob.fields['raw'].storage_value == b'\x00' + data
+    assert blob.fields['packed'].storage_value == \
+        b'\x01' + zlib.compress(data, 6)
+
+
+def test_binary_field_below_threshold():
+    class Blob(BaseModel):
+        packed = BinaryField(compression='zlib', threshold=16)
+
+    blob = Blob(packed='short')
+
+    assert blob.packed == b'short'
+    assert blob.fields['packed'].storage_value == b'\x00short'
+
+
+def test_binary_field_lazy_decoding():
+    class Blob(BaseModel):
+        packed = BinaryField(compression='zlib', threshold=16)
+
+    data = b'y' * 256
+    payload = Blob.packed.encode(data)
+    blob = Blob.from_dictionary({'packed': payload}, sensitive_fields=True)
+
+    field = blob.fields['packed']
+    assert field._decoded is None
+    assert blob.packed == data
+    assert field._decoded == data
+    assert field.storage_value == payload
+
+
+def test_binary_field_serialize_roundtrip():
+    class Blob(BaseModel):
+        packed = BinaryField(compression='zlib', threshold=16)
+
+    payload = Blob.packed.encode(b'z' * 64)
+
+    assert Blob.packed.deserialize(Blob.packed.serialize(payload)) == payload
+
+
+def test_binary_field_constraints():
+    class Limited(BaseModel):
+        data = BinaryField(max_length=4)
+
+    with pytest.raises(ValidateException):
+        Limited(data=b'12345')
+
+
+def test_binary_field_loads_stored_payload():
+    class Limited(BaseModel):
+        data = BinaryField(max_length=4)
+
+    stored = Limited(data=b'1234').fields['data'].storage_value
+    loaded = Limited.from_dictionary({'data': stored}, sensitive_fields=True)
+
+    assert loaded.data == b'1234'
+
+
+def test_binary_field_unknown_compression():
+    with pytest.raises(ValueError):
+        BinaryField(compression='brotli')
@@ -0,0 +1,69 @@
+import logging
+
+from pynsodm.rethinkdb_ext import Storage, query_scope
+
+
+class FakeTerm:
+    def __init__(self, result):
+        self._result = result
+
+    def run(self, connection, **kwargs):
+        return self._result
+
+
+def test_hooks_receive_query_event():
+    storage = Storage()
+    events = []
+
+    storage.add_hook(
+        pre=lambda e: events.append(('pre', e.operation, e.duration)),
+        post=lambda e: events.append(('post', e.operation, e.rows, e.bytes)))
+
+    result = storage._run(
+        FakeTerm([{'id': '1'}, {'id': '2'}]), 'users', 'find')
+
+    assert len(result) == 2
+    assert events[0] == ('pre', 'find', None)
+    assert events[1][:3] == ('post', 'find', 2)
+    assert events[1][3] > 0
+
+
+def test_query_counters():
+    storage = Storage()
+
+    storage._run(FakeTerm({'id': '1'}), 'users', 'get')
+    storage._run(FakeTerm({'id': '2'}), 'users', 'get')
+    storage._run(
+        FakeTerm({'inserted': 3, 'errors': 0}), 'users', 'insert')
+
+    stats = storage.stats.snapshot()
+
+    assert stats[('users', 'get')]['count'] == 2
+    assert stats[('users', 'insert')]['rows'] == 3
+
+
+def test_slow_query_log(caplog):
+    storage = Storage(slow_query_ms=0)
+
+    with caplog.at_level(logging.WARNING, logger='pynsodm.slow_queries'):
+        storage._run(FakeTerm(None), 'users', 'get')
+
+    assert 'Slow query' in caplog.text
+
+
+def test_n_plus_one_detection():
+    storage = Storage()
+    detected = []
+
+    with query_scope(
+            'test', threshold=3,
+            on_repeated=lambda s, shape, n: detected.append(shape)) as scope:
+        for i in range(5):
+            storage._run(
+                FakeTerm({'id': str(i)}), 'users', 'get',
+                ('users', 'get', ('id',)))
+        storage._run(FakeTerm([]), 'users', 'find', ('users', 'find', ()))
+
+    assert scope.queries == 6
+    assert detected == [('users', 'get', ('id',))]
+    assert scope.repeated == {('users', 'get', ('id',)): 5}
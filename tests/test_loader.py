@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pynsodm.exceptions import NonexistentIDException
+from pynsodm.fields import StringField
+from pynsodm.rethinkdb_ext import BaseModel, Loader, batch_loads
+
+from .conftest import RecordingStorage
+
+
+def test_threaded_loads_are_coalesced():
+    class Author(BaseModel):
+        table_name = 'authors'
+
+        name = StringField()
+
+    storage = RecordingStorage(rows={'authors': [
+        {'id': str(i), 'name': f'author{i}'} for i in range(5)]})
+    Author.set_storage(storage)
+    loader = Loader(window=0.1)
+    names = {}
+
+    def load(obj_id):
+        with batch_loads(loader):
+            names[obj_id] = Author.get(obj_id).name
+
+    threads = [
+        threading.Thread(target=load, args=(str(i % 5),))
+        for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [q[0] for q in storage.queries] == ['get_many']
+    assert all(f"'{i}'" in storage.queries[0][1] for i in range(5))
+    assert names == {str(i): f'author{i}' for i in range(5)}
+    assert loader.stats['batches'] == 1
+
+
+def test_asyncio_loads_are_coalesced():
+    class Author(BaseModel):
+        table_name = 'authors'
+
+        name = StringField()
+
+    storage = RecordingStorage(rows={'authors': [
+        {'id': str(i), 'name': f'author{i}'} for i in range(3)]})
+    Author.set_storage(storage)
+
+    async def main():
+        with batch_loads(window=0):
+            return await asyncio.gather(
+                *[Author.aget(str(i % 3)) for i in range(6)])
+
+    authors = asyncio.run(main())
+
+    assert [q[0] for q in storage.queries] == ['get_many']
+    assert ".get_all('0', '1', '2')" in storage.queries[0][1]
+    assert [a.name for a in authors] == [
+        'author0', 'author1', 'author2'] * 2
+    assert authors[0] is not authors[3]
+
+
+def test_asyncio_fetch_does_not_block_the_loop():
+    class Author(BaseModel):
+        table_name = 'authors'
+
+        name = StringField()
+
+    def slow_fetch(term):
+        time.sleep(0.2)
+        return [{'id': '1', 'name': 'author1'}]
+
+    storage = RecordingStorage(responses={'get_many': slow_fetch})
+    Author.set_storage(storage)
+    ticks = []
+
+    async def tick():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        with batch_loads(window=0):
+            author, _ = await asyncio.gather(Author.aget('1'), tick())
+        return author
+
+    assert asyncio.run(main()).name == 'author1'
+    assert len(ticks) == 5 and ticks[-1] - ticks[0] < 0.15
+    assert len(storage.clones) == 1
+
+
+def test_loader_cache_and_invalidation():
+    class Author(BaseModel):
+        table_name = 'authors'
+
+        name = StringField()
+
+    storage = RecordingStorage(rows={'authors': [{'id': '1', 'name': 'old'}]})
+    Author.set_storage(storage)
+
+    with batch_loads(window=0) as loader:
+        author = Author.get('1')
+        author.name = 'new'
+        assert Author.get('1').name == 'old'
+        assert loader.stats['hits'] == 1
+
+        author.save()
+        storage.rows['authors'] = [{'id': '1', 'name': 'new'}]
+        assert Author.get('1').name == 'new'
+
+        with pytest.raises(NonexistentIDException):
+            Author.get('2')
+
+    assert [q[0] for q in storage.queries] == [
+        'get_many', 'update', 'get_many', 'get_many']
+
+
+def test_model_loader():
+    class Author(BaseModel):
+        table_name = 'authors'
+
+        name = StringField()
+
+    storage = RecordingStorage(rows={'authors': [{'id': '1', 'name': 'test'}]})
+    Author.set_storage(storage)
+    Author.loader = Loader(window=0, cache=False)
+
+    Author.get('1')
+    Author.get('1')
+
+    assert [q[0] for q in storage.queries] == ['get_many', 'get_many']
@@ -0,0 +1,157 @@
+import json
+
+import pytest
+
+from pynsodm.rethinkdb_ext import BaseModel, Inc
+from pynsodm.rethinkdb_ext.migrations import Throttle
+from pynsodm.fields import StringField, OTMRelation, CountField
+
+from .conftest import RecordingStorage
+
+
+def test_server_side_migration_with_checkpoint(tmp_path):
+    class Account(BaseModel):
+        table_name = 'accounts'
+
+        email = StringField()
+        plan = StringField()
+
+    checkpoint = tmp_path / 'accounts.json'
+    storage = RecordingStorage(results=[
+        ['a', 'b'], {'replaced': 2},
+        ['c'], {'replaced': 1}])
+    Account.set_storage(storage)
+
+    state = Account.migrate(
+        {'plan': 'free', 'logins': Inc()}, fil={'plan__isnull': True},
+        batch_size=2, checkpoint=str(checkpoint))
+
+    assert [q[0] for q in storage.queries] == [
+        'page', 'update_where', 'page', 'update_where']
+    assert "r.table('accounts').between(r.minval, r.maxval" in \
+        storage.queries[0][1]
+    assert ".limit(2)['id']" in storage.queries[0][1]
+    assert "between('b', r.maxval" in storage.queries[2][1]
+    assert ".get_all('a', 'b', index='id')" in storage.queries[1][1]
+    assert state['processed'] == 3 and state['updated'] == 3
+    assert json.loads(checkpoint.read_text())['done']
+
+    storage.queries.clear()
+    Account.migrate({'plan': 'free'}, checkpoint=str(checkpoint))
+    assert storage.queries == []
+
+
+def test_migration_resumes_from_checkpoint(tmp_path):
+    class Account(BaseModel):
+        table_name = 'accounts'
+
+        email = StringField()
+        plan = StringField()
+
+    checkpoint = tmp_path / 'accounts.json'
+    checkpoint.write_text(json.dumps({
+        'name': 'accounts-migration', 'last_key': 'b', 'batches': 1,
+        'processed': 2, 'updated': 2, 'done': False}))
+    storage = RecordingStorage(results=[[]])
+    Account.set_storage(storage)
+
+    state = Account.migrate({'plan': 'free'}, checkpoint=str(checkpoint))
+
+    assert "between('b', r.maxval" in storage.queries[0][1]
+    assert state['processed'] == 2 and state['done']
+
+
+def test_transform_dry_run():
+    class Account(BaseModel):
+        table_name = 'accounts'
+
+        email = StringField()
+        plan = StringField()
+
+    storage = RecordingStorage(results=[[
+        {'id': 'a', 'email': 'A@TEST.COM'},
+        {'id': 'b', 'email': 'b@test.com'}]])
+    Account.set_storage(storage)
+
+    state = Account.migrate(
+        transform=lambda obj: {'email': obj.email.lower()}
+        if obj.email != obj.email.lower() else None,
+        dry_run=True)
+
+    assert [q[0] for q in storage.queries] == ['page']
+    assert state['updated'] == 1
+
+
+def test_migration_changes_are_validated():
+    class Member(BaseModel):
+        table_name = 'members'
+
+        role = StringField(items=['admin', 'user'])
+        email = StringField(handler=lambda v: v.lower())
+
+    storage = RecordingStorage(results=[
+        ['a'], {'replaced': 1},
+        [{'id': 'a', 'email': 'a@test.com'}]])
+    Member.set_storage(storage)
+
+    with pytest.raises(ValueError):
+        Member.migrate({'rol': 'admin'})
+    assert storage.queries == []
+
+    Member.migrate({'email': 'A@TEST.COM'})
+    query = storage.queries[1][1]
+    assert "'email': 'a@test.com'" in query
+    assert "'updated': r.iso8601(" in query
+
+    with pytest.raises(ValueError):
+        Member.migrate(transform=lambda obj: {'rol': 'admin'})
+
+
+def test_migration_maintains_aggregates():
+    class Team(BaseModel):
+        table_name = 'teams'
+
+        members_count = CountField('Player.team')
+
+    class Player(BaseModel):
+        table_name = 'players'
+
+        team = OTMRelation(Team, is_index=True)
+
+    storage = RecordingStorage(results=[
+        [{'id': 'a', 'team': 't1'}],
+        {'replaced': 1, 'changes': [{
+            'old_val': {'id': 'a', 'team': 't1'},
+            'new_val': {'id': 'a', 'team': 't2'}}]}])
+    Team.set_storage(storage)
+    Player.set_storage(storage)
+
+    state = Player.migrate(transform=lambda obj: {'team': 't2'})
+
+    assert [q[0] for q in storage.queries] == [
+        'page', 'update_many', 'update_aggregates']
+    assert 'return_changes=True' in storage.queries[1][1]
+    assert "'updated': r.iso8601(" in storage.queries[1][1]
+    assert "r.table('teams').get(" in storage.queries[2][1]
+    assert state['updated'] == 1
+
+
+def test_migration_requires_one_mode():
+    class Account(BaseModel):
+        table_name = 'accounts'
+
+        email = StringField()
+        plan = StringField()
+
+    with pytest.raises(ValueError):
+        Account.migrate()
+
+
+def test_throttle_adapts_batch_size():
+    throttle = Throttle(target_latency=0.1, batch_size=100)
+
+    throttle.record(100, 0.5)
+    assert throttle.batch_size == 50
+
+    throttle.record(50, 0.01)
+    assert throttle.batch_size == 62
@@ -0,0 +1,102 @@
+import pytest
+
+from rethinkdb import RethinkDB
+
+from pynsodm.rethinkdb_ext import BaseModel, Q, Inc, Dec, Append, \
+    Prepend, SetInsert, Remove, SetIf
+from pynsodm.rethinkdb_ext.operators import compile_changes
+from pynsodm.fields import StringField, ListField
+from pynsodm.exceptions import ListItemException
+
+from .conftest import RecordingStorage
+
+
+r = RethinkDB()
+
+
+def compiled(**changes):
+    return str(r.table('posts').get('1').update(compile_changes(r, changes)))
+
+
+def test_counter_operators():
+    assert "['views'].default(0) + r.expr(1))" in compiled(views=Inc())
+    assert "['views'].default(0) + r.expr(-5))" in compiled(views=Dec(5))
+
+
+def test_list_operators():
+    assert "['tags'].default([]) + r.expr(['a', 'b']))" \
+        in compiled(tags=Append('a', 'b'))
+    assert "(r.expr(['a']) + " in compiled(tags=Prepend('a'))
+    assert ".set_union(['a'])" in compiled(tags=SetInsert('a'))
+    assert ".difference(['a'])" in compiled(tags=Remove('a'))
+
+
+def test_conditional_set():
+    query = compiled(status=SetIf('done', Q(status='pending')))
+
+    assert 'r.branch(' in query and "'done'" in query
+
+
+def test_update_fields_on_instance():
+    storage = RecordingStorage(results=[{
+        'replaced': 1, 'errors': 0,
+        'changes': [{'new_val': {'id': '1', 'tags': ['a', 'b']}}]}])
+
+    class Post(BaseModel):
+        table_name = 'posts'
+
+        title = StringField()
+        tags = ListField()
+
+    Post.set_storage(storage)
+
+    post = Post.from_dictionary({'id': '1', 'tags': ['a']})
+    post.update_fields(tags=SetInsert('b'))
+
+    operation, query, _ = storage.queries[0]
+    assert operation == 'update_fields'
+    assert query.startswith("r.table('posts').get('1').update(")
+    assert 'return_changes=True' in query
+    assert post.tags == ['a', 'b']
+
+
+def test_update_where():
+    storage = RecordingStorage(results=[{'replaced': 3, 'errors': 0}])
+
+    class Post(BaseModel):
+        table_name = 'posts'
+
+        status = StringField()
+
+    Post.set_storage(storage)
+
+    assert Post.update_where({'status': 'draft'}, views=Inc()) == 3
+    assert storage.queries[0][1].startswith(
+        "r.table('posts').filter(r.expr({'status': 'draft'})).update(")
+
+
+def test_plain_changes_are_validated():
+    storage = RecordingStorage(results=[{'replaced': 1, 'errors': 0}])
+
+    class Member(BaseModel):
+        table_name = 'members'
+
+        role = StringField(items=['admin', 'user'])
+        email = StringField(handler=lambda v: v.lower())
+
+    Member.set_storage(storage)
+
+    member = Member.from_dictionary({'id': '1', 'role': 'user'})
+    with pytest.raises(ListItemException):
+        member.update_fields(role='bogus')
+    with pytest.raises(ListItemException):
+        Member.update_where({'role': 'user'}, role='bogus')
+    with pytest.raises(ValueError):
+        member.update_fields(rol='admin')
+    with pytest.raises(ValueError):
+        Member.update_where({'role': 'user'}, rol='admin')
+    assert storage.queries == []
+
+    Member.update_where({'role': 'user'}, email='A@B.C', logins=Inc())
+    query = storage.queries[0][1]
+    assert "'email': 'a@b.c'" in query
@@ -0,0 +1,81 @@
+import pytest
+
+from rethinkdb import RethinkDB
+
+from pynsodm.rethinkdb_ext import Q
+from pynsodm.rethinkdb_ext.query import Lookup, build_query
+
+
+r = RethinkDB()
+table = r.table('users')
+
+
+def test_lookup_parse():
+    lookup = Lookup.parse('age__gte', 18)
+
+    assert (lookup.field, lookup.op, lookup.value) == ('age', 'gte', 18)
+    assert Lookup.parse('first_name', 'John').op == 'exact'
+
+
+def test_unknown_lookup():
+    with pytest.raises(ValueError):
+        Lookup('age', 'between', 18)
+
+
+def test_simple_filter():
+    query = build_query(role='admin').build(r, table, ['id'])
+
+    assert str(query) == "r.table('users').filter(r.expr({'role': 'admin'}))"
+
+
+def test_get_all_on_index():
+    query = build_query(role__in=['admin', 'user'], age__gt=18)\
+        .build(r, table, ['id', 'role'])
+
+    assert str(query).startswith(
+        "r.table('users').get_all('admin', 'user', index='role').filter(")
+
+
+def test_get_all_deduplicates_keys():
+    query = build_query(role__in=['admin', 'user', 'admin'])\
+        .build(r, table, ['id', 'role'])
+
+    assert str(query) == \
+        "r.table('users').get_all('admin', 'user', index='role')"
+
+
+def test_get_all_on_multi_index():
+    indexes = {'id': False, 'tags': True}
+    query = build_query(tags__in=['a', 'b'])
+
+    assert str(query.build(r, table, indexes)) == \
+        "r.table('users').get_all('a', 'b', index='tags').distinct()"
+    assert str(query.build(r, table, indexes, writable=True)) == \
+        "r.table('users').get_all(r.args(" \
+        "r.table('users').get_all('a', 'b', index='tags')" \
+        "[r.table('users').info()['primary_key']].distinct()))"
+    assert str(build_query(tags__in=['a', 'a']).build(r, table, indexes)) \
+        == "r.table('users').get_all('a', index='tags')"
+
+
+def test_between_on_index():
+    query = build_query(age__gte=18, age__lt=65).build(r, table, ['id', 'age'])
+
+    assert str(query) == \
+        "r.table('users').between(18, 65, index='age', " \
+        "left_bound='closed', right_bound='open')"
+
+
+def test_composed_predicate():
+    query = build_query(Q(status='active') | ~Q(name__startswith='Jo'))\
+        .build(r, table, ['id', 'status'])
+
+    assert 'r.or_(' in str(query)
+    assert "match('^Jo')" in str(query)
+    assert 'get_all' not in str(query)
+
+
+def test_query_keys():
+    query = Q(age__gt=18) & (Q(status='active') | Q(name__isnull=True))
+
+    assert query.keys() == ('age__gt', 'name__isnull', 'status__exact')
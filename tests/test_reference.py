@@ -0,0 +1,89 @@
+from pynsodm.rethinkdb_ext import BaseModel
+from pynsodm.fields import StringField, OTMRelation, Reference
+
+from .conftest import RecordingStorage
+
+
+def test_reference_id_without_io():
+    class Author(BaseModel):
+        name = StringField()
+
+    class Post(BaseModel):
+        title = StringField()
+        author = OTMRelation(Author)
+
+    storage = RecordingStorage()
+    Author.set_storage(storage)
+    Post.set_storage(storage)
+
+    post = Post.from_dictionary({'id': 'p1', 'author': 'a1'})
+
+    assert isinstance(post.author, Reference)
+    assert post.author.id == 'a1'
+    assert post.author is post.author
+    assert not post.author.is_loaded
+    assert post.author == Reference(Author, 'a1')
+    assert storage.queries == []
+
+
+def test_reference_loads_on_attribute_access():
+    class Author(BaseModel):
+        name = StringField()
+
+    class Post(BaseModel):
+        title = StringField()
+        author = OTMRelation(Author)
+
+    storage = RecordingStorage(responses={
+        'get': {'id': 'a1', 'name': 'John'}, 'find': []})
+    Author.set_storage(storage)
+    Post.set_storage(storage)
+
+    post = Post.from_dictionary({'id': 'p1', 'author': 'a1'})
+
+    assert post.author.name == 'John'
+    assert post.author.name == 'John'
+    assert post.author.is_loaded
+    assert [q[0] for q in storage.queries] == ['get']
+
+
+def test_unsaved_relation_object_is_returned():
+    class Author(BaseModel):
+        name = StringField()
+
+    class Post(BaseModel):
+        title = StringField()
+        author = OTMRelation(Author)
+
+    storage = RecordingStorage()
+    Author.set_storage(storage)
+    Post.set_storage(storage)
+
+    author = Author(name='John')
+    post = Post(title='test', author=author)
+
+    assert post.author is author
+    assert Post(title='test').author is None
+
+
+def test_fetch_relations_in_one_query():
+    class Author(BaseModel):
+        name = StringField()
+
+    class Post(BaseModel):
+        title = StringField()
+        author = OTMRelation(Author)
+
+    storage = RecordingStorage(responses={'get_many': [
+        {'id': 'a1', 'name': 'John'}, {'id': 'a2', 'name': 'Jane'}]})
+    Author.set_storage(storage)
+    Post.set_storage(storage)
+
+    posts = [
+        Post.from_dictionary({'id': f'p{i}', 'author': author})
+        for i, author in enumerate(['a1', 'a2', 'a1'])]
+    Post.fetch_relations(posts, resolve=False)
+
+    assert [post.author.name for post in posts] == ['John', 'Jane', 'John']
+    assert [q[0] for q in storage.queries] == ['get_many']
+    assert ".get_all('a1', 'a2')" in storage.queries[0][1]
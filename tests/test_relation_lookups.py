@@ -0,0 +1,178 @@
+import io
+
+import pytest
+
+from pynsodm.fields import StringField, OTORelation, Reference
+from pynsodm.rethinkdb_ext import BaseModel, Q
+from pynsodm.rethinkdb_ext.query import build_query
+
+from .conftest import RecordingStorage
+
+
+def test_split_relations():
+    query, relations = build_query(
+        Q(title='a') & Q(author__country='DE', author__id='1'),
+        author__name__startswith='J').split_relations(['author'])
+
+    assert query.keys() == ('author__exact', 'title__exact')
+    assert relations['author'].keys() == (
+        'country__exact', 'name__startswith')
+
+    with pytest.raises(ValueError):
+        build_query(
+            Q(title='a') | Q(author__country='DE')).split_relations(
+                ['author'])
+
+
+def test_indexed_relation_lookup():
+    class Writer(BaseModel):
+        table_name = 'writers'
+
+        name = StringField()
+        country = StringField(is_index=True)
+
+    class Article(BaseModel):
+        table_name = 'articles'
+
+        title = StringField()
+        author = OTORelation(Writer, is_index=True)
+
+    storage = RecordingStorage(results=[[{'id': '1', 'author': 'w1'}]])
+    Writer.set_storage(storage)
+    Article.set_storage(storage)
+
+    articles = Article.find(author__country='DE')
+
+    operation, query, _ = storage.queries[0]
+    assert operation == 'find'
+    assert "r.table('writers').get_all('DE', index='country')['id']" \
+        in query
+    assert "index='author'" in query
+    assert 'eq_join' not in query
+    assert articles[0].author.id == 'w1'
+
+
+def test_joined_relation_lookup_with_hydration():
+    class Writer(BaseModel):
+        table_name = 'writers'
+
+        name = StringField()
+        country = StringField()
+
+    class Article(BaseModel):
+        table_name = 'articles'
+
+        title = StringField()
+        author = OTORelation(Writer)
+
+    storage = RecordingStorage(results=[[{
+        'id': '1', 'title': 'a', 'author': 'w1',
+        '__related': {'author': {'id': 'w1', 'name': 'Jan'}}}]])
+    Writer.set_storage(storage)
+    Article.set_storage(storage)
+
+    articles = Article.find(
+        title='a', author__name='Jan', select_related=True)
+
+    query = storage.queries[0][1]
+    assert ".eq_join('author', r.table('writers'))" in query
+    assert "'__related'" in query
+    assert isinstance(articles[0].author, Reference)
+    assert articles[0].author.is_loaded
+    assert articles[0].author.name == 'Jan'
+    assert len(storage.queries) == 1
+
+
+def test_select_related_without_relation_lookup():
+    class Writer(BaseModel):
+        table_name = 'writers'
+
+        name = StringField()
+        country = StringField(is_index=True)
+
+    class Article(BaseModel):
+        table_name = 'articles'
+
+        title = StringField()
+        author = OTORelation(Writer, is_index=True)
+
+    storage = RecordingStorage(results=[[]])
+    Writer.set_storage(storage)
+    Article.set_storage(storage)
+
+    Article.find(title='a', select_related=['author'])
+
+    query = storage.queries[0][1]
+    assert 'eq_join' not in query
+    assert "r.table('writers').get(" in query
+
+
+def test_relation_lookups_outside_find_are_rejected():
+    class Writer(BaseModel):
+        table_name = 'writers'
+
+        country = StringField()
+
+    class Article(BaseModel):
+        table_name = 'articles'
+
+        title = StringField()
+        author = OTORelation(Writer)
+
+    storage = RecordingStorage()
+    Writer.set_storage(storage)
+    Article.set_storage(storage)
+
+    with pytest.raises(ValueError):
+        Article.delete(author__country__ne='DE')
+    with pytest.raises(ValueError):
+        Article.update_where({'author__country': 'DE'}, title='b')
+    with pytest.raises(ValueError):
+        Article.find_values(author__country='DE')
+    with pytest.raises(ValueError):
+        Article.export_ndjson(io.StringIO(), author__country='DE')
+    with pytest.raises(ValueError):
+        Article.migrate({'title': 'b'}, fil={'author__country': 'DE'})
+
+    assert storage.queries == []
+
+    Article.delete(author__id='w1')
+    assert storage.queries[0][1] == \
+        "r.table('articles').filter(r.expr({'author': 'w1'})).delete()"
+
+
+def test_select_related_true_loads_every_relation():
+    class Writer(BaseModel):
+        table_name = 'writers'
+
+        name = StringField()
+
+    class Editor(BaseModel):
+        table_name = 'editors'
+
+        name = StringField()
+
+    class Article(BaseModel):
+        table_name = 'articles'
+
+        title = StringField()
+        author = OTORelation(Writer)
+        editor = OTORelation(Editor)
+
+    storage = RecordingStorage(results=[[{
+        'id': '1', 'title': 'a', 'author': 'w1', 'editor': 'e1',
+        '__related': {
+            'author': {'id': 'w1', 'name': 'Jan'},
+            'editor': {'id': 'e1', 'name': 'Eve'}}}]])
+    Writer.set_storage(storage)
+    Editor.set_storage(storage)
+    Article.set_storage(storage)
+
+    articles = Article.find(select_related=True)
+
+    query = storage.queries[0][1]
+    assert "r.table('writers').get(" in query
+    assert "r.table('editors').get(" in query
+    assert articles[0].author.name == 'Jan'
+    assert articles[0].editor.name == 'Eve'
+    assert len(storage.queries) == 1
@@ -1,11 +1,16 @@
+import asyncio
+import time
+
 import pytest
 
 from pytest_docker_tools import container, fetch
 
-from pynsodm.rethinkdb_ext import Storage, BaseModel
-from pynsodm.fields import StringField, OTORelation, OTMRelation
+from pynsodm.rethinkdb_ext import Storage, BaseModel, Q, Session, Inc, \
+    SetInsert, WriteBehind, DocumentCache, IndexAdvisor, batch_loads
+from pynsodm.fields import StringField, ListField, OTORelation, \
+    OTMRelation, BinaryField, CountField, LatestField
 from pynsodm.valids import valid_uuid
-from pynsodm.exceptions import NonexistentIDException
+from pynsodm.exceptions import NonexistentIDException, FullScanException
 
 
 rethinkdb_image = fetch(repository='rethinkdb:2.4.1-buster-slim')
@@ -359,3 +364,329 @@ def test_delete_object(mock_server):
 
     with pytest.raises(NonexistentIDException):
         Test123.get(test.id)
+
+
+def test_find_objects_with_lookups(mock_server):
+    class User(BaseModel):
+        table_name = 'users'
+
+        username = StringField(is_index=True)
+        role = StringField()
+
+    storage.reconnect()
+    User.delete()
+
+    User(username='alice', role='admin').save()
+    User(username='bob', role='user').save()
+    User(username='carol', role='guest').save()
+
+    assert sorted(u.username for u in User.find(role__in=['admin', 'user'])) \
+        == ['alice', 'bob']
+    assert [u.username for u in User.find(username__startswith='ca')] \
+        == ['carol']
+    assert sorted(u.username for u in User.find(username__gte='bob')) \
+        == ['bob', 'carol']
+    assert sorted(
+        u.username for u
+        in User.find(Q(role='admin') | ~Q(username__lt='c'))) \
+        == ['alice', 'carol']
+
+
+def test_session_commit(mock_server):
+    class Person(BaseModel):
+        table_name = 'persons'
+
+        first_name = StringField()
+
+    class Bike(BaseModel):
+        table_name = 'bikes'
+
+        model = StringField()
+        owner = OTMRelation(Person, backfield='bikes')
+
+    storage.reconnect()
+
+    person = Person(first_name='John')
+    bikes = [Bike(model=f'bike{i}', owner=person) for i in range(5)]
+
+    with Session() as session:
+        session.add(*bikes)
+        session.add(person)
+
+    assert len(Person.get(person.id).bikes) == 5
+
+    with Session() as session:
+        session.delete(*bikes[:2])
+
+    assert len(Bike.find(owner=person.id)) == 3
+
+
+def test_atomic_update_operators(mock_server):
+    class Post(BaseModel):
+        table_name = 'posts'
+
+        title = StringField()
+        tags = ListField()
+
+    storage.reconnect()
+
+    post = Post(title='test', tags=['a'])
+    post.save()
+
+    post.update_fields(views=Inc(), tags=SetInsert('a', 'b'))
+    Post.update_where({'title': 'test'}, views=Inc(2))
+
+    data = storage.get(Post.get_table_name(), post.id)
+
+    assert data['views'] == 3
+    assert sorted(post.tags) == ['a', 'b']
+
+
+def test_binary_field(mock_server):
+    class Attachment(BaseModel):
+        table_name = 'attachments'
+
+        content = BinaryField(compression='zlib', threshold=16)
+
+    storage.reconnect()
+
+    data = b'attachment' * 100
+    attachment = Attachment(content=data)
+    attachment.save()
+
+    assert Attachment.get(attachment.id).content == data
+
+
+def test_relation_aggregates(mock_server):
+    class Author(BaseModel):
+        table_name = 'authors'
+
+        name = StringField()
+        books_count = CountField('Book.author')
+        last_book = LatestField('Book.author')
+
+    class Book(BaseModel):
+        table_name = 'books'
+
+        title = StringField()
+        author = OTMRelation(Author, is_index=True)
+
+    storage.reconnect()
+
+    first, second = Author(name='first'), Author(name='second')
+    first.save()
+    second.save()
+
+    books = [Book(title=f'book{i}', author=first) for i in range(3)]
+    with Session() as session:
+        session.add(*books)
+
+    assert Author.get(first.id).books_count == 3
+
+    books[0].author = second
+    books[0].save()
+    Book.delete(title='book1')
+
+    authors, _ = Author.get_many([first.id, second.id])
+    assert [a.books_count for a in authors] == [1, 1]
+
+    assert Author.repair_aggregates(batch_size=1) == 2
+    assert Author.get(first.id).last_book == \
+        Book.get(books[2].id).created
+
+
+def test_write_behind(mock_server):
+    class Presence(BaseModel):
+        table_name = 'presence'
+
+        status = StringField()
+
+    storage.reconnect()
+
+    with WriteBehind(max_staleness=60) as queue:
+        Presence.write_behind = queue
+
+        presence = Presence(status='online')
+        for status in ('away', 'busy', 'offline'):
+            presence.status = status
+            presence.save()
+
+    Presence.write_behind = None
+
+    assert queue.stats['written'] == 1
+    assert Presence.get(presence.id).status == 'offline'
+
+
+def test_document_cache(mock_server, tmp_path):
+    class Country(BaseModel):
+        table_name = 'countries'
+
+        name = StringField()
+
+    cached_storage = Storage(
+        port='35035', password='test123123', db=test_db_name,
+        cache=DocumentCache(str(tmp_path / 'cache.db')))
+    cached_storage.reconnect()
+
+    country = Country(name='Germany')
+    country.save()
+
+    assert Country.get(country.id).name == 'Germany'
+    assert Country.get(country.id).name == 'Germany'
+    assert cached_storage.cache.stats['hits'] == 1
+
+    cached_storage.cache.follow(storage, Country)
+    time.sleep(1)
+    storage.update_by_id(Country.get_table_name(), country.id, {
+        'name': 'Deutschland'})
+    time.sleep(1)
+
+    assert Country.get(country.id).name == 'Deutschland'
+    storage.reconnect()
+
+
+def test_parallel_scan(mock_server):
+    class Reading(BaseModel):
+        table_name = 'readings'
+
+        sensor = StringField()
+
+    storage.reconnect()
+
+    with Session() as session:
+        session.add(*[Reading(sensor=f's{i}') for i in range(200)])
+
+    ids = [
+        obj.id for _, batch in Reading.scan(partitions=4, batch_size=50)
+        for obj in batch]
+
+    assert len(ids) == 200 and len(set(ids)) == 200
+    assert sum(Reading.map_partitions(
+        lambda rows: sum(1 for _ in rows), partitions=4, raw=True)) == 200
+
+
+def test_migration(mock_server, tmp_path):
+    class Subscriber(BaseModel):
+        table_name = 'subscribers'
+
+        email = StringField()
+        plan = StringField()
+
+    storage.reconnect()
+
+    with Session() as session:
+        session.add(*[
+            Subscriber(email=f'USER{i}@TEST.COM') for i in range(25)])
+
+    state = Subscriber.migrate(
+        {'plan': 'free'}, batch_size=10,
+        checkpoint=str(tmp_path / 'plan.json'))
+    assert state['processed'] == 25 and state['updated'] == 25
+
+    Subscriber.migrate(
+        transform=lambda obj: {'email': obj.email.lower()},
+        batch_size=10, target_latency=0.5)
+
+    subscribers = Subscriber.find(plan='free')
+    assert len(subscribers) == 25
+    assert all(s.email == s.email.lower() for s in subscribers)
+
+
+def test_index_advisor(mock_server):
+    class Ticket(BaseModel):
+        table_name = 'tickets'
+
+        queue = StringField(is_index=True)
+        status = StringField()
+
+    storage.reconnect()
+
+    with Session() as session:
+        session.add(*[
+            Ticket(queue=f'q{i % 3}', status='open') for i in range(30)])
+
+    with IndexAdvisor(storage) as advisor:
+        Ticket.find(queue='q1')
+        Ticket.find(status='open')
+        Ticket.find(status='open')
+
+    report = advisor.report()
+    assert len(report) == 1
+    assert report[0]['index'] == ['status']
+    assert report[0]['count'] == 2 and report[0]['table_size'] == 30
+
+    with IndexAdvisor(storage, strict=True):
+        with pytest.raises(FullScanException):
+            Ticket.find(status='open')
+
+
+def test_find_values(mock_server):
+    class Album(BaseModel):
+        table_name = 'albums'
+
+        title = StringField()
+        artist = StringField(is_index=True)
+
+    storage.reconnect()
+
+    Album(title='Low', artist='Bowie').save()
+    Album(title='Heroes', artist='Bowie').save()
+
+    rows = Album.find_values(fields=['title'], artist='Bowie')
+    assert sorted(rows, key=lambda r: r['title']) == [
+        {'title': 'Heroes'}, {'title': 'Low'}]
+    assert sorted(Album.find_tuples(fields=['title', 'artist'])) == [
+        ('Heroes', 'Bowie'), ('Low', 'Bowie')]
+    assert sorted(Album.find_tuples(
+        fields=['title'], columnar=True)['title']) == ['Heroes', 'Low']
+
+
+def test_batched_loads(mock_server):
+    class Editor(BaseModel):
+        table_name = 'editors'
+
+        name = StringField()
+
+    storage.reconnect()
+
+    ids = [Editor(name=f'editor{i}').save() for i in range(3)]
+
+    async def load():
+        with batch_loads(window=0) as loader:
+            editors = await asyncio.gather(*[Editor.aget(i) for i in ids])
+        return editors, loader.stats
+
+    editors, stats = asyncio.run(load())
+    assert [e.name for e in editors] == ['editor0', 'editor1', 'editor2']
+    assert stats['batches'] == 1
+
+
+def test_relation_lookups(mock_server):
+    class Journalist(BaseModel):
+        table_name = 'journalists'
+
+        name = StringField()
+        country = StringField(is_index=True)
+
+    class Story(BaseModel):
+        table_name = 'stories'
+
+        title = StringField()
+        author = OTORelation(Journalist, is_index=True)
+
+    storage.reconnect()
+
+    anna = Journalist(name='Anna', country='DE')
+    anna.save()
+    john = Journalist(name='John', country='US')
+    john.save()
+    Story(title='Berlin', author=anna).save()
+    Story(title='Boston', author=john).save()
+
+    stories = Story.find(author__country='DE')
+    assert [s.title for s in stories] == ['Berlin']
+
+    stories = Story.find(author__name='John', select_related=True)
+    assert [s.title for s in stories] == ['Boston']
+    assert stories[0].author.is_loaded
+    assert stories[0].author.country == 'US'
@@ -0,0 +1,78 @@
+from pynsodm.rethinkdb_ext import BaseModel
+from pynsodm.rethinkdb_ext.scan import split_ranges
+from pynsodm.fields import StringField
+
+from .conftest import RecordingStorage
+
+
+def count_rows(rows):
+    return sum(1 for _ in rows)
+
+
+def test_split_ranges():
+    storage = RecordingStorage(rows={
+        'measurements': [{'id': f'{i:03d}'} for i in range(100)]})
+
+    ranges = split_ranges(storage, 'measurements', 'id', 4)
+
+    assert len(ranges) == 4
+    assert ranges[0][0] is None and ranges[-1][1] is None
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert split_ranges(storage, 'measurements', 'id', 1) == [(None, None)]
+
+
+def test_sample_keys_query():
+    storage = RecordingStorage(results=[['b', 'a']])
+
+    assert split_ranges(storage, 'measurements', 'id', 2, 10) == \
+        [(None, 'b'), ('b', None)]
+    assert storage.queries[0][1] == \
+        "r.table('measurements').sample(10)['id']"
+
+
+def test_scan_reads_every_row_once():
+    class Measurement(BaseModel):
+        table_name = 'measurements'
+
+        name = StringField()
+
+    rows = [{'id': f'{i:05d}', 'name': f'm{i}'} for i in range(250)]
+    Measurement.set_storage(RecordingStorage(rows={'measurements': rows}))
+
+    seen = []
+    partitions = set()
+    for partition, batch in Measurement.scan(partitions=4, batch_size=20):
+        partitions.add(partition)
+        seen.extend(obj.id for obj in batch)
+        assert all(isinstance(obj, Measurement) for obj in batch)
+
+    assert sorted(seen) == [row['id'] for row in rows]
+    assert len(partitions) > 1
+
+
+def test_scan_raw_rows():
+    class Measurement(BaseModel):
+        table_name = 'measurements'
+
+        name = StringField()
+
+    Measurement.set_storage(RecordingStorage(rows={'measurements': [
+        {'id': f'{i:05d}', 'name': f'm{i}'} for i in range(10)]}))
+
+    batches = list(Measurement.scan(partitions=2, raw=True))
+
+    assert all(isinstance(row, dict) for _, batch in batches for row in batch)
+
+
+def test_map_partitions():
+    class Measurement(BaseModel):
+        table_name = 'measurements'
+
+        name = StringField()
+
+    Measurement.set_storage(RecordingStorage(rows={'measurements': [
+        {'id': f'{i:05d}', 'name': f'm{i}'} for i in range(100)]}))
+
+    results = Measurement.map_partitions(count_rows, partitions=3)
+
+    assert sum(results) == 100
@@ -0,0 +1,81 @@
+import pytest
+
+from pynsodm.rethinkdb_ext import BaseModel, Session
+from pynsodm.fields import StringField, OTMRelation
+
+from .conftest import RecordingStorage
+
+
+def test_commit_orders_inserts_by_dependency():
+    class Order(BaseModel):
+        table_name = 'orders'
+
+        number = StringField()
+
+    class LineItem(BaseModel):
+        table_name = 'line_items'
+
+        product = StringField()
+        order = OTMRelation(Order)
+
+    storage = RecordingStorage()
+    Order.set_storage(storage)
+    LineItem.set_storage(storage)
+
+    order = Order(number='1')
+    items = [LineItem(product=f'p{i}', order=order) for i in range(50)]
+
+    with Session() as session:
+        session.add(*items)
+        session.add(order)
+
+    assert [q[0] for q in storage.queries] == ['insert_many', 'insert_many']
+    assert storage.queries[0][1].startswith("r.table('orders').insert(")
+    assert storage.queries[1][1].startswith("r.table('line_items').insert(")
+    assert order.id == 'id1'
+    assert storage.queries[1][1].count("'order': 'id1'") == 50
+    assert all(item.id for item in items)
+
+
+def test_commit_updates_and_deletes():
+    class Order(BaseModel):
+        table_name = 'orders'
+
+        number = StringField()
+
+    storage = RecordingStorage()
+    Order.set_storage(storage)
+
+    changed = Order.from_dictionary({'id': 'o1', 'number': '1'})
+    unchanged = Order.from_dictionary({'id': 'o2', 'number': '2'})
+    removed = Order.from_dictionary({'id': 'o3', 'number': '3'})
+
+    changed.number = '10'
+
+    session = Session()
+    session.add(changed, unchanged)
+    session.delete(removed)
+    session.commit()
+
+    assert [q[0] for q in storage.queries] == ['update_many', 'delete_many']
+    assert "'id': 'o1'" in storage.queries[0][1]
+    assert "'o2'" not in storage.queries[0][1]
+    assert "r.table('orders').get_all('o3').delete()" in storage.queries[1][1]
+    assert session.new == [] and session.dirty == []
+
+
+def test_rollback_on_exception():
+    class Order(BaseModel):
+        table_name = 'orders'
+
+        number = StringField()
+
+    storage = RecordingStorage()
+    Order.set_storage(storage)
+
+    with pytest.raises(RuntimeError):
+        with Session() as session:
+            session.add(Order(number='1'))
+            raise RuntimeError()
+
+    assert storage.queries == []
@@ -0,0 +1,256 @@
+import uuid
+
+from pynsodm.rethinkdb_ext import BaseModel, use_storage
+from pynsodm.fields import StringField, IDField, ListField, OTMRelation, \
+    OTMResolver
+
+from .conftest import RecordingStorage
+
+
+def test_uuid7_id_generator():
+    class Event(BaseModel):
+        id = IDField(generator='uuid7')
+
+    first = Event().generate_id()
+    second = Event().generate_id()
+
+    assert uuid.UUID(first).version == 7
+    assert first[:8] <= second[:8]
+
+
+def test_save_with_client_id():
+    storage = RecordingStorage()
+
+    class Event(BaseModel):
+        table_name = 'events'
+        write_options = {'durability': 'soft'}
+
+        id = IDField(generator='uuid4')
+        name = StringField()
+
+    Event.set_storage(storage)
+
+    event = Event(name='test')
+    event.save(noreply=True)
+
+    operation, query, run_options = storage.queries[0]
+    assert operation == 'insert'
+    assert f"'id': '{event.id}'" in query
+    assert "durability='soft'" in query
+    assert run_options == {'noreply': True}
+
+
+def test_save_return_changes_refreshes_object():
+    storage = RecordingStorage(results=[{
+        'replaced': 1, 'errors': 0,
+        'changes': [{
+            'old_val': {'id': '1', 'name': 'old'},
+            'new_val': {'id': '1', 'name': 'server'}}]}])
+
+    class Event(BaseModel):
+        table_name = 'events'
+
+        name = StringField()
+
+    Event.set_storage(storage)
+
+    event = Event.from_dictionary({'id': '1', 'name': 'old'})
+    event.name = 'new'
+    event.save(return_changes=True)
+
+    assert 'return_changes=True' in storage.queries[0][1]
+    assert event.name == 'server'
+    assert event.get_modified_fields() == []
+
+
+def test_outdated_read_mode():
+    storage = RecordingStorage(results=[{'id': '1'}, []])
+
+    class Event(BaseModel):
+        table_name = 'events'
+        read_mode = 'outdated'
+
+        name = StringField()
+
+    Event.set_storage(storage)
+
+    Event.get('1')
+    Event.find(name='test', read_mode='single')
+
+    assert "r.table('events', read_mode='outdated').get('1')" \
+        == storage.queries[0][1]
+    assert "r.table('events', read_mode='single')" in storage.queries[1][1]
+
+
+def test_use_storage_override():
+    default_storage = RecordingStorage()
+    tenant_storage = RecordingStorage()
+
+    class Event(BaseModel):
+        table_name = 'events'
+
+    class Other(BaseModel):
+        table_name = 'others'
+
+    Event.set_storage(default_storage)
+    Other.set_storage(default_storage)
+
+    with use_storage(tenant_storage, Event):
+        assert Event.get_storage() is tenant_storage
+        assert Other.get_storage() is default_storage
+
+        with use_storage(default_storage):
+            assert Event.get_storage() is tenant_storage
+            assert Other.get_storage() is default_storage
+
+    with use_storage(tenant_storage):
+        assert Other.get_storage() is tenant_storage
+
+    assert Event.get_storage() is default_storage
+
+
+def test_connect_without_binding():
+    default_storage = RecordingStorage()
+    tenant_storage = RecordingStorage(
+        responses={'db_list': ['test'], 'table_list': [], 'index_list': []})
+
+    class Event(BaseModel):
+        table_name = 'events'
+
+    Event.set_storage(default_storage)
+
+    tenant_storage.connect(bind=False)
+    assert [query[0] for query in tenant_storage.queries] == ['db_list']
+
+    tenant_storage.create_tables(Event)
+    assert any(
+        "table_create('events')" in query[1]
+        for query in tenant_storage.queries)
+    assert Event.get_storage() is default_storage
+
+
+def test_table_options_applied_on_create():
+    storage = RecordingStorage(
+        responses={'table_list': [], 'index_list': []})
+
+    class Event(BaseModel):
+        table_name = 'events'
+        table_options = {
+            'shards': 4, 'replicas': 2, 'primary_key': 'uid'}
+
+    storage.bind(Event)
+
+    assert ('table_create', "r.table_create('events', shards=4, "
+            "replicas=2, primary_key='uid')", {}) in storage.queries
+
+    storage.queries = []
+    storage.reconfigure(Event)
+
+    assert [q[0] for q in storage.queries] == \
+        ['reconfigure', 'wait', 'rebalance']
+    assert 'shards=4' in storage.queries[0][1]
+
+
+def test_multi_index_created_on_list_field():
+    storage = RecordingStorage(
+        responses={'table_list': [], 'index_list': []})
+
+    class Event(BaseModel):
+        table_name = 'events'
+        tags = ListField(is_multi_index=True)
+
+    storage.bind(Event)
+
+    assert Event.get_query_indexes()['tags'] is True
+    assert ('index_create', "r.table('events').index_create('tags', "
+            "multi=True)", {}) in storage.queries
+
+
+def test_reconfigure_keeps_current_layout():
+    storage = RecordingStorage(responses={'config': {'shards': [
+        {'replicas': ['a', 'b']}, {'replicas': ['b', 'c']},
+        {'replicas': ['c', 'a']}]}})
+
+    class Event(BaseModel):
+        table_name = 'events'
+        table_options = {'replicas': 3}
+
+    class Log(BaseModel):
+        table_name = 'logs'
+        table_options = {'primary_replica_tag': 'eu'}
+
+    storage.reconfigure(Event, Log, dry_run=True)
+
+    assert [q[0] for q in storage.queries] == \
+        ['config', 'reconfigure', 'config', 'reconfigure']
+    assert 'shards=3' in storage.queries[1][1]
+    assert 'replicas=3' in storage.queries[1][1]
+    assert "replicas=r.expr({'eu': 2})" in storage.queries[3][1]
+    assert "primary_replica_tag='eu'" in storage.queries[3][1]
+
+
+def test_custom_primary_key():
+    storage = RecordingStorage(results=[[{'uid': '1', 'name': 'test'}]])
+
+    class Event(BaseModel):
+        table_name = 'events'
+        table_options = {'primary_key': 'uid'}
+
+        name = StringField()
+
+    Event.set_storage(storage)
+
+    events = Event.find(id='1')
+
+    assert storage.queries[0][1] == \
+        "r.table('events').get_all('1', index='uid')"
+    assert events[0].id == '1'
+
+    events[0].name = 'changed'
+    events[0].save()
+
+    assert storage.queries[1][1].startswith("r.table('events').get('1')")
+
+
+def test_get_many():
+    storage = RecordingStorage(results=[
+        [{'id': '3', 'name': 'c'}, {'id': '1', 'name': 'a'}]])
+
+    class Event(BaseModel):
+        table_name = 'events'
+
+        name = StringField()
+
+    Event.set_storage(storage)
+
+    events, missing = Event.get_many(['1', '2', '3', '1'])
+
+    assert storage.queries[0][1] == "r.table('events').get_all('1', '2', '3')"
+    assert [e.name for e in events] == ['a', 'c', 'a']
+    assert missing == ['2']
+
+
+def test_get_many_resolves_in_one_query():
+    storage = RecordingStorage(results=[
+        [{'id': 'p1'}, {'id': 'p2'}],
+        [{'id': 'b1', 'owner': 'p1'}, {'id': 'b2', 'owner': 'p1'}]])
+
+    class Person(BaseModel):
+        table_name = 'persons'
+
+    class Bike(BaseModel):
+        table_name = 'bikes'
+
+        owner = OTMRelation(Person)
+
+    Person.bikes = OTMResolver(Bike)
+    Person.set_storage(storage)
+    Bike.set_storage(storage)
+
+    persons, _ = Person.get_many(['p1', 'p2'])
+
+    assert len(storage.queries) == 2
+    assert "get_all('p1', 'p2', index='owner')" not in storage.queries[1][1]
+    assert "r.expr(['p1', 'p2']).contains(" in storage.queries[1][1]
+    assert [b.id for b in persons[0].bikes] == ['b1', 'b2']
+    assert persons[1].bikes is None
@@ -0,0 +1,68 @@
+import io
+import json
+
+from datetime import datetime
+
+import pytz
+
+from pynsodm.rethinkdb_ext import BaseModel
+from pynsodm.fields import StringField
+
+from .conftest import RecordingStorage
+
+
+def test_export_ndjson():
+    class User(BaseModel):
+        table_name = 'users'
+
+        username = StringField(min_length=3)
+
+    created = pytz.utc.localize(datetime(2021, 2, 24, 5, 53, 29))
+    storage = RecordingStorage(rows={'users': [
+        {'id': '1', 'username': 'john', 'created': created},
+        {'id': '2', 'username': 'jane', 'created': created},
+    ]})
+    User.set_storage(storage)
+
+    fp = io.StringIO()
+    count = User.export_ndjson(fp, username__startswith='j')
+
+    lines = fp.getvalue().splitlines()
+    assert count == 2
+    assert [q[0] for q in storage.queries] == ['iterate']
+    assert storage.queries[0][1].startswith("r.table('users').filter(")
+    assert "match('^j')" in storage.queries[0][1]
+    assert json.loads(lines[0]) == {
+        'id': '1', 'username': 'john', 'created': '2021-02-24T05:53:29+00:00'}
+
+
+def test_import_ndjson():
+    class User(BaseModel):
+        table_name = 'users'
+
+        username = StringField(min_length=3)
+
+    storage = RecordingStorage()
+    User.set_storage(storage)
+
+    lines = [
+        json.dumps({
+            'id': str(i), 'username': f'user{i}',
+            'created': '2021-02-24T05:53:29+00:00'})
+        for i in range(25)]
+    lines.append(json.dumps({'id': 'x', 'username': 'x'}))
+    reports = []
+
+    totals = User.import_ndjson(
+        io.StringIO('\n'.join(lines)),
+        batch_size=4, concurrency=3, validate=True,
+        progress=reports.append)
+
+    assert totals['rows'] == 26
+    assert totals['inserted'] == 25
+    assert totals['errors'] == 1
+    assert len(reports) == 7
+    assert [q[0] for q in storage.queries] == ['insert_rows'] * 7
+    assert all(
+        "'created': r.iso8601('2021-02-24T05:53:29+00:00')" in q[1]
+        for q in storage.queries)
@@ -0,0 +1,74 @@
+from pynsodm.fields import StringField
+from pynsodm.rethinkdb_ext import BaseModel
+
+from .conftest import RecordingStorage
+
+
+def test_find_values_plucks_fields():
+    storage = RecordingStorage(results=[[
+        {'id': '1', 'title': 'dune'}, {'id': '2', 'title': 'emma'}]])
+
+    class Book(BaseModel):
+        table_name = 'books'
+
+        title = StringField(handler=lambda v: v.upper())
+        author = StringField(is_index=True)
+
+    Book.set_storage(storage)
+
+    rows = Book.find_values(fields=['id', 'title'], author='Herbert')
+
+    assert rows == [
+        {'id': '1', 'title': 'dune'}, {'id': '2', 'title': 'emma'}]
+    operation, query, _ = storage.queries[0]
+    assert operation == 'iterate'
+    assert query == (
+        "r.table('books').get_all('Herbert', index='author')"
+        ".pluck('id', 'title')")
+
+
+def test_find_values_without_fields():
+    storage = RecordingStorage(results=[[{'id': '1', 'title': 'dune'}]])
+
+    class Book(BaseModel):
+        table_name = 'books'
+
+        title = StringField(handler=lambda v: v.upper())
+
+    Book.set_storage(storage)
+
+    assert Book.find_values(title='dune') == [{'id': '1', 'title': 'dune'}]
+    assert 'pluck' not in storage.queries[0][1]
+
+
+def test_find_tuples():
+    rows = [{'id': '1', 'title': 'dune'}, {'id': '2'}]
+    storage = RecordingStorage(results=[list(rows), list(rows)])
+
+    class Book(BaseModel):
+        table_name = 'books'
+
+        title = StringField(handler=lambda v: v.upper())
+
+    Book.set_storage(storage)
+
+    assert Book.find_tuples(fields=['id', 'title']) == [
+        ('1', 'dune'), ('2', None)]
+    assert Book.find_tuples(fields=['id', 'title'], columnar=True) == {
+        'id': ['1', '2'], 'title': ['dune', None]}
+
+
+def test_find_values_with_custom_primary_key():
+    storage = RecordingStorage(results=[[{'code': 'DE', 'name': 'Germany'}]])
+
+    class Country(BaseModel):
+        table_name = 'countries'
+        table_options = {'primary_key': 'code'}
+
+        name = StringField()
+
+    Country.set_storage(storage)
+
+    assert Country.find_values(fields=['id', 'name']) == [
+        {'id': 'DE', 'name': 'Germany'}]
+    assert ".pluck('code', 'name')" in storage.queries[0][1]
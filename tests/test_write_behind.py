@@ -0,0 +1,124 @@
+import time
+
+import pytest
+
+from pynsodm.rethinkdb_ext import BaseModel, WriteBehind
+from pynsodm.fields import StringField
+
+from .conftest import RecordingStorage
+
+
+def test_saves_are_coalesced():
+    class Presence(BaseModel):
+        table_name = 'presence'
+
+        status = StringField()
+        device = StringField()
+
+    storage = RecordingStorage()
+    queue = WriteBehind(max_staleness=60)
+    Presence.set_storage(storage)
+    Presence.write_behind = queue
+
+    obj = Presence(status='online', device='phone')
+    obj.save()
+    obj.status = 'away'
+    obj.save()
+    obj.status = 'busy'
+    obj.save()
+
+    assert obj.id
+    assert storage.queries == []
+    assert queue.pending == 1
+
+    assert queue.flush(timeout=5)
+    queue.close()
+
+    assert [q[0] for q in storage.queries] == ['insert_rows']
+    assert len(storage.clones) == 1
+    query = storage.queries[0][1]
+    assert "'status': 'busy'" in query and "'away'" not in query
+    assert "conflict='update'" in query
+    assert queue.stats['coalesced'] == 2
+
+
+def test_updates_are_batched():
+    class Presence(BaseModel):
+        table_name = 'presence'
+
+        status = StringField()
+        device = StringField()
+
+    storage = RecordingStorage()
+    queue = WriteBehind(max_staleness=60)
+    Presence.set_storage(storage)
+    Presence.write_behind = queue
+
+    objs = [
+        Presence.from_dictionary({'id': f'p{i}', 'status': 'online'})
+        for i in range(3)]
+    for status in ('away', 'online'):
+        for obj in objs:
+            obj.status = status
+            obj.save()
+
+    queue.close(timeout=5)
+
+    assert [q[0] for q in storage.queries] == ['update_many']
+    query = storage.queries[0][1]
+    assert all(f"'id': 'p{i}'" in query for i in range(3))
+    assert "'device'" not in query
+
+
+def test_max_staleness():
+    class Presence(BaseModel):
+        table_name = 'presence'
+
+        status = StringField()
+        device = StringField()
+
+    storage = RecordingStorage()
+    queue = WriteBehind(max_staleness=0.05)
+    Presence.set_storage(storage)
+    Presence.write_behind = queue
+
+    Presence(status='online').save()
+
+    deadline = time.monotonic() + 5
+    while not storage.queries and time.monotonic() < deadline:
+        time.sleep(0.01)
+    queue.close()
+
+    assert [q[0] for q in storage.queries] == ['insert_rows']
+
+
+def test_error_callback():
+    class Presence(BaseModel):
+        table_name = 'presence'
+
+        status = StringField()
+        device = StringField()
+
+    def unavailable(term):
+        raise RuntimeError('unavailable')
+
+    storage = RecordingStorage(responses={'insert_rows': unavailable})
+    errors = []
+    queue = WriteBehind(
+        max_staleness=60,
+        on_error=lambda error, writes: errors.append((error, writes)))
+    Presence.set_storage(storage)
+    Presence.write_behind = queue
+
+    obj = Presence(status='online')
+    obj.save()
+    queue.close(timeout=5)
+
+    assert len(errors) == 1
+    error, writes = errors[0]
+    assert str(error) == 'unavailable'
+    assert writes[0].id == obj.id
+    assert queue.stats['errors'] == 1
+
+    with pytest.raises(RuntimeError):
+        Presence(status='offline').save()